@@ -0,0 +1,86 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.listnode import ListNode, ListIndex, CompactList
+
+"""
+Compares time and memory (tracemalloc) of reading a large synthetic list as returned by "/admin/lists/<iri>":
+
+- ListNode: the recursive ListNode instances built by getAllNodes()
+- CompactList: the flat arrays built by getAllNodesCompact()
+
+The memory held after the JSON response has been released is reported (including the parts of the
+response that are still referenced), as well as the time to build a
+ListIndex from the list.
+"""
+
+
+def make_result(fanout: int, depth: int) -> Any:
+    def nodes(prefix: str, level: int) -> List[Any]:
+        result = []
+        for i in range(fanout):
+            name = '{}-{}'.format(prefix, i)
+            result.append({
+                'id': 'http://rdfh.ch/lists/0001/' + name,
+                'name': name,
+                'labels': [{'value': 'Label of ' + name, 'language': 'en'},
+                           {'value': 'Bezeichnung von ' + name, 'language': 'de'}],
+                'comments': [],
+                'children': nodes(name, level + 1) if level < depth else []
+            })
+        return result
+
+    return {'list': {
+        'listinfo': {'id': 'http://rdfh.ch/lists/0001/thesaurus', 'name': 'thesaurus', 'projectIri':
+                     'http://rdfh.ch/projects/0001', 'labels': [{'value': 'Thesaurus', 'language': 'en'}],
+                     'comments': []},
+        'children': nodes('n', 1)
+    }}
+
+
+def measure(build: Callable[[Any], Any], fanout: int, depth: int) -> Tuple[float, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    result = make_result(fanout, depth)
+    start = time.perf_counter()
+    lst = build(result)
+    duration = time.perf_counter() - start
+    del result
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    ListIndex([lst])
+    return duration, current, time.perf_counter() - start
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the compact list representation")
+    parser.add_argument("-f", "--fanout", type=int, default=20, help="Children per node")
+    parser.add_argument("-d", "--depth", type=int, default=3, help="Depth of the list")
+    args = parser.parse_args(args)
+
+    con = Connection('http://0.0.0.0:3333')
+    root = ListNode(con=con, id='http://rdfh.ch/lists/0001/thesaurus')
+    variants = (
+        ('ListNode', lambda result: root._ListNode__allNodesFromJsonObj(result)),
+        ('CompactList', CompactList.fromJsonObj),
+    )
+    nodecnt = sum(args.fanout ** level for level in range(1, args.depth + 1))
+    print('{} nodes'.format(nodecnt))
+    for name, build in variants:
+        duration, current, index_duration = measure(build, args.fanout, args.depth)
+        print('{:11}: built in {:6.2f} s, {:7.1f} MB held ({:4.0f} bytes/node), index built in {:5.2f} s'.format(
+            name, duration, current / 1e6, current / nodecnt, index_duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from stub_server import StubServer
+
+"""
+Compares the request rate of one new TCP connection per request (module level requests.get, as used by
+Connection before) with the pooled keep-alive session of Connection, against a local stub server.
+"""
+
+
+def run_unpooled(url: str, token: str, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        req = requests.get(url + '/v2/resources/dummy', headers={'Authorization': 'Bearer ' + token})
+        req.json()
+    return n / (time.perf_counter() - start)
+
+
+def run_pooled(con: Connection, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        con.get('/v2/resources/dummy')
+    return n / (time.perf_counter() - start)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the pooled Connection transport")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Number of requests per run")
+    args = parser.parse_args(args)
+
+    with StubServer(routes={('GET', '/v2/resources/dummy'): {'@id': 'http://rdfh.ch/0001/dummy'}}) as stub:
+        con = Connection(stub.url)
+        con.login('root@example.com', 'test')
+        run_pooled(con, 100)  # warm up
+        before = run_unpooled(stub.url, con.get_token(), args.requests)
+        after = run_pooled(con, args.requests)
+        con.close()
+    print('requests/s before (new connection per request): {:10.1f}'.format(before))
+    print('requests/s after (pooled keep-alive session):    {:10.1f}'.format(after))
+    print('speedup: {:.2f}x'.format(after / before))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,132 @@
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.helpers import BaseError, Context, IriTest
+
+"""
+Microbenchmarks of the conversions of IRI's by Context, as they are done for every class, property and
+cardinality while an ontology is parsed or exported:
+
+- before: the regular expression compiled per call, the IRI pattern tested on every call and the common
+  ontologies scanned linearly (as Context did before), reduce_iri resolving six prefixes per call
+- after: the reverse index of the prefixes (including the common ontologies) and the memoised results
+
+Every IRI of a synthetic ontology is converted --repeat times, reported are the conversions per second.
+"""
+
+ONTO = 'http://0.0.0.0:3333/ontology/0001/onto/v2'
+
+
+def legacy_prefix_from_iri(context: Context, iri: str) -> Optional[str]:
+    if not IriTest.test(iri):
+        raise BaseError("String does not conform to IRI patter: " + iri)
+    if iri.endswith("#"):
+        iri = iri[:-1]
+    result = context.rcontext.get(iri)
+    if result is None:
+        entrylist = list(filter(lambda x: x[1].iri == iri, context.common_ontologies.items()))
+        if len(entrylist) == 1:
+            result = entrylist[0][0]
+        else:
+            raise BaseError("Iri cannot be resolved to a well-known prefix!")
+    return result
+
+
+def legacy_get_qualified_iri(context: Context, val: str) -> str:
+    if IriTest.test(val):
+        return val
+    tmp = val.split(':')
+    iri_info = context.context.get(tmp[0])
+    if iri_info is None:
+        entrylist = list(filter(lambda x: x[1].iri == tmp[0], context.common_ontologies.items()))
+        if len(entrylist) != 1:
+            raise BaseError("Ontology not known! Cannot generate full qualified IRI")
+        iri_info = entrylist[0][1]
+    return iri_info.iri + '#' + tmp[1] if iri_info.hashtag else iri_info.iri + tmp[1]
+
+
+def legacy_get_prefixed_iri(context: Context, iri: str) -> str:
+    m = re.match("([\\w-]+):([\\w-]+)", iri)
+    if m and m.span()[1] == len(iri):
+        return iri
+    if not IriTest.test(iri):
+        raise BaseError("String does not conform to IRI patter: " + iri)
+    splitpoint = iri.find('#')
+    if splitpoint == -1:
+        splitpoint = iri.rfind('/')
+        ontopart = iri[:splitpoint + 1]
+    else:
+        ontopart = iri[:splitpoint]
+    element = iri[splitpoint + 1:]
+    prefix = context.rcontext.get(ontopart)
+    if prefix is None:
+        entrylist = list(filter(lambda x: x[1].iri == ontopart, context.common_ontologies.items()))
+        if len(entrylist) != 1:
+            raise BaseError("Ontology {} not known!".format(iri))
+        prefix = entrylist[0][0]
+    return prefix + ':' + element
+
+
+def legacy_reduce_iri(context: Context, iristr: str, ontoname: Optional[str] = None) -> str:
+    legacy_prefix_from_iri(context, "http://www.w3.org/1999/02/22-rdf-syntax-ns#")
+    legacy_prefix_from_iri(context, "http://www.w3.org/2000/01/rdf-schema#")
+    legacy_prefix_from_iri(context, "http://www.w3.org/2002/07/owl#")
+    legacy_prefix_from_iri(context, "http://www.w3.org/2001/XMLSchema#")
+    knora_api = legacy_prefix_from_iri(context, "http://api.knora.org/ontology/knora-api/v2#")
+    salsah_gui = legacy_prefix_from_iri(context, "http://api.knora.org/ontology/salsah-gui/v2#")
+    if IriTest.test(iristr):
+        iristr = legacy_get_prefixed_iri(context, iristr)
+    tmp = iristr.split(':')
+    if tmp[0] == knora_api or tmp[0] == salsah_gui:
+        return tmp[1]
+    elif ontoname is not None and tmp[0] == ontoname:
+        return ':' + tmp[1]
+    else:
+        return iristr
+
+
+def measure(convert: Callable[[str], str], iris: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for iri in iris:
+            convert(iri)
+    return time.perf_counter() - start
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the conversions of IRI's by Context")
+    parser.add_argument("-n", "--names", type=int, default=500, help="Number of classes and properties")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Number of conversions of each IRI")
+    args = parser.parse_args(args)
+
+    context = Context({'onto': ONTO + '#', 'dcterms': 'http://purl.org/dc/terms/'})
+    names = ['hasProperty{}'.format(i) for i in range(args.names)]
+    full = [ONTO + '#' + name for name in names[:-10]] + \
+           ['http://api.knora.org/ontology/knora-api/v2#hasValue', 'http://purl.org/dc/terms/title'] * 5
+    short = [context.get_prefixed_iri(iri) for iri in full]
+    onto_iris = [ONTO + '#', 'http://api.knora.org/ontology/knora-api/v2#',
+                 'http://www.w3.org/2000/01/rdf-schema#'] * (args.names // 3)
+
+    benchmarks = (
+        ('get_prefixed_iri', full, lambda iri: legacy_get_prefixed_iri(context, iri), context.get_prefixed_iri),
+        ('get_qualified_iri', short, lambda iri: legacy_get_qualified_iri(context, iri), context.get_qualified_iri),
+        ('prefix_from_iri', onto_iris, lambda iri: legacy_prefix_from_iri(context, iri), context.prefix_from_iri),
+        ('reduce_iri', full, lambda iri: legacy_reduce_iri(context, iri, 'onto'),
+         lambda iri: context.reduce_iri(iri, 'onto')),
+    )
+    for name, iris, before, after in benchmarks:
+        assert [before(iri) for iri in iris] == [after(iri) for iri in iris]
+        durations = [measure(convert, iris, args.repeat) for convert in (before, after)]
+        count = len(iris) * args.repeat
+        print('{:17}: before {:9.0f}/s, after {:9.0f}/s ({:.1f}x)'.format(
+            name, count / durations[0], count / durations[1], durations[0] / durations[1]))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.resource import ResourceInstanceFactory
+from stub_server import StubServer
+
+"""
+Compares the startup time of ResourceInstanceFactory against a local stub server with an artificial
+latency per request, for a project with several lists and ontologies:
+
+- serial: one request at a time (jobs=1)
+- concurrent: the independent requests are issued concurrently (jobs=8)
+- snapshot: warm start from an up to date snapshot, only the metadata is requested
+"""
+
+CONTEXT = {'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+           'owl': 'http://www.w3.org/2002/07/owl#',
+           'knora-api': 'http://api.knora.org/ontology/knora-api/v2#'}
+
+
+def make_routes(nlists: int, nontos: int, nnodes: int) -> Dict[Tuple[str, str], Any]:
+    def project(iri: str, shortcode: str, shortname: str):
+        return {'project': {'id': iri, 'shortcode': shortcode, 'shortname': shortname, 'longname': shortname,
+                            'description': [], 'keywords': [], 'ontologies': [], 'selfjoin': False, 'status': True}}
+
+    def ontology(i: int) -> Dict[str, Any]:
+        return {'@id': 'http://0.0.0.0:3333/ontology/0001/onto{}/v2'.format(i), '@type': 'owl:Ontology',
+                'rdfs:label': 'Ontology {}'.format(i),
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'}}
+
+    routes = {
+        ('GET', '/admin/projects/shortcode/0001'): project('http://rdfh.ch/projects/0001', '0001', 'anything'),
+        ('GET', '/admin/projects/shortcode/0000'): project('http://rdfh.ch/projects/0000', '0000', 'shared'),
+        ('GET', '/admin/lists'): {'lists': [{'id': 'http://rdfh.ch/lists/0001/list{}'.format(i),
+                                             'name': 'list{}'.format(i)} for i in range(nlists)]},
+        ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0001'): {
+            '@graph': [ontology(i) for i in range(nontos)], '@context': CONTEXT},
+        ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0000'): {'@graph': [], '@context': CONTEXT},
+    }
+    for i in range(nlists):
+        routes[('GET', '/admin/lists/http://rdfh.ch/lists/0001/list{}'.format(i))] = {'list': {
+            'listinfo': {'id': 'http://rdfh.ch/lists/0001/list{}'.format(i), 'name': 'list{}'.format(i)},
+            'children': [{'id': 'http://rdfh.ch/lists/0001/list{}-{}'.format(i, j), 'name': 'node{}'.format(j),
+                          'labels': [{'value': 'Node {}'.format(j), 'language': 'en'}]} for j in range(nnodes)]}}
+    for i in range(nontos):
+        routes[('GET', '/ontology/0001/onto{}/v2'.format(i))] = dict(ontology(i), **{'@graph': [], '@context': CONTEXT})
+    return routes
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the initialisation of ResourceInstanceFactory")
+    parser.add_argument("-l", "--lists", type=int, default=10, help="Number of lists")
+    parser.add_argument("-o", "--ontologies", type=int, default=4, help="Number of ontologies")
+    parser.add_argument("-d", "--delay", type=float, default=0.05, help="Latency per request in seconds")
+    args = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tmpdir, \
+            StubServer(routes=make_routes(args.lists, args.ontologies, 200), delay=args.delay) as stub:
+        snapshot = os.path.join(tmpdir, 'schema.json')
+        ResourceInstanceFactory(Connection(stub.url), '0001', snapshot=snapshot)
+        for name, kwargs in (('serial', {'jobs': 1}), ('concurrent', {'jobs': 8}), ('snapshot', {'snapshot': snapshot})):
+            con = Connection(stub.url)
+            stub.requests.clear()
+            start = time.perf_counter()
+            ResourceInstanceFactory(con, '0001', **kwargs)
+            duration = time.perf_counter() - start
+            print('{:10}: {:5.2f} s, {:3} requests'.format(name, duration, len(stub.requests)))
+            con.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.gravsearch import GravsearchQuery
+from dsplib.models.helpers import OntoInfo
+from stub_server import StubServer
+
+"""
+Compares reading all results of a Gravsearch query from a local stub server with an artificial latency
+per request, while the caller spends some time on every page:
+
+- collect: all pages are read first (as a hand-rolled loop over OFFSET would), then processed
+- stream: the pages are processed as they are read, without prefetching (prefetch=0)
+- prefetch: the next page is requested while the current one is processed (prefetch=1)
+
+Reported are the total time and the peak memory (tracemalloc) of the JSON-LD held at once.
+"""
+
+
+def make_handler(nresults: int, pagesize: int) -> Callable[[str, str, str, Optional[bytes]], Tuple[int, Any]]:
+    def resource(i: int) -> Dict[str, Any]:
+        iri = 'http://rdfh.ch/0001/thing{}'.format(i)
+        return {'@id': iri, '@type': 'anything:Thing', 'rdfs:label': 'Thing {}'.format(i),
+                'anything:hasText': [{'@id': '{}/values/{}'.format(iri, j), '@type': 'knora-api:TextValue',
+                                      'knora-api:valueAsString': 'Text {} of thing {}'.format(j, i)}
+                                     for j in range(5)]}
+
+    def handler(method: str, path: str, query: str, body: Optional[bytes]) -> Tuple[int, Any]:
+        page = int(re.search(r'OFFSET (\d+)', body.decode('utf-8')).group(1))
+        result: Dict[str, Any] = {'@graph': [resource(i) for i in range(page * pagesize,
+                                                                        min((page + 1) * pagesize, nresults))]}
+        if (page + 1) * pagesize < nresults:
+            result['knora-api:mayHaveMoreResults'] = True
+        return 200, result
+    return handler
+
+
+def process(pages: Iterable[List[Any]], work: float) -> int:
+    n = 0
+    for page in pages:
+        time.sleep(work)
+        n += len(page)
+    return n
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the paged Gravsearch results")
+    parser.add_argument("-n", "--results", type=int, default=5000, help="Number of results")
+    parser.add_argument("-p", "--page-size", type=int, default=25, help="Number of results per page")
+    parser.add_argument("-d", "--delay", type=float, default=0.02, help="Latency per request in seconds")
+    parser.add_argument("-w", "--work", type=float, default=0.02, help="Processing time per page in seconds")
+    args = parser.parse_args(args)
+
+    query = GravsearchQuery('anything:Thing', {
+        'anything': OntoInfo('http://0.0.0.0:3333/ontology/0001/anything/v2', True)}).values('anything:hasText')
+    with StubServer(default=make_handler(args.results, args.page_size), delay=args.delay) as stub:
+        con = Connection(stub.url)
+        variants = (
+            ('collect', lambda: process(list(query.pages(con, prefetch=0)), args.work)),
+            ('stream', lambda: process(query.pages(con, prefetch=0), args.work)),
+            ('prefetch', lambda: process(query.pages(con, prefetch=1), args.work)),
+        )
+        for name, variant in variants:
+            tracemalloc.start()
+            start = time.perf_counter()
+            n = variant()
+            duration = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert n == args.results
+            print('{:8}: {:6.2f} s, {:8.0f} results/s, peak memory {:7.0f} kB'.format(
+                name, duration, n / duration, peak / 1024))
+        con.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.sipi import Sipi
+from dsplib.utils.image_pipeline import ImagePipeline
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
+from stub_server import StubServer
+
+"""
+Compares the creation of resources with images where each resource uploads its image before it is created
+(as xml_upload did before) with the pipelined upload of the images ahead of the creation of the resources.
+A local stub server stands in for SIPI and DSP-API, with a configurable latency per upload and per
+created resource.
+"""
+
+
+class Res:
+    def __init__(self, id: str, image: str):
+        self.id = id
+        self.image = image
+
+    def get_resptrs(self) -> List[str]:
+        return []
+
+
+def upload_then_create(con: Connection, sipi: Sipi, resources: List[Res], jobs: int) -> float:
+    def create(resource: Res) -> str:
+        stillimage = sipi.upload_image(resource.image)['uploadedFiles'][0]['internalFilename']
+        return con.post('/v2/resources', '{"image": "' + stillimage + '"}')['@id']
+
+    start = time.perf_counter()
+    UploadScheduler(jobs).run(resources, create, IriLookup())
+    return len(resources) / (time.perf_counter() - start)
+
+
+def pipelined(con: Connection, sipi: Sipi, resources: List[Res], jobs: int, workers: int) -> float:
+    start = time.perf_counter()
+    with ImagePipeline(lambda path: sipi.upload_image(path)['uploadedFiles'][0]['internalFilename'],
+                       workers=workers) as pipeline:
+        images = pipeline.start([(r.id, r.image) for r in resources])
+
+        def create(resource: Res) -> str:
+            iri = con.post('/v2/resources', '{"image": "' + images[resource.id].result() + '"}')['@id']
+            pipeline.done(resource.id)
+            return iri
+
+        UploadScheduler(jobs).run(resources, create, IriLookup(), images)
+    return len(resources) / (time.perf_counter() - start)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the pipelined image upload")
+    parser.add_argument("-n", "--resources", type=int, default=200, help="Number of resources with an image")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Number of concurrent resource creations")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of concurrent image uploads")
+    parser.add_argument("--upload-latency", type=float, default=0.02, help="Latency of an image upload [s]")
+    parser.add_argument("--create-latency", type=float, default=0.01, help="Latency of a resource creation [s]")
+    parser.add_argument("--size", type=int, default=256 * 1024, help="Size of an image [bytes]")
+    args = parser.parse_args(args)
+
+    def sipi_upload(method, path, query, body):
+        time.sleep(args.upload_latency)
+        return 200, {'uploadedFiles': [{'internalFilename': 'Abc.jp2'}]}
+
+    def create_resource(method, path, query, body):
+        time.sleep(args.create_latency)
+        return 200, {'@id': 'http://rdfh.ch/0001/res'}
+
+    routes = {('POST', '/upload'): sipi_upload, ('POST', '/v2/resources'): create_resource}
+    with StubServer(routes=routes) as stub, tempfile.TemporaryDirectory() as tmpdir:
+        resources = []
+        for i in range(args.resources):
+            path = os.path.join(tmpdir, 'img{}.tif'.format(i))
+            with open(path, 'wb') as f:
+                f.write(os.urandom(args.size))
+            resources.append(Res('res_{}'.format(i), path))
+        con = Connection(stub.url, pool_maxsize=args.jobs)
+        sipi = Sipi(stub.url, 'stub-token', pool_maxsize=max(args.jobs, args.workers))
+        before = upload_then_create(con, sipi, resources, args.jobs)
+        after = pipelined(con, sipi, resources, args.jobs, args.workers)
+        sipi.close()
+        con.close()
+    print('resources/s before (upload, then create): {:10.1f}'.format(before))
+    print('resources/s after (pipelined uploads):    {:10.1f}'.format(after))
+    print('speedup: {:.2f}x'.format(after / before))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.utils.upload_journal import UploadJournal
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
+from stub_server import StubServer
+
+"""
+Measures the overhead of the upload journal. The same synthetic upload (one POST to a local stub server
+per resource, without references) is run with and without journaling every created resource. The stub
+server answers in well below a millisecond, thus the relative overhead is an upper bound of the overhead
+against a real DSP server.
+"""
+
+
+class Res:
+    def __init__(self, id: str):
+        self.id = id
+
+    def get_resptrs(self) -> List[str]:
+        return []
+
+
+def run(con: Connection, resources: List[Res], jobs: int, journal: UploadJournal = None) -> float:
+    def create(resource: Res) -> str:
+        iri = con.post('/v2/resources', '{}')['@id'] + resource.id
+        if journal is not None:
+            journal.add_resource(resource.id, iri)
+        return iri
+
+    start = time.perf_counter()
+    UploadScheduler(jobs).run(resources, create, IriLookup())
+    return len(resources) / (time.perf_counter() - start)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the overhead of the upload journal")
+    parser.add_argument("-n", "--resources", type=int, default=5000, help="Number of resources per run")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="Number of concurrent jobs")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of runs (the best is reported)")
+    args = parser.parse_args(args)
+
+    resources = [Res('res_{}'.format(i)) for i in range(args.resources)]
+    with StubServer(routes={('POST', '/v2/resources'): {'@id': 'http://rdfh.ch/0001/'}}) as stub, \
+            tempfile.TemporaryDirectory() as tmpdir:
+        con = Connection(stub.url, pool_maxsize=args.jobs)
+        run(con, resources[:200], args.jobs)  # warm up
+        before = 0.0
+        after = 0.0
+        for i in range(args.repeat):
+            before = max(before, run(con, resources, args.jobs))
+            with UploadJournal(os.path.join(tmpdir, 'data.xml.journal'), stub.url) as journal:
+                after = max(after, run(con, resources, args.jobs, journal))
+        con.close()
+
+        with UploadJournal(os.path.join(tmpdir, 'data.xml.journal'), stub.url) as journal:
+            start = time.perf_counter()
+            for resource in resources:
+                journal.add_resource(resource.id, 'http://rdfh.ch/0001/' + resource.id)
+            writes = len(resources) / (time.perf_counter() - start)
+
+    print('journal records/s (without upload): {:10.1f}'.format(writes))
+    print('resources/s without journal:        {:10.1f}'.format(before))
+    print('resources/s with journal:           {:10.1f}'.format(after))
+    print('overhead: {:.1f}%'.format((before - after) / before * 100.0))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.helpers import Cardinality
+from dsplib.models.resource import ResourceInstance, Propinfo
+from dsplib.models.value import TextValue, IntValue, DateValue, LinkValue
+
+"""
+Compares reading large resources (many properties with several values each) from their JSON-LD when the
+caller uses only a few of the properties:
+
+- eager: all values are converted to Value instances, as fromJsonLdObj did before
+- lazy: only the values of the used properties are converted, on first access
+
+The JSON-LD is prepared in advance, the requests are not part of the benchmark.
+"""
+
+PROPERTIES = {'anything:hasText{}'.format(i): Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_n,
+                                                       gui_order=i) for i in range(10)}
+PROPERTIES.update({'anything:hasDate{}'.format(i): Propinfo(valtype=DateValue, cardinality=Cardinality.C_0_n,
+                                                            gui_order=10 + i) for i in range(5)})
+PROPERTIES.update({'anything:hasInteger{}'.format(i): Propinfo(valtype=IntValue, cardinality=Cardinality.C_0_n,
+                                                               gui_order=15 + i) for i in range(5)})
+PROPERTIES['anything:hasOtherThingValue'] = Propinfo(valtype=LinkValue, cardinality=Cardinality.C_0_n, gui_order=20)
+
+Thing = type('Thing', (ResourceInstance,), {
+    'project': 'http://rdfh.ch/projects/0001',
+    'classname': 'anything:Thing',
+    'baseclass': 'Resource',
+    'context': {'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'},
+    'properties': PROPERTIES,
+    'lists': []
+})
+
+
+def make_resource(i: int, nvalues: int) -> Dict[str, Any]:
+    iri = 'http://rdfh.ch/0001/thing{}'.format(i)
+    counter = iter(range(1000000))
+
+    def value(valtype: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        viri = '{}/values/{}'.format(iri, next(counter))
+        return dict({'@id': viri, '@type': valtype,
+                     'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': viri + '/ark'},
+                     'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': viri + '/ark.1'},
+                     'knora-api:hasPermissions': 'V knora-admin:UnknownUser|M knora-admin:ProjectMember',
+                     'knora-api:userHasPermission': 'CR'}, **content)
+
+    resource = {'@id': iri, '@type': 'anything:Thing', 'rdfs:label': 'Thing {}'.format(i),
+                'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark'},
+                'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark.1'},
+                'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR',
+                'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+                'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'}}
+    for j in range(10):
+        resource['anything:hasText{}'.format(j)] = [
+            value('knora-api:TextValue', {'knora-api:valueAsString': 'Text {} {}'.format(j, k)})
+            for k in range(nvalues)]
+    for j in range(5):
+        resource['anything:hasDate{}'.format(j)] = [value('knora-api:DateValue', {
+            'knora-api:dateValueHasCalendar': 'GREGORIAN',
+            'knora-api:dateValueHasStartEra': 'CE', 'knora-api:dateValueHasStartYear': 1900 + k,
+            'knora-api:dateValueHasStartMonth': 1, 'knora-api:dateValueHasStartDay': 1,
+            'knora-api:dateValueHasEndEra': 'CE', 'knora-api:dateValueHasEndYear': 1900 + k,
+            'knora-api:dateValueHasEndMonth': 12, 'knora-api:dateValueHasEndDay': 31}) for k in range(nvalues)]
+    for j in range(5):
+        resource['anything:hasInteger{}'.format(j)] = [
+            value('knora-api:IntValue', {'knora-api:intValueAsInt': k}) for k in range(nvalues)]
+    resource['anything:hasOtherThingValue'] = [value('knora-api:LinkValue', {
+        'knora-api:linkValueHasTarget': {'@id': 'http://rdfh.ch/0001/thing{}'.format(k), '@type': 'anything:Thing',
+                                         'rdfs:label': 'Thing {}'.format(k)}})
+        for k in range(nvalues)]
+    return resource
+
+
+def measure(read: Callable[[Dict[str, Any]], Any], resources: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for resource in resources:
+        read(resource)
+    return time.perf_counter() - start
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the lazy conversion of the values of resources")
+    parser.add_argument("-n", "--resources", type=int, default=1000, help="Number of resources")
+    parser.add_argument("-v", "--values", type=int, default=10, help="Number of values per property")
+    args = parser.parse_args(args)
+
+    resources = [make_resource(i, args.values) for i in range(args.resources)]
+    template = Thing(con=Connection('http://0.0.0.0:3333'))
+    used = ('anything:hasText0', 'anything:hasInteger0')
+
+    def eager(jsonld_obj: Dict[str, Any]) -> Any:
+        thing = template.fromJsonLdObj(template._con, jsonld_obj)
+        return dict(thing._values.items())
+
+    def lazy(jsonld_obj: Dict[str, Any]) -> Any:
+        thing = template.fromJsonLdObj(template._con, jsonld_obj)
+        return [thing._values[propname] for propname in used]
+
+    for name, read in (('eager', eager), ('lazy', lazy)):
+        duration = measure(read, resources)
+        print('{:5}: {:7.0f} resources/s, {:7.1f} us per resource'.format(
+            name, len(resources) / duration, duration / len(resources) * 1e6))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+from typing import List, Union
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.listnode import ListNode, ListIndex
+from dsplib.models.value import ListValue
+
+"""
+Compares the resolution of "listname:nodename" for list values on a synthetic thesaurus:
+
+- before: the former recursive scan through all lists and nodes for every value (without its console output)
+- after: ListValue resolving through the ListIndex that ResourceInstanceFactory builds once
+"""
+
+
+def make_lists(con: Connection, nlists: int, fanout: int, depth: int) -> List[ListNode]:
+    def nodes(prefix: str, level: int) -> List[ListNode]:
+        result = []
+        for i in range(fanout):
+            name = '{}-{}'.format(prefix, i)
+            children = nodes(name, level + 1) if level < depth else None
+            result.append(ListNode(con=con, id='http://rdfh.ch/lists/0001/' + name, name=name, children=children))
+        return result
+
+    return [ListNode(con=con, id='http://rdfh.ch/lists/0001/list{}'.format(i), name='list{}'.format(i),
+                     children=nodes('list{}'.format(i), 1)) for i in range(nlists)]
+
+
+def find_listnode(nodes: List[ListNode], name: str) -> Union[str, None]:
+    for node in nodes:
+        if node.name == name:
+            return node.id
+        else:
+            if node.children is not None:
+                node_id = find_listnode(node.children, name)
+                if node_id is not None:
+                    return node_id
+    return None
+
+
+def before(lists: List[ListNode], values: List[str]) -> None:
+    for value in values:
+        listname, nodename = value.split(':')
+        for lst in lists:
+            if lst.name == listname:
+                find_listnode(lst.children, nodename)
+
+
+def after(lists: List[ListNode], values: List[str]) -> None:
+    index = ListIndex(lists)
+    for value in values:
+        ListValue(value, lists=index)
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the resolution of list values")
+    parser.add_argument("-n", "--values", type=int, default=2000, help="Number of list values")
+    args = parser.parse_args(args)
+
+    con = Connection('http://0.0.0.0:3333')
+    lists = make_lists(con, nlists=5, fanout=10, depth=3)
+    nodecnt = 5 * (10 + 100 + 1000)
+    values = ['list{}:list{}-{}-{}-{}'.format(i % 5, i % 5, i % 10, (i // 10) % 10, (i // 100) % 10)
+              for i in range(args.values)]
+    print('{} lists with {} nodes, {} values'.format(len(lists), nodecnt, len(values)))
+    for name, variant in (('before', before), ('after', after)):
+        start = time.perf_counter()
+        variant(lists, values)
+        duration = time.perf_counter() - start
+        print('{:6}: {:10.0f} values/s'.format(name, len(values) / duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
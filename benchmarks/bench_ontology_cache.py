@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.ontology import Ontology
+from dsplib.models.ontologycache import OntologyCache
+from stub_server import StubServer
+
+"""
+Compares reading a large synthetic ontology with Ontology.getOntologyFromServer from a local stub server
+with an artificial latency per request:
+
+- no cache: the ontology is downloaded and parsed every time
+- revalidated: warm OntologyCache, the last modification date is checked with the metadata of the project
+  and the pre-parsed ontology is loaded
+- known date: warm OntologyCache, the caller knows the last modification date (no request at all)
+"""
+
+ONTO_IRI = 'http://0.0.0.0:3333/ontology/0001/onto/v2'
+
+
+def make_ontology(nclasses: int, nprops: int) -> Dict[str, Any]:
+    graph = []
+    for i in range(nprops):
+        graph.append({'@id': 'onto:prop{}'.format(i), '@type': 'owl:ObjectProperty',
+                      'knora-api:isResourceProperty': True, 'knora-api:isEditable': True,
+                      'knora-api:objectType': {'@id': 'knora-api:TextValue'},
+                      'knora-api:subjectType': {'@id': 'onto:Class0'},
+                      'rdfs:subPropertyOf': {'@id': 'knora-api:hasValue'},
+                      'salsah-gui:guiElement': {'@id': 'salsah-gui:SimpleText'},
+                      'salsah-gui:guiAttribute': ['size=80', 'maxlength=255'],
+                      'rdfs:label': [{'@language': 'en', '@value': 'Property {}'.format(i)},
+                                     {'@language': 'de', '@value': 'Eigenschaft {}'.format(i)}],
+                      'rdfs:comment': [{'@language': 'en', '@value': 'Comment of property {}'.format(i)}]})
+    for i in range(nclasses):
+        graph.append({'@id': 'onto:Class{}'.format(i), '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+                      'rdfs:label': [{'@language': 'en', '@value': 'Class {}'.format(i)}],
+                      'rdfs:subClassOf': [{'@id': 'knora-api:Resource'}] + [
+                          {'@type': 'owl:Restriction', 'owl:minCardinality': 0,
+                           'owl:onProperty': {'@id': 'onto:prop{}'.format((i + j) % nprops)},
+                           'salsah-gui:guiOrder': j} for j in range(10)]})
+    return {'@id': ONTO_IRI, '@type': 'owl:Ontology', 'rdfs:label': 'Onto',
+            'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+            'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+            '@graph': graph,
+            '@context': {'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+                         'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+                         'owl': 'http://www.w3.org/2002/07/owl#',
+                         'xsd': 'http://www.w3.org/2001/XMLSchema#',
+                         'knora-api': 'http://api.knora.org/ontology/knora-api/v2#',
+                         'salsah-gui': 'http://api.knora.org/ontology/salsah-gui/v2#',
+                         'onto': ONTO_IRI + '#'}}
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the ontology cache")
+    parser.add_argument("-c", "--classes", type=int, default=300, help="Number of resource classes")
+    parser.add_argument("-p", "--properties", type=int, default=600, help="Number of properties")
+    parser.add_argument("-d", "--delay", type=float, default=0.05, help="Latency per request in seconds")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of reads per variant")
+    args = parser.parse_args(args)
+
+    onto = make_ontology(args.classes, args.properties)
+    metadata = {k: v for k, v in onto.items() if k != '@graph'}
+    routes = {('GET', '/ontology/0001/onto/v2'): onto,
+              ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0001'): metadata}
+    with tempfile.TemporaryDirectory() as tmpdir, StubServer(routes=routes, delay=args.delay) as stub:
+        con = Connection(stub.url)
+        cache = OntologyCache(tmpdir)
+        variants = (
+            ('no cache', None, None),
+            ('revalidated', cache, None),
+            ('known date', cache, '2021-01-01T00:00:00Z'),
+        )
+        for name, variant_cache, lmd in variants:
+            OntologyCache.set_default(variant_cache)
+            Ontology.getOntologyFromServer(con, '0001', 'onto', lastModificationDate=lmd)  # warm up
+            stub.requests.clear()
+            start = time.perf_counter()
+            for i in range(args.repeat):
+                Ontology.getOntologyFromServer(con, '0001', 'onto', lastModificationDate=lmd)
+            duration = (time.perf_counter() - start) / args.repeat
+            print('{:11}: {:6.3f} s per read, {:4.1f} requests per read'.format(
+                name, duration, len(stub.requests) / args.repeat))
+        OntologyCache.set_default(None)
+        con.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.ontology import Ontology
+from dsplib.models.ontologyindex import OntologyIndex
+from dsplib.models.resourceclass import ResourceClass
+from bench_ontology_cache import make_ontology
+
+"""
+Compares the lookup of the resource classes of a large synthetic ontology together with their knora base
+class, as done by ResourceInstanceFactory for every class:
+
+- before: a linear scan of the resource classes of the ontology for the class and for every superclass on
+  the way to the knora base class (as ResourceInstanceFactory did before)
+- after: the OntologyIndex with the dicts by name and the precomputed base classes, the time to build the
+  index included
+
+The classes form chains of --depth subclasses, the top class of a chain is derived from knora-api:Resource.
+"""
+
+
+def legacy_get_baseclass(ontologies: Dict[str, Ontology], superclasses: List[str]) -> Optional[str]:
+    for sc in superclasses:
+        ontoname, classname = sc.split(':')
+        if ontoname == 'knora-api':
+            return classname
+        o = ontologies.get(ontoname)
+        if o is None:
+            continue
+        gaga = [x for x in o.resource_classes if x.name == classname][0]
+        return legacy_get_baseclass(ontologies, gaga.superclasses)
+    return None
+
+
+def legacy_lookup(ontologies: Dict[str, Ontology], name: str) -> Tuple[ResourceClass, Optional[str]]:
+    prefix, resclass_name = name.split(':')
+    resclass = [x for x in ontologies[prefix].resource_classes if x.name == resclass_name][0]
+    return resclass, legacy_get_baseclass(ontologies, resclass.superclasses)
+
+
+def make_hierarchy(nclasses: int, depth: int) -> Dict[str, Any]:
+    json_obj = make_ontology(nclasses, 20)
+    for entry in json_obj['@graph']:
+        if entry.get('knora-api:isResourceClass'):
+            i = int(entry['@id'][len('onto:Class'):])
+            if i % depth:
+                entry['rdfs:subClassOf'][0] = {'@id': 'onto:Class{}'.format(i - 1)}
+    return json_obj
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the lookup of resource classes and base classes")
+    parser.add_argument("-c", "--classes", type=int, default=2000, help="Number of resource classes")
+    parser.add_argument("-d", "--depth", type=int, default=10, help="Depth of the class hierarchy")
+    args = parser.parse_args(args)
+
+    ontologies = {'onto': Ontology.fromJsonObj(Connection('http://0.0.0.0:3333'),
+                                               make_hierarchy(args.classes, args.depth))}
+    names = ['onto:' + x.name for x in ontologies['onto'].resource_classes]
+
+    start = time.perf_counter()
+    before = [legacy_lookup(ontologies, name) for name in names]
+    duration_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = OntologyIndex(ontologies)
+    duration_build = time.perf_counter() - start
+    after = [(index.get_class(name), index.baseclass(name)) for name in names]
+    duration_after = time.perf_counter() - start
+
+    assert before == after
+    print('{} classes, depth {}'.format(len(names), args.depth))
+    print('before: {:8.4f} s, {:9.0f} classes/s'.format(duration_before, len(names) / duration_before))
+    print('after : {:8.4f} s, {:9.0f} classes/s (index built in {:.4f} s)'.format(
+        duration_after, len(names) / duration_after, duration_build))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
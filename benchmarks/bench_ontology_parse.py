@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.ontology import Ontology
+from bench_ontology_cache import make_ontology
+
+"""
+Measures Ontology.fromJsonObj on a large synthetic ontology (the JSON-LD is prepared in advance, there are no
+requests), parsed in the calling process and in the given numbers of worker processes (--jobs).
+
+The classes and properties of the "@graph" are sorted in one pass and the prefixes of the base and knora
+ontologies are resolved once per context instead of once per class, property and cardinality. To compare
+with the former implementation, run the benchmark on an older revision of the repository.
+"""
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the parsing of ontologies")
+    parser.add_argument("-c", "--classes", type=int, default=1000, help="Number of resource classes")
+    parser.add_argument("-p", "--properties", type=int, default=2000, help="Number of properties")
+    parser.add_argument("-j", "--jobs", type=int, nargs='*', default=[2, 4], help="Numbers of worker processes")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of repetitions (the best is reported)")
+    args = parser.parse_args(args)
+
+    con = Connection('http://0.0.0.0:3333')
+    json_obj = make_ontology(args.classes, args.properties)
+    entries = args.classes + args.properties
+    print('{} classes, {} properties, {} CPUs'.format(args.classes, args.properties, os.cpu_count()))
+    runs: List[Optional[int]] = [None] + args.jobs
+    for jobs in runs:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            Ontology.fromJsonObj(con, json_obj, jobs) if jobs else Ontology.fromJsonObj(con, json_obj)
+            best = min(best, time.perf_counter() - start)
+        print('{:9}: {:6.3f} s, {:7.0f} entries/s'.format(
+            'jobs={}'.format(jobs) if jobs else 'serial', best, entries / best))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,112 @@
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../test"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.resource import ResourceInstanceFactory
+from stub_server import StubServer
+
+"""
+Compares reading many resources from a local stub server with an artificial latency per request:
+
+- serial: one "GET /v2/resources/<iri>" per resource with read()
+- batched: read_many() with multi-resource requests, one request at a time (jobs=1)
+- concurrent: read_many() with multi-resource requests, several requests at a time
+"""
+
+ONTO_IRI = 'http://0.0.0.0:3333/ontology/0001/anything/v2'
+CONTEXT = {'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+           'owl': 'http://www.w3.org/2002/07/owl#',
+           'knora-api': 'http://api.knora.org/ontology/knora-api/v2#',
+           'anything': ONTO_IRI + '#'}
+
+
+def make_routes() -> Dict[Tuple[str, str], Any]:
+    def project(iri: str, shortcode: str, shortname: str):
+        return {'project': {'id': iri, 'shortcode': shortcode, 'shortname': shortname, 'longname': shortname,
+                            'description': [], 'keywords': [], 'ontologies': [], 'selfjoin': False, 'status': True}}
+
+    ontology = {'@id': ONTO_IRI, '@type': 'owl:Ontology', 'rdfs:label': 'Anything',
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'}}
+    graph = [{'@id': 'anything:hasText', '@type': 'owl:ObjectProperty',
+              'knora-api:isResourceProperty': True, 'knora-api:isEditable': True,
+              'knora-api:objectType': {'@id': 'knora-api:TextValue'},
+              'knora-api:subjectType': {'@id': 'anything:Thing'},
+              'rdfs:subPropertyOf': {'@id': 'knora-api:hasValue'},
+              'rdfs:label': [{'@language': 'en', '@value': 'Text'}]},
+             {'@id': 'anything:Thing', '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+              'rdfs:label': [{'@language': 'en', '@value': 'Thing'}],
+              'rdfs:subClassOf': [{'@id': 'knora-api:Resource'},
+                                  {'@type': 'owl:Restriction', 'owl:minCardinality': 0,
+                                   'owl:onProperty': {'@id': 'anything:hasText'}, 'salsah-gui:guiOrder': 1}]}]
+    return {
+        ('GET', '/admin/projects/shortcode/0001'): project('http://rdfh.ch/projects/0001', '0001', 'anything'),
+        ('GET', '/admin/projects/shortcode/0000'): project('http://rdfh.ch/projects/0000', '0000', 'shared'),
+        ('GET', '/admin/lists'): {'lists': []},
+        ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0001'): dict(ontology, **{'@context': CONTEXT}),
+        ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0000'): {'@graph': [], '@context': CONTEXT},
+        ('GET', '/ontology/0001/anything/v2'): dict(ontology, **{'@graph': graph, '@context': CONTEXT}),
+    }
+
+
+def resource(iri: str) -> Dict[str, Any]:
+    def common(iri: str) -> Dict[str, Any]:
+        return {'@id': iri, 'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark'},
+                'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark.1'},
+                'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR'}
+
+    return dict(common(iri), **{
+        '@type': 'anything:Thing', 'rdfs:label': iri.split('/')[-1],
+        'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+        'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+        'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+        'anything:hasText': [dict(common('{}/values/{}'.format(iri, j)), **{
+            '@type': 'knora-api:TextValue', 'knora-api:valueAsString': 'Text {} of {}'.format(j, iri)})
+                             for j in range(3)]})
+
+
+def resources(method: str, path: str, query: Dict[str, Any], body: Any) -> Tuple[int, Any]:
+    iris = re.findall(r'http://rdfh\.ch/0001/[^/]+', path)
+    if len(iris) == 1:
+        return 200, resource(iris[0])
+    return 200, {'@graph': [resource(iri) for iri in iris]}
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of reading many resources")
+    parser.add_argument("-n", "--resources", type=int, default=1000, help="Number of resources")
+    parser.add_argument("-d", "--delay", type=float, default=0.02, help="Latency per request in seconds")
+    parser.add_argument("-b", "--batch-size", type=int, default=25, help="Number of resources per request")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="Number of concurrent requests")
+    args = parser.parse_args(args)
+
+    iris = ['http://rdfh.ch/0001/thing{}'.format(i) for i in range(args.resources)]
+    with StubServer(routes=make_routes(), default=resources, delay=args.delay) as stub:
+        con = Connection(stub.url)
+        factory = ResourceInstanceFactory(con, '0001')
+        thing = factory.get_resclass('anything:Thing')
+        variants = (
+            ('serial', lambda: [thing(con=con, iri=iri).read() for iri in iris]),
+            ('batched', lambda: list(factory.read_many(iris, batch_size=args.batch_size, jobs=1))),
+            ('concurrent', lambda: list(factory.read_many(iris, batch_size=args.batch_size, jobs=args.jobs))),
+        )
+        for name, variant in variants:
+            stub.requests.clear()
+            start = time.perf_counter()
+            result = variant()
+            duration = time.perf_counter() - start
+            assert [r.iri for r in result] == iris
+            print('{:10}: {:8.0f} resources/s, {:5d} requests'.format(
+                name, len(iris) / duration, len(stub.requests)))
+        con.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
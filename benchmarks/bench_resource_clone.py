@@ -0,0 +1,123 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from typing import Any, Callable, Dict, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.helpers import Cardinality
+from dsplib.models.permission import Permissions
+from dsplib.models.resource import ResourceInstance, Propinfo
+from dsplib.models.value import TextValue, IntValue, LinkValue
+
+"""
+Compares the construction of the resulting instances of create/read round-trips (without the requests):
+
+- create: the instance returned by create() from the result of "POST /v2/resources"
+- read: the instance returned by read() from the JSON-LD of "GET /v2/resources/<iri>"
+
+before: the former construction by copy.deepcopy of the instance (including its connection and values)
+after: the new instance is built directly, the connection, permissions and value objects are shared
+
+Reported are the time and the memory (tracemalloc) that is held per resulting instance.
+"""
+
+PROPERTIES = {
+    'anything:hasText': Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_n, gui_order=1),
+    'anything:hasInteger': Propinfo(valtype=IntValue, cardinality=Cardinality.C_0_n, gui_order=2),
+    'anything:hasOtherThing': Propinfo(valtype=LinkValue, cardinality=Cardinality.C_0_n, gui_order=3,
+                                       attributes='anything:Thing'),
+}
+ATTRIBUTES = {'project': 'http://rdfh.ch/projects/0001', 'classname': 'anything:Thing', 'baseclass': 'Resource',
+              'context': {'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'},
+              'properties': PROPERTIES, 'lists': []}
+
+
+def legacy_new_instance(self: ResourceInstance, iri: str, ark: str, vark: str) -> ResourceInstance:
+    newinstance = deepcopy(self)
+    newinstance._iri = iri
+    newinstance._ark = ark
+    newinstance._vark = vark
+    return newinstance
+
+
+def legacy_from_jsonld_obj(self: ResourceInstance, con: Connection, jsonld_obj: Any) -> ResourceInstance:
+    newinstance = legacy_new_instance(self, jsonld_obj['@id'], None, None)
+    newinstance.__dict__.update({name: value for name, value in Thing.fromJsonLdObj(con, jsonld_obj).__dict__.items()
+                                 if name not in ('_con', '_changed')})
+    return newinstance
+
+
+Thing = type('Thing', (ResourceInstance,), dict(ATTRIBUTES))
+LegacyThing = type('Thing', (ResourceInstance,), dict(ATTRIBUTES, _ResourceInstance__new_instance=legacy_new_instance,
+                                                     fromJsonLdObj=legacy_from_jsonld_obj))
+
+
+def create_result(i: int) -> Dict[str, Any]:
+    return {'@id': 'http://rdfh.ch/0001/thing{}'.format(i),
+            'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/{}'.format(i)},
+            'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/{}.1'.format(i)}}
+
+
+def read_result(i: int) -> Dict[str, Any]:
+    def value(j: int, valtype: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        return dict({'@id': 'http://rdfh.ch/0001/thing{}/values/{}'.format(i, j), '@type': valtype,
+                     'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/{}/{}'.format(i, j)},
+                     'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/{}/{}.1'.format(i, j)},
+                     'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR'},
+                    **content)
+
+    return dict(create_result(i), **{
+        '@type': 'anything:Thing', 'rdfs:label': 'Thing {}'.format(i),
+        'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR',
+        'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+        'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+        'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+        'anything:hasText': [value(j, 'knora-api:TextValue', {'knora-api:valueAsString': 'Text {}'.format(j)})
+                             for j in range(3)],
+        'anything:hasInteger': value(3, 'knora-api:IntValue', {'knora-api:intValueAsInt': i}),
+    })
+
+
+def measure(build: Callable[[int], Any], n: int) -> Tuple[float, float]:
+    start = time.perf_counter()
+    for i in range(n):
+        build(i)
+    duration = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    results = [build(i) for i in range(n)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return duration / n, current / n
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the construction of resource instances")
+    parser.add_argument("-n", "--resources", type=int, default=5000, help="Number of resources")
+    args = parser.parse_args(args)
+
+    con = Connection('http://0.0.0.0:3333')
+    permissions = Permissions.fromString('V knora-admin:UnknownUser|M knora-admin:ProjectMember')
+    values = {'anything:hasText': ['Text 1', 'Text 2', 'Text 3'], 'anything:hasInteger': 42,
+              'anything:hasOtherThing': 'http://rdfh.ch/0001/other'}
+    create_results = [create_result(i) for i in range(args.resources)]
+    read_results = [read_result(i) for i in range(args.resources)]
+    for variant, cls in (('before', LegacyThing), ('after', Thing)):
+        resource = cls(con=con, label='Thing', permissions=permissions, values=values)
+        template = cls(con=con, iri='http://rdfh.ch/0001/thing')
+        for name, build in (('create', lambda i: resource._from_create_result(create_results[i])),
+                            ('read', lambda i: template.fromJsonLdObj(con, read_results[i]))):
+            duration, memory = measure(build, args.resources)
+            print('{:6} {:6}: {:7.1f} us, {:7.0f} bytes held per resource'.format(
+                variant, name, duration * 1e6, memory))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
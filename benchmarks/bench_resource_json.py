@@ -0,0 +1,108 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Any, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.connection import Connection
+from dsplib.models.helpers import Actions, Cardinality, Context, OntoInfo
+from dsplib.models.permission import Permissions
+from dsplib.models.resource import ResourceInstance, ResourceEncoder, Propinfo, KnoraStandoffXmlEncoder, jsonld_default
+from dsplib.models.value import TextValue, IntValue, DateValue, DecimalValue, LinkValue
+
+"""
+Compares the serialisation of the JSON-LD for the creation of resources (resources/second and the average
+size of the payload):
+
+- before: toJsonLdObj() and json.dumps(indent=4) with KnoraStandoffXmlEncoder (pure Python encoder), followed
+  by printing the payload (to /dev/null)
+- after: the precompiled ResourceEncoder of the resource class with the C encoder of the json module and
+  the minimal JSON-LD context of each payload
+- orjson: the ResourceEncoder with orjson as backend (if installed)
+
+The context holds the prefixes of a project and of the shared project with several ontologies, as the one
+of ResourceInstanceFactory.
+"""
+
+
+def make_class() -> type:
+    context = dict(Context({'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'}))
+    for i in range(20):
+        context['onto{}'.format(i)] = OntoInfo('http://0.0.0.0:3333/ontology/0001/onto{}/v2'.format(i), True)
+    properties = {
+        'anything:hasText': Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_n, gui_order=1),
+        'anything:hasInteger': Propinfo(valtype=IntValue, cardinality=Cardinality.C_0_n, gui_order=2),
+        'anything:hasDate': Propinfo(valtype=DateValue, cardinality=Cardinality.C_0_1, gui_order=3),
+        'anything:hasDecimal': Propinfo(valtype=DecimalValue, cardinality=Cardinality.C_0_1, gui_order=4),
+        'anything:hasOtherThing': Propinfo(valtype=LinkValue, cardinality=Cardinality.C_0_n, gui_order=5,
+                                           attributes='anything:Thing'),
+    }
+    return type('Thing', (ResourceInstance,), {'project': 'http://rdfh.ch/projects/0001',
+                                               'classname': 'anything:Thing',
+                                               'baseclass': 'Resource',
+                                               'context': context,
+                                               'properties': properties,
+                                               'lists': []})
+
+
+def make_resources(n: int) -> List[ResourceInstance]:
+    cls = make_class()
+    con = Connection('http://0.0.0.0:3333')
+    permissions = Permissions.fromString('V knora-admin:UnknownUser|M knora-admin:ProjectMember')
+    return [cls(con=con, label='Thing {}'.format(i), permissions=permissions, values={
+        'anything:hasText': ['Text {}'.format(i), 'Zweiter Text {}'.format(i)],
+        'anything:hasInteger': i,
+        'anything:hasDate': 'GREGORIAN:CE:2014-01-31:CE:2014-02-{:02d}'.format(1 + i % 28),
+        'anything:hasDecimal': i / 7,
+        'anything:hasOtherThing': 'http://rdfh.ch/0001/thing{}'.format(i // 2),
+    }) for i in range(n)]
+
+
+def before(resources: List[ResourceInstance]) -> int:
+    size = 0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for resource in resources:
+            jsondata = json.dumps(resource.toJsonLdObj(Actions.Create), indent=4, separators=(',', ': '),
+                                  cls=KnoraStandoffXmlEncoder)
+            print(jsondata)
+            size += len(jsondata)
+    return size
+
+
+def after(resources: List[ResourceInstance], encoder: ResourceEncoder) -> int:
+    size = 0
+    for resource in resources:
+        size += len(encoder.encode(resource))
+    return size
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the serialisation of resources")
+    parser.add_argument("-n", "--resources", type=int, default=20000, help="Number of resources")
+    args = parser.parse_args(args)
+
+    resources = make_resources(args.resources)
+    cls = type(resources[0])
+    variants: List[Any] = [('before', before),
+                           ('after', lambda r: after(r, cls.get_encoder()))]
+    try:
+        import orjson
+        encoder = ResourceEncoder(cls.classname, cls.project, cls.context, cls.properties,
+                                  dumps=lambda obj: orjson.dumps(obj, default=jsonld_default))
+        variants.append(('orjson', lambda r: after(r, encoder)))
+    except ImportError:
+        print('orjson is not installed')
+    for name, variant in variants:
+        start = time.perf_counter()
+        size = variant(resources)
+        duration = time.perf_counter() - start
+        print('{:6}: {:8.0f} resources/s, {:5.0f} bytes/resource'.format(
+            name, len(resources) / duration, size / len(resources)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
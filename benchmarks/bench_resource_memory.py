@@ -0,0 +1,129 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from lxml import etree
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.utils.xml_upload import KnoraResource, free_element, property_tags
+
+"""
+Compares the memory (measured with tracemalloc) held by the parsed resources of a synthetic XML data file:
+
+- before: the former representation of KnoraResource/KnoraProperty/KnoraValue with a __dict__ per instance,
+  lists, and a new string object for every property name, resource type, permission id and reference
+- after: the slotted KnoraResource/KnoraProperty/KnoraValue with interned names and tuples
+
+Both variants read the file with the same iterparse loop, the schema validation is left out. The time is
+measured in a separate pass without tracemalloc, whose per-allocation overhead would distort it.
+"""
+
+
+class LegacyValue:
+    def __init__(self, context: etree.iterparse, node: etree.Element, valtype: str, listname: Optional[str]):
+        self._resrefs = None
+        self._comment = node.get('comment')
+        self._permissions = node.get('permissions')
+        for event, subnode in context:
+            if event == 'end' and subnode.tag == valtype:
+                break
+        if valtype == 'list':
+            self._value = listname + ':' + "".join(node.itertext())
+        else:
+            self._value = "".join(node.itertext())
+        node.clear()
+
+
+class LegacyProperty:
+    def __init__(self, context: etree.iterparse, node: etree.Element, valtype: str, default_ontology: str):
+        self._name = default_ontology + ':' + node.attrib['name'].split(':')[1]
+        listname = node.attrib.get('list')
+        self._valtype = valtype
+        self._values = []
+        for event, subnode in context:
+            if event == 'start':
+                self._values.append(LegacyValue(context, subnode, valtype, listname))
+            else:
+                break
+
+
+class LegacyResource:
+    def __init__(self, context: etree.iterparse, node: etree.Element, default_ontology: str):
+        self._id = node.attrib['id']
+        self._label = node.attrib['label']
+        self._restype = default_ontology + ':' + node.attrib['restype'].split(':')[1]
+        self._permissions = node.attrib['permissions']
+        self._image = None
+        self._properties = []
+        self._links = []
+        for event, subnode in context:
+            if event == 'start':
+                self._properties.append(LegacyProperty(context, subnode, property_tags[subnode.tag], default_ontology))
+            else:
+                break
+
+
+def write_xml(path: str, n: int) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<knora shortcode="0001" default-ontology="anything">\n')
+        for i in range(n):
+            f.write('<resource label="Thing {0}" restype=":Thing" id="res_{0}" permissions="res-default">'.format(i))
+            f.write('<text-prop name=":hasText"><text permissions="prop-default" encoding="utf8">Text {}</text></text-prop>'.format(i))
+            f.write('<integer-prop name=":hasInteger"><integer permissions="prop-default">{}</integer></integer-prop>'.format(i % 1000))
+            f.write('<list-prop list="treelist" name=":hasListItem"><list permissions="prop-default">Tree list node {:02d}</list></list-prop>'.format(i % 10))
+            f.write('<resptr-prop name=":hasOtherThing"><resptr permissions="prop-default">res_{}</resptr></resptr-prop>'.format(i // 2))
+            f.write('</resource>\n')
+        f.write('</knora>\n')
+
+
+def read(path: str, resclass: type) -> List:
+    context = etree.iterparse(path, events=("start", "end"))
+    resources = []
+    for event, node in context:
+        if event == 'start' and node.tag == 'resource':
+            resources.append(resclass(context, node, 'anything'))
+            free_element(node)
+    return resources
+
+
+def parse(path: str, resclass: type) -> Tuple[List, int, float]:
+    # the time is measured without tracemalloc, which slows down every allocation
+    gc.collect()
+    start = time.perf_counter()
+    read(path, resclass)
+    duration = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    resources = read(path, resclass)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resources, current, duration
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the memory held by the parsed resources")
+    parser.add_argument("-n", "--values", type=int, default=1000000, help="Number of values in the file")
+    args = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'data.xml')
+        write_xml(path, args.values // 4)
+        results = {}
+        for variant, resclass in (('before', LegacyResource), ('after', KnoraResource)):
+            resources, current, duration = parse(path, resclass)
+            results[variant] = current
+            print('{:6}: {} values in {:6.2f} s, {:8.1f} MB held ({:5.0f} bytes/value)'.format(
+                variant, len(resources) * 4, duration, current / 1e6, current / (len(resources) * 4)))
+            del resources
+        print('ratio : {:.2f}x'.format(results['before'] / results['after']))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
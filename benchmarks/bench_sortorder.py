@@ -0,0 +1,94 @@
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.utils.resource_graph import ResourceGraph
+
+"""
+Scaling benchmark of the topological sort of the resources on synthetic reference graphs. Each resource
+references up to --refs randomly chosen other resources that were generated before it, the resources are
+then shuffled. The former multi-pass do_sortorder (copied below without its output) is only run up to
+--legacy-max resources, as it is quadratic or worse.
+"""
+
+
+class Res:
+    def __init__(self, id: str, resptrs: List[str]):
+        self.id = id
+        self.resptrs = resptrs
+
+    def get_resptrs(self) -> List[str]:
+        return self.resptrs
+
+
+def make_resources(n: int, refs: int, seed: int) -> List[Res]:
+    rnd = random.Random(seed)
+    resources = []
+    for i in range(n):
+        targets = {rnd.randrange(i) for k in range(rnd.randint(0, refs))} if i > 0 else set()
+        resources.append(Res('res_{}'.format(i), ['res_{}'.format(t) for t in targets]))
+    rnd.shuffle(resources)
+    return resources
+
+
+def legacy_sortorder(resources: List[Res]) -> List[Res]:
+    ok_resources: List[Res] = []
+    notok_resources: List[Res] = []
+    ok_resids: List[str] = []
+    cnt = 0
+    notok_len = 9999999
+    while len(resources) > 0 and cnt < 10000:
+        for resource in resources:
+            resptrs = resource.get_resptrs()
+            if len(resptrs) == 0:
+                ok_resources.append(resource)
+                ok_resids.append(resource.id)
+            else:
+                ok = True
+                for resptr in resptrs:
+                    if resptr not in ok_resids:
+                        ok = False
+                if ok:
+                    ok_resources.append(resource)
+                    ok_resids.append(resource.id)
+                else:
+                    notok_resources.append(resource)
+        resources = notok_resources
+        if not len(notok_resources) < notok_len:
+            raise Exception('Cannot resolve resptr dependencies')
+        notok_len = len(notok_resources)
+        notok_resources = []
+        cnt += 1
+    return ok_resources
+
+
+def timed(func, resources: List[Res]) -> float:
+    start = time.perf_counter()
+    func(resources)
+    return time.perf_counter() - start
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the topological sort of resources")
+    parser.add_argument("-s", "--sizes", type=int, nargs='+', default=[1000, 3000, 10000, 100000, 300000],
+                        help="Numbers of resources")
+    parser.add_argument("-r", "--refs", type=int, default=3, help="Maximal number of references per resource")
+    parser.add_argument("--legacy-max", type=int, default=3000,
+                        help="Maximal number of resources for the former algorithm")
+    args = parser.parse_args(args)
+
+    print('{:>10} {:>14} {:>14}'.format('resources', 'former [s]', 'graph [s]'))
+    for n in args.sizes:
+        resources = make_resources(n, args.refs, seed=n)
+        after = timed(lambda r: ResourceGraph(r).sort(), resources)
+        before = '{:14.3f}'.format(timed(legacy_sortorder, resources)) if n <= args.legacy_max else '{:>14}'.format('-')
+        print('{:>10} {} {:14.3f}'.format(n, before, after))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
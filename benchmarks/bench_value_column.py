@@ -0,0 +1,53 @@
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.permission import Permissions
+from dsplib.models.value import DateValue, DecimalValue, IntValue
+
+"""
+Compares the creation of the values of the columns of a synthetic table (strings as read from a CSV file):
+
+- rows: one constructor call per row, each validating its string
+- column: from_column() of the value class, the column is validated and converted at once (a distinct
+  date string is parsed only once) and the instances are created without validating again
+
+Reported are the rows per second for an integer, a decimal and a date column.
+"""
+
+
+def measure(create: Callable[[List[str]], Any], column: List[str]) -> float:
+    start = time.perf_counter()
+    values = create(column)
+    duration = time.perf_counter() - start
+    assert len(values) == len(column)
+    return duration
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the creation of values column by column")
+    parser.add_argument("-n", "--rows", type=int, default=200000, help="Number of rows")
+    args = parser.parse_args(args)
+
+    rnd = random.Random(42)
+    permissions = Permissions.fromString('V knora-admin:UnknownUser|M knora-admin:ProjectMember')
+    columns = (
+        (IntValue, [str(rnd.randint(-100000, 100000)) for _ in range(args.rows)]),
+        (DecimalValue, ['{:.3f}'.format(rnd.uniform(-1000.0, 1000.0)) for _ in range(args.rows)]),
+        (DateValue, ['GREGORIAN:CE:{}-{:02d}-{:02d}'.format(rnd.randint(1800, 2020), rnd.randint(1, 12),
+                                                             rnd.randint(1, 28)) for _ in range(args.rows)]),
+    )
+    for cls, column in columns:
+        rows = measure(lambda c: [cls(cell, permissions=permissions) for cell in c], column)
+        batch = measure(lambda c: cls.from_column(c, permissions=permissions), column)
+        print('{:12}: rows {:8.0f} values/s, column {:8.0f} values/s ({:.1f}x)'.format(
+            cls.__name__, len(column) / rows, len(column) / batch, rows / batch))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,178 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+from dsplib.models.permission import Permissions
+from dsplib.models.value import Value, TextValue, ColorValue, DateValue, DecimalValue, GeomValue, GeonameValue, \
+    IntValue, BooleanValue, UriValue, TimeValue, IntervalValue, ListValue, LinkValue, fromJsonLdObj
+
+"""
+Compares the conversion of the values in the JSON-LD of resources to Value instances on a corpus of
+"GET /v2/resources" responses:
+
+- before: a dispatch table built for every value, dates and intervals assembled to strings and parsed
+  again by the constructor and the permissions split for every value (as value.fromJsonLdObj did before)
+- after: the module-level registry of value types, dates and intervals built from their components and
+  the permission strings split once
+
+The corpus is either a directory of recorded responses of DSP-API (one JSON file per response, given
+with --corpus) or a synthetic corpus with all value types.
+"""
+
+NOT_VALUES = {'@id', '@type', '@context', 'rdfs:label', 'knora-api:arkUrl', 'knora-api:versionArkUrl',
+              'knora-api:creationDate', 'knora-api:attachedToUser', 'knora-api:attachedToProject',
+              'knora-api:hasPermissions', 'knora-api:userHasPermission'}
+
+
+def legacy_date(jsonld_obj: Any) -> DateValue:
+    datestr = ""
+    datestr += jsonld_obj.get("knora-api:dateValueHasCalendar") + ":" \
+        if jsonld_obj.get("knora-api:dateValueHasCalendar") is not None else ""
+    datestr += jsonld_obj.get("knora-api:dateValueHasStartEra") + ":" \
+        if jsonld_obj.get("knora-api:dateValueHasStartEra") is not None else ""
+    datestr += str(jsonld_obj.get("knora-api:dateValueHasStartYear")) \
+        if jsonld_obj.get("knora-api:dateValueHasStartYear") is not None else ""
+    datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasStartMonth")) \
+        if jsonld_obj.get("knora-api:dateValueHasStartMonth") is not None else ""
+    datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasStartDay")) \
+        if jsonld_obj.get("knora-api:dateValueHasStartDay") is not None else ""
+    datestr += ":" + jsonld_obj.get("knora-api:dateValueHasEndEra") \
+        if jsonld_obj.get("knora-api:dateValueHasEndEra") is not None else ""
+    datestr += ":" + str(jsonld_obj.get("knora-api:dateValueHasEndYear")) \
+        if jsonld_obj.get("knora-api:dateValueHasEndYear") is not None else ""
+    datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasEndMonth")) \
+        if jsonld_obj.get("knora-api:dateValueHasEndMonth") is not None else ""
+    datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasEndDay")) \
+        if jsonld_obj.get("knora-api:dateValueHasEndDay") is not None else ""
+    return DateValue(value=datestr, **Value.getFromJsonLd(jsonld_obj))
+
+
+def legacy_interval(jsonld_obj: Any) -> IntervalValue:
+    start = Value.get_typed_value("knora-api:intervalValueHasStart", jsonld_obj)
+    end = Value.get_typed_value("knora-api:intervalValueHasEnd", jsonld_obj)
+    return IntervalValue(value=str(start) + ":" + str(end), **Value.getFromJsonLd(jsonld_obj))
+
+
+def legacy_decode(jsonld_obj: Any) -> Value:
+    switcher = {
+        'knora-api:TextValue': TextValue.fromJsonLdObj,
+        'knora-api:ColorValue': ColorValue.fromJsonLdObj,
+        'knora-api:DateValue': legacy_date,
+        'knora-api:DecimalValue': DecimalValue.fromJsonLdObj,
+        'knora-api:GeomValue': GeomValue.fromJsonLdObj,
+        'knora-api:GeonameValue': GeonameValue.fromJsonLdObj,
+        'knora-api:IntValue': IntValue.fromJsonLdObj,
+        'knora-api:BooleanValue': BooleanValue.fromJsonLdObj,
+        'knora-api:UriValue': UriValue.fromJsonLdObj,
+        'knora-api:TimeValue': TimeValue.fromJsonLdObj,
+        'knora-api:IntervalValue': legacy_interval,
+        'knora-api:ListValue': ListValue.fromJsonLdObj,
+        'knora-api:LinkValue': LinkValue.fromJsonLdObj,
+    }
+    return switcher[jsonld_obj.get('@type')](jsonld_obj)
+
+
+def synthetic_resource(i: int) -> Dict[str, Any]:
+    iri = 'http://rdfh.ch/0001/thing{}'.format(i)
+    counter = iter(range(1000))
+
+    def value(valtype: str, **content: Any) -> Dict[str, Any]:
+        viri = '{}/values/{}'.format(iri, next(counter))
+        return dict({'@id': viri, '@type': 'knora-api:' + valtype,
+                     'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': viri + '/ark'},
+                     'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': viri + '/ark.1'},
+                     'knora-api:hasPermissions': 'V knora-admin:UnknownUser|M knora-admin:ProjectMember',
+                     'knora-api:userHasPermission': 'CR'}, **content)
+
+    def decimal(v: float) -> Dict[str, Any]:
+        return {'@type': 'xsd:decimal', '@value': str(v)}
+
+    return {
+        '@id': iri, '@type': 'anything:Thing', 'rdfs:label': 'Thing {}'.format(i),
+        'anything:hasText': [value('TextValue', **{'knora-api:valueAsString': 'Text {}'.format(j)}) for j in range(3)],
+        'anything:hasColor': value('ColorValue', **{'knora-api:colorValueAsColor': '#ff3333'}),
+        'anything:hasDate': [value('DateValue', **{
+            'knora-api:dateValueHasCalendar': 'GREGORIAN',
+            'knora-api:dateValueHasStartEra': 'CE', 'knora-api:dateValueHasStartYear': 1900 + j,
+            'knora-api:dateValueHasStartMonth': 1 + j, 'knora-api:dateValueHasStartDay': 1,
+            'knora-api:dateValueHasEndEra': 'CE', 'knora-api:dateValueHasEndYear': 1901 + j,
+            'knora-api:dateValueHasEndMonth': 12, 'knora-api:dateValueHasEndDay': 31}) for j in range(5)],
+        'anything:hasDecimal': value('DecimalValue', **{'knora-api:decimalValueAsDecimal': decimal(i / 7)}),
+        'anything:hasGeometry': value('GeomValue', **{
+            'knora-api:geometryValueAsGeometry': '{"status":"active","type":"rectangle","points":[]}'}),
+        'anything:hasGeoname': value('GeonameValue', **{'knora-api:geonameValueAsGeonameCode': '2661604'}),
+        'anything:hasInteger': [value('IntValue', **{'knora-api:intValueAsInt': j}) for j in range(3)],
+        'anything:hasBoolean': value('BooleanValue', **{'knora-api:booleanValueAsBoolean': True}),
+        'anything:hasUri': value('UriValue', **{
+            'knora-api:uriValueAsUri': {'@type': 'xsd:anyURI', '@value': 'http://www.example.org/{}'.format(i)}}),
+        'anything:hasTimeStamp': value('TimeValue', **{
+            'knora-api:timeValueAsTimeStamp': {'@type': 'xsd:dateTimeStamp', '@value': '2019-08-28T15:59:12.725Z'}}),
+        'anything:hasInterval': [value('IntervalValue', **{'knora-api:intervalValueHasStart': decimal(j),
+                                                          'knora-api:intervalValueHasEnd': decimal(j + 1.5)})
+                                 for j in range(3)],
+        'anything:hasListItem': value('ListValue', **{
+            'knora-api:listValueAsListNode': {'@id': 'http://rdfh.ch/lists/0001/treeList01'}}),
+        'anything:hasOtherThingValue': value('LinkValue', **{
+            'knora-api:linkValueHasTarget': {'@id': 'http://rdfh.ch/0001/thing{}'.format(i + 1),
+                                             '@type': 'anything:Thing', 'rdfs:label': 'Thing {}'.format(i + 1)}}),
+    }
+
+
+def load_corpus(directory: str) -> List[Dict[str, Any]]:
+    resources = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            response = json.load(f)
+        resources.extend(response.get('@graph', [response]))
+    return resources
+
+
+def extract_values(resources: List[Dict[str, Any]]) -> List[Any]:
+    values = []
+    for resource in resources:
+        for key, obj in resource.items():
+            if key in NOT_VALUES:
+                continue
+            for o in obj if isinstance(obj, list) else [obj]:
+                if isinstance(o, dict) and o.get('@type') != 'knora-api:StillImageFileValue':
+                    values.append(o)
+    return values
+
+
+def measure(decode: Callable[[Any], Value], values: List[Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            decode(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of the conversion of JSON-LD values")
+    parser.add_argument("-c", "--corpus", help="Directory of recorded responses of GET /v2/resources (JSON files)")
+    parser.add_argument("-n", "--resources", type=int, default=2000, help="Number of synthetic resources")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of repetitions (the best is reported)")
+    args = parser.parse_args(args)
+
+    resources = load_corpus(args.corpus) if args.corpus else [synthetic_resource(i) for i in range(args.resources)]
+    values = extract_values(resources)
+    print('{} resources, {} values'.format(len(resources), len(values)))
+    cached_parse = Permissions.__dict__['_parse']
+    for name, decode, parse in (('before', legacy_decode, staticmethod(cached_parse.__func__.__wrapped__)),
+                                ('after', fromJsonLdObj, cached_parse)):
+        Permissions._parse = parse
+        duration = measure(decode, values, args.repeat)
+        print('{:6}: {:8.0f} values/s, {:5.2f} us per value'.format(
+            name, len(values) / duration, duration / len(values) * 1e6))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
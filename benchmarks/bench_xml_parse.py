@@ -0,0 +1,114 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "../knora"))
+
+"""
+Compares time and peak memory (maximum resident set size) of reading a synthetic XML data file:
+
+- before: etree.parse of the whole document for the schema validation, then a second pass with iterparse
+  that keeps the complete tree
+- after: parse_xml, a single streaming iterparse pass with validation that releases the processed elements
+- stream: XmlDataReader.resources() as used by the streaming upload, each resource is dropped after it has
+  been processed, thus the peak memory does not depend on the size of the file
+
+Each variant runs in a fresh process.
+"""
+
+
+class ProjectContextStub:
+    shortcode = '0001'
+    project_name = 'anything'
+    groupmap = {}
+
+
+def write_xml(path: str, n: int) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<knora shortcode="0001" default-ontology="anything">\n')
+        f.write('<permissions id="res-default"><allow group="UnknownUser">V</allow><allow group="ProjectAdmin">CR</allow></permissions>\n')
+        f.write('<permissions id="prop-default"><allow group="UnknownUser">V</allow><allow group="ProjectAdmin">CR</allow></permissions>\n')
+        for i in range(n):
+            f.write('<resource label="Thing {0}" restype=":Thing" id="res_{0}" permissions="res-default">'.format(i))
+            f.write('<text-prop name=":hasText"><text permissions="prop-default" encoding="utf8">{}</text></text-prop>'.format('Lorem ipsum dolor sit amet ' * 8))
+            f.write('<integer-prop name=":hasInteger"><integer permissions="prop-default">{}</integer></integer-prop>'.format(i))
+            if i > 0:
+                f.write('<resptr-prop name=":hasOtherThing"><resptr permissions="prop-default">res_{}</resptr></resptr-prop>'.format(i - 1))
+            f.write('</resource>\n')
+        f.write('</knora>\n')
+
+
+def before(path: str) -> int:
+    from lxml import etree
+    from dsplib.utils.xml_upload import KnoraResource, XmlPermission
+    xmlschema = etree.XMLSchema(etree.parse(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                                         '../knora/dsplib/utils/knora-data-schema.xsd')))
+    doc = etree.parse(path)
+    xmlschema.assertValid(doc)
+    del doc
+    context = etree.iterparse(path, events=("start", "end"))
+    resources = []
+    while True:
+        event, node = next(context)
+        if event == 'start':
+            if node.tag == 'resource':
+                resources.append(KnoraResource(context, node, 'anything'))
+            elif node.tag == 'permissions':
+                XmlPermission(context, node, ProjectContextStub())
+        elif node.tag == 'knora':
+            break
+    return len(resources)
+
+
+def after(path: str) -> int:
+    from dsplib.utils.xml_upload import parse_xml
+    return len(parse_xml(path, ProjectContextStub())[2])
+
+
+def stream(path: str) -> int:
+    from dsplib.utils.xml_upload import XmlDataReader
+    return sum(1 for r in XmlDataReader(path, ProjectContextStub()).resources())
+
+
+def measure(variant: str, path: str, queue: multiprocessing.Queue) -> None:
+    try:
+        start = time.perf_counter()
+        n = globals()[variant](path)
+        queue.put((n, time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    except BaseException as err:
+        queue.put(err)
+
+
+def run(variant: str, path: str) -> Tuple[int, float, int]:
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=measure, args=(variant, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Benchmark of reading the XML data file")
+    parser.add_argument("-n", "--resources", type=int, default=50000, help="Number of resources in the file")
+    args = parser.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'data.xml')
+        write_xml(path, args.resources)
+        print('file size: {:.1f} MB'.format(os.path.getsize(path) / 1e6))
+        for variant in ('before', 'after', 'stream'):
+            n, duration, maxrss = run(variant, path)
+            print('{:7}: {} resources in {:6.2f} s, peak RSS {:8.1f} MB'.format(variant, n, duration, maxrss / 1024))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
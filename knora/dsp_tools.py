@@ -9,6 +9,7 @@ from dsplib.utils.onto_create_lists import create_lists
 from dsplib.utils.onto_create_ontology import create_ontology
 from dsplib.utils.onto_get import get_ontology
 from dsplib.utils.xml_upload import xml_upload
+from dsplib.models.ontologycache import OntologyCache
 
 
 def program(args):
@@ -39,6 +40,7 @@ def program(args):
     parser_get.add_argument("-p", "--password", default="test", help="The password for login")
     parser_get.add_argument("-s", "--server", type=str, default="http://0.0.0.0:3333", help="URL of the Knora server")
     parser_get.add_argument("-P", "--project", type=str, help="Shortcode, shortname or iri of project", required=True)
+    parser_get.add_argument("--ontology-cache", type=str, help="Directory of the local ontology cache")
     parser_get.add_argument("outfile", help="path to data model file", default="onto.json")
     parser_get.add_argument("-v", "--verbose", action="store_true", help="Verbose feedback")
 
@@ -49,11 +51,25 @@ def program(args):
     parser_upload.add_argument("-s", "--server", type=str, default="http://0.0.0.0:3333", help="URL of the Knora server")
     parser_upload.add_argument("-i", "--imgdir", type=str, default=".", help="Path to folder containing the images")
     parser_upload.add_argument("-S", "--sipi", type=str, default="http://0.0.0.0:1024", help="URL of SIPI server")
+    parser_upload.add_argument("-j", "--jobs", type=int, default=1, help="Number of resources created concurrently")
+    parser_upload.add_argument("-t", "--two-phase", action="store_true", help="Add the links after all resources are created")
+    parser_upload.add_argument("-r", "--resume", action="store_true", help="Resume an interrupted upload using its journal")
+    parser_upload.add_argument("--restart", action="store_true", help="Clear the journal of a previous upload and start over")
+    parser_upload.add_argument("--image-workers", type=int, default=4, help="Number of images uploaded concurrently")
+    parser_upload.add_argument("--image-queue", type=int, default=16, help="Number of images uploaded ahead of their resources")
+    parser_upload.add_argument("--image-budget", type=int, default=256, help="Megabytes of images in flight")
+    parser_upload.add_argument("--stream", action="store_true", help="Read the resources while they are uploaded")
+    parser_upload.add_argument("--window", type=int, default=10000, help="Number of resources held in memory in streaming mode")
+    parser_upload.add_argument("--schema-snapshot", type=str, help="Snapshot file of the lists and ontologies of the project")
+    parser_upload.add_argument("--ontology-cache", type=str, help="Directory of the local ontology cache")
     parser_upload.add_argument("xmlfile", help="path to xml file containing the data", default="data.xml")
     parser_upload.add_argument("-v", "--verbose", action="store_true", help="Verbose feedback")
 
     args = parser.parse_args(args)
 
+    if getattr(args, "ontology_cache", None):
+        OntologyCache.set_default(OntologyCache(args.ontology_cache))
+
     if args.action == "create":
         if args.lists:
             if args.validate:
@@ -74,7 +90,17 @@ def program(args):
                    password=args.password,
                    imgdir=args.imgdir,
                    sipi=args.sipi,
-                   verbose=args.verbose)
+                   verbose=args.verbose,
+                   jobs=args.jobs,
+                   two_phase=args.two_phase,
+                   resume=args.resume,
+                   restart=args.restart,
+                   image_workers=args.image_workers,
+                   image_queue=args.image_queue,
+                   image_budget=args.image_budget * 1024 * 1024,
+                   stream=args.stream,
+                   window=args.window,
+                   schema_snapshot=args.schema_snapshot)
 
 
 
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pystrict import strict
+from typing import List, Set, Dict, Tuple, Optional, Any, Union, Callable
+
+from .connection import Connection
+
+"""
+This module implements an asyncio variant of the Connection. It is a thread-offloading wrapper, not
+non-blocking I/O: every request is still a blocking request on the pooled keep-alive session of an
+ordinary Connection, executed by a private thread pool, so the event loop is not blocked while it waits.
+All error handling is exactly the same as with Connection. The number of requests in flight is bounded
+by the number of threads of the pool (the concurrency), further requests wait in the queue of the pool.
+
+Example::
+
+    async def main():
+        acon = AsyncConnection('http://0.0.0.0:3333', concurrency=200)
+        await acon.login('root@example.com', 'test')
+        results = await asyncio.gather(*[acon.get('/v2/resources/' + quote_plus(iri)) for iri in iris])
+        acon.close()
+
+    asyncio.run(main())
+
+Model instances that are used with the async methods (e.g. ``ResourceInstance.createAsync``) are
+created with the synchronous connection returned by ``AsyncConnection.connection``.
+"""
+
+
+@strict
+class AsyncConnection:
+    """
+    An AsyncConnection instance represents a connection to a Knora server that can be used with asyncio.
+    The blocking requests of a Connection are offloaded to a thread pool, they do not block the event loop.
+    This is not non-blocking I/O: every request in flight occupies one OS thread, so the concurrency is the
+    number of threads, capped by the max_workers of the pool (the concurrency argument, 100 by default per
+    instance). There is no separate limit, further requests wait in the queue of the pool.
+
+    Attributes
+    ----------
+
+    none (internal use attributes should not be modified/set directly)
+    """
+
+    _con: Connection
+    _concurrency: int
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, server: str, prefixes: Dict[str, str] = None, concurrency: int = 100):
+        """
+        Constructor requiring the server address
+        :param server: Address of the server, e.g https://api.dasch.swiss
+        :param prefixes: Ontology prefixes used
+        :param concurrency: Maximal number of requests in flight, i.e. the number of threads [default: 100]
+        """
+
+        self._con = Connection(server, prefixes, pool_maxsize=concurrency)
+        self._concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='AsyncConnection')
+
+    @property
+    def connection(self) -> Connection:
+        """
+        The synchronous Connection (sharing the session and the token) used to create model instances
+        """
+        return self._con
+
+    @property
+    def server(self) -> str:
+        return self._con.server
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._con.token
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def get_token(self) -> str:
+        """
+        Returns the token
+        :return: token string
+        """
+
+        return self._con.get_token()
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Internal method! Should not be used directly!
+
+        Executes a blocking function of the connection in the thread pool, whose size bounds the requests in flight
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def login(self, email: str, password: str) -> None:
+        """
+        Method to login into KNORA which creates a session token.
+        :param email: Email of user, e.g., root@example.com
+        :param password: Password of the user, e.g. test
+        """
+
+        await self._run(self._con.login, email, password)
+
+    async def logout(self) -> None:
+        """
+        Performs a logout
+        :return: None
+        """
+
+        await self._run(self._con.logout)
+
+    async def post(self, path: str, jsondata: Optional[Union[str, bytes]] = None, content_type: str = 'application/json'):
+        """
+        Post Json data to a given server using a HTTP POST request
+        :param path: Path of RESTful route
+        :param jsondata: Valid JSON as string (or UTF-8 encoded bytes)
+        :param content_type: HTTP Content-Type [default: 'application/json']
+        :return: Response from server
+        """
+
+        return await self._run(self._con.post, path, jsondata, content_type)
+
+    async def get(self, path: str, headers: Optional[Dict[str, str]] = None):
+        """
+        Get data from a server using a HTTP GET request
+        :param path: Path of RESTful route
+        :param headers: ...
+        :return: Response from server
+        """
+
+        return await self._run(self._con.get, path, headers)
+
+    async def put(self, path: str, jsondata: Optional[Union[str, bytes]] = None, content_type: str = 'application/json'):
+        """
+        Send data to a RESTful server using a HTTP PUT request
+        :param path: Path of RESTful route
+        :param jsondata: Valid JSON as string (or UTF-8 encoded bytes)
+        :param content_type: HTTP Content-Type [default: 'application/json']
+        :return: Response from server
+        """
+
+        return await self._run(self._con.put, path, jsondata, content_type)
+
+    async def delete(self, path: str, params: Optional[any] = None):
+        """
+        Send a delete request using the HTTP DELETE request
+        :param path: Path of RESTful route
+        :return: Response from server
+        """
+
+        return await self._run(self._con.delete, path, params)
+
+    def close(self) -> None:
+        """
+        Shuts down the thread pool and closes all pooled connections. The instance must not be used afterwards.
+        :return: None
+        """
+
+        self._executor.shutdown(wait=True)
+        self._con.close()
@@ -1,5 +1,6 @@
 import requests
 import json
+from requests.adapters import HTTPAdapter
 from pystrict import strict
 from typing import List, Set, Dict, Tuple, Optional, Any, Union
 
@@ -11,6 +12,11 @@ class Connection:
     """
     An Connection instance represents a connection to a Knora server.
 
+    All requests are sent through one pooled HTTP session: the TCP (and TLS) connections are kept alive
+    and reused for subsequent requests, and the bearer token is set only once as a default header. The
+    connection pool is thread safe, thus one Connection instance can be shared by all model instances
+    (ResourceInstance, ListNode, Ontology, User, ...) as well as by several worker threads.
+
     Attributes
     ----------
 
@@ -20,17 +26,29 @@ class Connection:
     server: str
     prefixes: Union[Dict[str, str], None]
     token: Union[str, None]
+    _session: requests.Session
 
-    def __init__(self, server: str, prefixes: Dict[str, str] = None):
+    def __init__(self,
+                 server: str,
+                 prefixes: Dict[str, str] = None,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10):
         """
         Constructor requiring the server address, the user and password of KNORA
         :param server: Address of the server, e.g https://api.dasch.swiss
         :param prefixes: Ontology prefixes used
+        :param pool_connections: Number of hosts for which a connection pool is kept [default: 10]
+        :param pool_maxsize: Maximal number of keep-alive connections per host [default: 10]. Should be at least
+               the number of threads that share this connection.
         """
 
         self.server = server
         self.prefixes = prefixes
         self.token = None
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
 
     def login(self, email: str, password: str) -> None:
         """
@@ -45,7 +63,7 @@ class Connection:
         }
         jsondata = json.dumps(credentials)
 
-        req = requests.post(
+        req = self._session.post(
             self.server + '/v2/authentication',
             headers={'Content-Type': 'application/json; charset=UTF-8'},
             data=jsondata
@@ -53,6 +71,7 @@ class Connection:
         self.on_api_error(req)
         result = req.json()
         self.token = result["token"]
+        self._session.headers['Authorization'] = 'Bearer ' + self.token
 
     def get_token(self) -> str:
         """
@@ -69,12 +88,18 @@ class Connection:
         """
 
         if self.token is not None:
-            req = requests.delete(
-                self.server + '/v2/authentication',
-                headers={'Authorization': 'Bearer ' + self.token}
-            )
+            req = self._session.delete(self.server + '/v2/authentication')
             self.on_api_error(req)
             self.token = None
+            del self._session.headers['Authorization']
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections to the server. The instance must not be used afterwards.
+        :return: None
+        """
+
+        self._session.close()
 
     def __del__(self):
         pass
@@ -93,32 +118,23 @@ class Connection:
         if 'error' in res:
             raise BaseError("KNORA-ERROR: API error: " + res.error)
 
-    def post(self, path: str, jsondata: Optional[str] = None):
+    def post(self, path: str, jsondata: Optional[Union[str, bytes]] = None, content_type: str = 'application/json'):
         """
         Post Json data to a given server using a HTTP POST request
         :param path: Path of RESTful route
-        :param jsondata: Valid JSON as string
+        :param jsondata: Valid JSON as string (or UTF-8 encoded bytes)
+        :param content_type: HTTP Content-Type [default: 'application/json']
         :return: Response from server
         """
 
         if path[0] != '/':
             path = '/' + path
         if jsondata is None:
-            if self.token is not None:
-                req = requests.post(self.server + path,
-                                    headers={'Authorization': 'Bearer ' + self.token})
-            else:
-                req = requests.post(self.server + path)
+            req = self._session.post(self.server + path)
         else:
-            if self.token is not None:
-                req = requests.post(self.server + path,
-                                    headers={'Content-Type': 'application/json; charset=UTF-8',
-                                             'Authorization': 'Bearer ' + self.token},
-                                    data=jsondata)
-            else:
-                req = requests.post(self.server + path,
-                                    headers={'Content-Type': 'application/json; charset=UTF-8'},
-                                    data=jsondata)
+            req = self._session.post(self.server + path,
+                                     headers={'Content-Type': content_type + '; charset=UTF-8'},
+                                     data=jsondata)
         self.on_api_error(req)
         result = req.json()
         return result
@@ -133,28 +149,17 @@ class Connection:
 
         if path[0] != '/':
             path = '/' + path
-        if self.token is None:
-            if headers is None:
-                req = requests.get(self.server + path)
-            else:
-                req = requests.get(self.server + path, headers)
-        else:
-            if headers is None:
-                req = requests.get(self.server + path,
-                                   headers={'Authorization': 'Bearer ' + self.token})
-            else:
-                headers['Authorization'] = 'Bearer ' + self.token
-                req = requests.get(self.server + path, headers)
+        req = self._session.get(self.server + path, headers=headers)
 
         self.on_api_error(req)
         result = req.json()
         return result
 
-    def put(self, path: str, jsondata: Optional[str] = None, content_type: str = 'application/json'):
+    def put(self, path: str, jsondata: Optional[Union[str, bytes]] = None, content_type: str = 'application/json'):
         """
         Send data to a RESTful server using a HTTP PUT request
         :param path: Path of RESTful route
-        :param jsondata: Valid JSON as string
+        :param jsondata: Valid JSON as string (or UTF-8 encoded bytes)
         :param content_type: HTTP Content-Type [default: 'application/json']
         :return:
         """
@@ -162,13 +167,11 @@ class Connection:
         if path[0] != '/':
             path = '/' + path
         if jsondata is None:
-            req = requests.put(self.server + path,
-                               headers={'Authorization': 'Bearer ' + self.token})
+            req = self._session.put(self.server + path)
         else:
-            req = requests.put(self.server + path,
-                               headers={'Content-Type': content_type + '; charset=UTF-8',
-                                        'Authorization': 'Bearer ' + self.token},
-                               data=jsondata)
+            req = self._session.put(self.server + path,
+                                    headers={'Content-Type': content_type + '; charset=UTF-8'},
+                                    data=jsondata)
         self.on_api_error(req)
         result = req.json()
         return result
@@ -182,14 +185,7 @@ class Connection:
 
         if path[0] != '/':
             path = '/' + path
-        if params is not None:
-            req = requests.delete(self.server + path,
-                                  headers={'Authorization': 'Bearer ' + self.token},
-                                  params=params)
-
-        else:
-            req = requests.delete(self.server + path,
-                                  headers={'Authorization': 'Bearer ' + self.token})
+        req = self._session.delete(self.server + path, params=params)
         self.on_api_error(req)
         result = req.json()
         return result
@@ -232,9 +228,9 @@ class Connection:
         jsondata = json.dumps(rdfdata)
         url = self.server + '/admin/store/ResetTriplestoreContent?prependdefaults=false'
 
-        req = requests.post(url,
-                            headers={'Content-Type': 'application/json; charset=UTF-8'},
-                            data=jsondata)
+        req = self._session.post(url,
+                                 headers={'Content-Type': 'application/json; charset=UTF-8'},
+                                 data=jsondata)
         self.on_api_error(req)
         res = req.json()
         #  pprint(res)
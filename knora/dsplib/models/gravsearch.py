@@ -0,0 +1,230 @@
+import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from pystrict import strict
+
+from .connection import Connection
+from .helpers import BaseError, OntoInfo
+
+"""
+This module implements a builder for Gravsearch queries (the SPARQL based search of the DSP-API) and
+the paged reading of their results.
+
+Gravsearch returns the main resources page by page, the page is selected with the clause "OFFSET n"
+(n is the number of the page, not of the first result) and the response contains
+"knora-api:mayHaveMoreResults" as long as there may be a further page. The number of results of a
+query is returned by the count route without the resources themselves.
+"""
+
+KNORA_API = 'http://api.knora.org/ontology/knora-api/v2#'
+
+#
+# predicate of the literal of a value that is compared with a python value of the given type
+#
+_literal_predicates: Dict[type, str] = {
+    str: 'knora-api:valueAsString',
+    bool: 'knora-api:booleanValueAsBoolean',
+    int: 'knora-api:intValueAsInt',
+    float: 'knora-api:decimalValueAsDecimal',
+    Decimal: 'knora-api:decimalValueAsDecimal',
+}
+
+
+def _literal(value: Union[str, bool, int, float, Decimal]) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, int):
+        return str(value)
+    return '"{}"^^xsd:decimal'.format(value)
+
+
+@strict
+class GravsearchQuery:
+    """
+    Builder of a Gravsearch query for the resources of one resource class. The values of the properties
+    given with values() are returned with the resources, where() and link() restrict the resources.
+
+    Example::
+
+        query = GravsearchQuery('anything:Thing', factory.context) \\
+            .values('anything:hasText') \\
+            .where('anything:hasInteger', 42) \\
+            .link('anything:hasOtherThing', 'http://rdfh.ch/0001/a-thing')
+        print(query.count(con))
+        for page in query.pages(con):
+            ...
+    """
+    _resclass: str
+    _context: Dict[str, str]
+    _values: List[str]
+    _restrictions: List[str]
+    _prefixes: List[str]
+    _nvar: int
+
+    def __init__(self, resclass: str, context: Mapping[str, Union[str, OntoInfo]]):
+        """
+        :param resclass: Prefixed name of the resource class, e.g. "anything:Thing"
+        :param context: The prefixes of the ontologies (prefix -> ontology IRI or OntoInfo)
+        """
+        self._resclass = resclass
+        self._context = {
+            prefix: onto.iri + ('#' if onto.hashtag else '') if isinstance(onto, OntoInfo) else onto
+            for prefix, onto in dict(context).items()
+        }
+        self._context.setdefault('knora-api', KNORA_API)
+        self._context.setdefault('xsd', 'http://www.w3.org/2001/XMLSchema#')
+        self._values = []
+        self._restrictions = []
+        self._prefixes = ['knora-api']
+        self._nvar = 0
+        self.__use(resclass)
+
+    def __use(self, name: str) -> None:
+        prefix = name.split(':')[0]
+        if prefix not in self._context:
+            raise BaseError('Unknown prefix "{}" in "{}"!'.format(prefix, name))
+        if prefix not in self._prefixes:
+            self._prefixes.append(prefix)
+
+    def __var(self) -> str:
+        self._nvar += 1
+        return '?v{}'.format(self._nvar)
+
+    def values(self, *propnames: str) -> 'GravsearchQuery':
+        """
+        Return the values of the given properties with the resources (the values are optional)
+
+        :param propnames: Prefixed names of the properties
+        :return: The query itself
+        """
+        for propname in propnames:
+            self.__use(propname)
+            self._values.append(propname)
+        return self
+
+    def where(self, propname: str, value: Optional[Union[str, bool, int, float, Decimal]] = None,
+              op: str = '=') -> 'GravsearchQuery':
+        """
+        Restrict the resources to those with a value of the property. If a python value is given, the
+        value must compare to it with the operator (text, boolean, integer and decimal values)
+
+        :param propname: Prefixed name of the property
+        :param value: The python value the value of the property is compared with [default: None, any value]
+        :param op: Comparison operator: "=", "!=", "<", "<=", ">" or ">=" [default: "="]
+        :return: The query itself
+        """
+        if op not in ('=', '!=', '<', '<=', '>', '>='):
+            raise BaseError('Invalid operator "{}"!'.format(op))
+        self.__use(propname)
+        var = self.__var()
+        restriction = '?mainres {} {} .'.format(propname, var)
+        if value is not None:
+            predicate = _literal_predicates.get(type(value))
+            if predicate is None:
+                raise BaseError('Invalid type of the value of "{}": {}!'.format(propname, type(value).__name__))
+            if predicate == 'knora-api:decimalValueAsDecimal':
+                self.__use('xsd:decimal')
+            literal = self.__var()
+            restriction += '\n  {} {} {} .\n  FILTER({} {} {})'.format(var, predicate, literal, literal, op,
+                                                                       _literal(value))
+        self._restrictions.append(restriction)
+        return self
+
+    def link(self, propname: str, target: Optional[str] = None) -> 'GravsearchQuery':
+        """
+        Restrict the resources to those linking with the link property (not the link value property)
+
+        :param propname: Prefixed name of the link property
+        :param target: IRI of the target resource [default: None, any target]
+        :return: The query itself
+        """
+        self.__use(propname)
+        self._restrictions.append('?mainres {} {} .'.format(propname,
+                                                            '<{}>'.format(target) if target else self.__var()))
+        return self
+
+    def build(self, page: Optional[int] = 0) -> str:
+        """
+        The query as string
+
+        :param page: The number of the page of results (OFFSET) or None for the count query
+        :return: Gravsearch query
+        """
+        lines = ['PREFIX {}: <{}>'.format(prefix, self._context[prefix]) for prefix in self._prefixes]
+        lines.append('CONSTRUCT {')
+        lines.append('  ?mainres knora-api:isMainResource true .')
+        lines.extend('  ?mainres {} ?r{} .'.format(propname, i) for i, propname in enumerate(self._values))
+        lines.append('} WHERE {')
+        lines.append('  ?mainres a knora-api:Resource .')
+        lines.append('  ?mainres a {} .'.format(self._resclass))
+        lines.extend('  ' + restriction for restriction in self._restrictions)
+        lines.extend('  OPTIONAL {{ ?mainres {} ?r{} . }}'.format(propname, i)
+                     for i, propname in enumerate(self._values))
+        lines.append('}')
+        if page is not None:
+            lines.append('OFFSET {}'.format(page))
+        return '\n'.join(lines) + '\n'
+
+    def __str__(self) -> str:
+        return self.build()
+
+    def count(self, con: Connection) -> int:
+        """
+        The number of resources matching the query, without reading them
+
+        :param con: Connection instance
+        :return: Number of resources
+        """
+        result = con.post('/v2/searchextended/count', self.build(None).encode('utf-8'),
+                          content_type='application/sparql-query')
+        return int(result.get('schema:numberOfItems', 0))
+
+    def page(self, con: Connection, page: int) -> Tuple[List[Any], bool]:
+        """
+        Read one page of results
+
+        :param con: Connection instance
+        :param page: Number of the page (starting with 0)
+        :return: Tuple of the JSON-LD objects of the resources and whether there may be more results
+        """
+        result = con.post('/v2/searchextended', self.build(page).encode('utf-8'),
+                          content_type='application/sparql-query')
+        graph = result.get('@graph')
+        if graph is None:
+            graph = [result] if '@id' in result else []
+        return graph, bool(result.get('knora-api:mayHaveMoreResults', False))
+
+    def pages(self, con: Connection, prefetch: int = 1) -> Iterator[List[Any]]:
+        """
+        Read the results page by page. While the caller processes a page, the next page(s) are
+        requested in the background. At most 1 + prefetch pages are held at any time.
+
+        :param con: Connection instance
+        :param prefetch: Number of pages requested ahead [default: 1]
+        :return: Iterator over the pages, a page is the list of the JSON-LD objects of the resources
+        """
+        if prefetch < 0:
+            raise BaseError("The number of prefetched pages must not be negative!")
+        pending: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch + 1, thread_name_prefix='Gravsearch')
+        nextpage = 0
+        try:
+            for nextpage in range(prefetch + 1):
+                pending.append(executor.submit(self.page, con, nextpage))
+            while pending:
+                graph, more = pending.popleft().result()
+                if graph:
+                    yield graph
+                if not more or not graph:
+                    break
+                nextpage += 1
+                pending.append(executor.submit(self.page, con, nextpage))
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -1,5 +1,6 @@
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import NewType, List, Set, Dict, Tuple, Optional, Any, Union, Pattern
+from typing import NewType, List, Set, Dict, Tuple, Optional, Any, Union, Pattern, NamedTuple
 from enum import Enum, unique
 from traceback import format_exc
 from pystrict import strict
@@ -22,6 +23,18 @@ class OntoInfo:
 ContextType = NewType("ContextType", Dict[str, OntoInfo])
 
 
+class SystemPrefixes(NamedTuple):
+    """
+    The prefixes of the base and knora ontologies as used in a context
+    """
+    rdf: str
+    rdfs: str
+    owl: str
+    xsd: str
+    knora_api: str
+    salsah_gui: str
+
+
 def LINE():
     return sys._getframe(1).f_lineno
 
@@ -103,11 +116,21 @@ class ContextIterator:
 @strict
 class Context:
     """
-    This class holds a JSON-LD context with the ontology IRI's and the associated prefixes
+    This class holds a JSON-LD context with the ontology IRI's and the associated prefixes. The IRI's are
+    resolved through the reverse index "rcontext" (IRI -> prefix) and the results of the conversions between
+    full and prefixed IRI's are memoised in LRU caches, which are cleared whenever the prefixes change.
     """
     _context: ContextType
     _rcontext: Dict[str, str]
     _exp: Pattern
+    _prefixes: 'OrderedDict[str, str]'
+    _prefixed: 'OrderedDict[str, str]'
+    _qualified: 'OrderedDict[str, str]'
+    _system_prefixes: Optional[SystemPrefixes]
+
+    cache_size: int = 4096
+    __caches = ('_prefixes', '_prefixed', '_qualified', '_system_prefixes')
+    __short_iri_regexp = re.compile("[\\w-]+:[\\w-]+")
 
     common_ontologies: ContextType = {
         "foaf": OntoInfo("http://xmlns.com/foaf/0.1/", False),
@@ -119,6 +142,7 @@ class Context:
         "bibo": OntoInfo("http://purl.org/ontology/bibo/", False),
         "cidoc": OntoInfo("http://purl.org/NET/cidoc-crm/core", True)
     }
+    common_rcontext: Dict[str, str] = {info.iri: prefix for prefix, info in common_ontologies.items()}
 
     knora_ontologies: ContextType = {
         "knora-api": OntoInfo("http://api.knora.org/ontology/knora-api/v2", True),
@@ -182,6 +206,64 @@ class Context:
                 "salsah-gui": OntoInfo("http://api.knora.org/ontology/salsah-gui/v2", True)
             }
         self._rcontext = dict(map(lambda x: (x[1].iri, x[0]), self._context.items()))
+        self._prefixes = OrderedDict()
+        self._prefixed = OrderedDict()
+        self._qualified = OrderedDict()
+        self._system_prefixes = None
+
+    def __remember(self, cache: 'OrderedDict[str, str]', key: str, result: str) -> str:
+        """
+        Memoise the result of a conversion, the least recently used entry is dropped if the cache is full
+
+        :param cache: One of the caches of the conversions
+        :param key: The input of the conversion
+        :param result: The result of the conversion
+        :return: The result
+        """
+        cache[key] = result
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return result
+
+    def __changed(self) -> None:
+        """
+        Clear the memoised conversions, they may be outdated after a change of the prefixes
+
+        :return: None
+        """
+        self._prefixes.clear()
+        self._prefixed.clear()
+        self._qualified.clear()
+        self._system_prefixes = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        The state of the context for pickle, without the memoised conversions (which are rebuilt empty)
+
+        :return: The attributes of the context except the caches
+        """
+        return {name: value for name, value in self.__dict__.items() if name not in self.__caches}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the context from pickle with empty caches
+
+        :param state: The attributes returned by __getstate__
+        :return: None
+        """
+        self.__dict__.update(state)
+        self.__dict__.update(_prefixes=OrderedDict(), _prefixed=OrderedDict(), _qualified=OrderedDict(),
+                             _system_prefixes=None)
+
+    def __use_common(self, prefix: str) -> OntoInfo:
+        """
+        Add a common (external) ontology to the list of known ontologies
+
+        :param prefix: The prefix of the common ontology
+        :return: The ontology info of the common ontology
+        """
+        self[prefix] = self.common_ontologies[prefix]
+        return self._context[prefix]
 
     def __len__(self) -> int:
         return len(self._context)
@@ -192,11 +274,14 @@ class Context:
     def __setitem__(self, key: str, value: OntoInfo):
         self._context[key] = value
         self._rcontext[value.iri] = key
+        self.__changed()
 
     def __delitem__(self, key: str) -> None:
         iri = self._context[key].iri
-        del self._context[key].iri
-        del self._rcontext[iri]
+        del self._context[key]
+        if self._rcontext.get(iri) == key:
+            del self._rcontext[iri]
+        self.__changed()
 
     def __contains__(self, key: str) -> bool:
         return key in self._context
@@ -225,8 +310,10 @@ class Context:
         :param value: Dictionary of context
         :return: None
         """
-        if value is not None and isinstance(value, ContextType):
+        if value is not None and isinstance(value, dict):
             self._context = value
+            self._rcontext = {info.iri: prefix for prefix, info in value.items()}
+            self.__changed()
         else:
             raise BaseError("Error in parameter to context setter")
 
@@ -234,6 +321,23 @@ class Context:
     def rcontext(self) -> Dict[str, str]:
         return self._rcontext
 
+    @property
+    def system_prefixes(self) -> SystemPrefixes:
+        """
+        The prefixes of the base and knora ontologies, resolved once (until the prefixes change)
+
+        :return: SystemPrefixes instance
+        """
+        if self._system_prefixes is None:
+            self._system_prefixes = SystemPrefixes(
+                rdf=self.prefix_from_iri("http://www.w3.org/1999/02/22-rdf-syntax-ns#"),
+                rdfs=self.prefix_from_iri("http://www.w3.org/2000/01/rdf-schema#"),
+                owl=self.prefix_from_iri("http://www.w3.org/2002/07/owl#"),
+                xsd=self.prefix_from_iri("http://www.w3.org/2001/XMLSchema#"),
+                knora_api=self.prefix_from_iri("http://api.knora.org/ontology/knora-api/v2#"),
+                salsah_gui=self.prefix_from_iri("http://api.knora.org/ontology/salsah-gui/v2#"))
+        return self._system_prefixes
+
     def add_context(self, prefix: str, iri: Optional[str] = None) -> None:
         """
         Add a new context to a context instance
@@ -248,16 +352,13 @@ class Context:
             if prefix in self.base_ontologies:
                 return
             if prefix in self.common_ontologies:
-                self._context[prefix] = self.common_ontologies[prefix]
+                self.__use_common(prefix)
             else:
                 raise BaseError("The prefix '{}' is not known!".format(prefix))
+        elif iri.endswith("#"):
+            self[prefix] = OntoInfo(iri[:-1], True)
         else:
-            if iri.endswith("#"):
-                iri = iri[:-1]
-                self._context[prefix] = OntoInfo(iri, True)
-            else:
-                self._context[prefix] = OntoInfo(iri, False)
-        self._rcontext[iri] = prefix
+            self[prefix] = OntoInfo(iri, False)
 
     def iri_from_prefix(self, prefix: str) -> Optional[str]:
         """
@@ -266,13 +367,13 @@ class Context:
         :param prefix: Prefix of the context entry
         :return: The full IRI without trailing "#"
         """
+        info = self._context.get(prefix)
+        if info is not None:
+            return info.iri
         #if self.__is_iri(prefix):
         if IriTest.test(prefix):
             return prefix
-        if self._context.get(prefix) is not None:
-            return self._context.get(prefix).iri
-        else:
-            return None
+        return None
 
     def prefix_from_iri(self, iri: str) -> Optional[str]:
         """
@@ -284,29 +385,31 @@ class Context:
         :param iri: The full IRI with or without trailing "#", or
         :return: the prefix of this context element, or None, if not found
         """
+        result = self._prefixes.get(iri)
+        if result is not None:
+            self._prefixes.move_to_end(iri)
+            return result
         #if not self.__is_iri(iri):
         if not IriTest.test(iri):
             raise BaseError("String does not conform to IRI patter: " + iri)
+        key = iri
         if iri.endswith("#"):
             iri = iri[:-1]
         result = self._rcontext.get(iri)
         if result is None:
-            entrylist = list(filter(lambda x: x[1].iri == iri, self.common_ontologies.items()))
-            if len(entrylist) == 1:
-                entry = entrylist[0]
-                self._context[entry[0]] = entry[1]  # add to list of prefixes used
-                self._rcontext[entry[1].iri] = entry[0]
-                result = entry[0]
+            result = self.common_rcontext.get(iri)
+            if result is not None:
+                self.__use_common(result)  # add to list of prefixes used
             else:
                 tmp = iri.split('/')
                 if tmp[-1] == "v2":
                     #
                     # we have a knora ontology name "http://server/ontology/shortcode/shortname/v2"
-                    self._context[tmp[-2]] = OntoInfo(iri, True)  # add to list of prefixes used
-                    self._rcontext[iri] = tmp[-2]
+                    self[tmp[-2]] = OntoInfo(iri, True)  # add to list of prefixes used
+                    result = tmp[-2]
                 else:
                     raise BaseError("Iri cannot be resolved to a well-known prefix!")
-        return result
+        return self.__remember(self._prefixes, key, result)
 
     def get_qualified_iri(self, val: Optional[str]) -> Optional[str]:
         """
@@ -318,26 +421,26 @@ class Context:
         """
         if val is None:
             return None
+        result = self._qualified.get(val)
+        if result is not None:
+            self._qualified.move_to_end(val)
+            return result
         #if self.__is_iri(val):
         if IriTest.test(val):
-            return val
+            return self.__remember(self._qualified, val, val)
         tmp = val.split(':')
         if len(tmp) < 2:
             raise BaseError("There is no separator to identify the prefix: " + val)
         iri_info = self._context.get(tmp[0])
         if iri_info is None:
-            entrylist = list(filter(lambda x: x[1].iri == tmp[0], self.common_ontologies.items()))
-            if len(entrylist) == 1:
-                entry = entrylist[0]
-                self._context[entry[0]] = entry[1]  # add to list of prefixes used
-                self._rcontext[entry[1].iri] = entry[0]
-                iri_info = entry[1]
+            if tmp[0] in self.common_ontologies:
+                iri_info = self.__use_common(tmp[0])  # add to list of prefixes used
             else:
                 raise BaseError("Ontology not known! Cannot generate full qualified IRI")
         if iri_info.hashtag:
-            return iri_info.iri + '#' + tmp[1]
+            return self.__remember(self._qualified, val, iri_info.iri + '#' + tmp[1])
         else:
-            return iri_info.iri + tmp[1]
+            return self.__remember(self._qualified, val, iri_info.iri + tmp[1])
 
     def get_prefixed_iri(self, iri: Optional[str]) -> Optional[str]:
         """
@@ -349,12 +452,15 @@ class Context:
 
         if iri is None:
             return None
+        result = self._prefixed.get(iri)
+        if result is not None:
+            self._prefixed.move_to_end(iri)
+            return result
         #
         # check if the iri already has the form "prefix:name"
         #
-        m = re.match("([\\w-]+):([\\w-]+)", iri)
-        if m and m.span()[1] == len(iri):
-            return iri
+        if self.__short_iri_regexp.fullmatch(iri):
+            return self.__remember(self._prefixed, iri, iri)
         #if not self.__is_iri(iri):
         if not IriTest.test(iri):
             raise BaseError("String does not conform to IRI patter: " + iri)
@@ -369,15 +475,12 @@ class Context:
             element = iri[splitpoint + 1:]
         prefix = self._rcontext.get(ontopart)
         if prefix is None:
-            entrylist = list(filter(lambda x: x[1].iri == ontopart, self.common_ontologies.items()))
-            if len(entrylist) == 1:
-                entry = entrylist[0]
-                self._context[entry[0]] = entry[1]  # add to list of prefixes used
-                self._rcontext[entry[1].iri] = entry[0]
-                prefix = entry[0]
+            prefix = self.common_rcontext.get(ontopart)
+            if prefix is not None:
+                self.__use_common(prefix)  # add to list of prefixes used
             else:
                 raise BaseError("Ontology {} not known! Cannot generate full qualified IRI: prefix={}".format(iri, prefix))
-        return prefix + ':' + element
+        return self.__remember(self._prefixed, iri, prefix + ':' + element)
 
     def reduce_iri(self, iristr: str, ontoname: Optional[str] = None) -> str:
         """
@@ -389,15 +492,14 @@ class Context:
         :param iristr:
         :return:
         """
-        rdf = self.prefix_from_iri("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
-        rdfs = self.prefix_from_iri("http://www.w3.org/2000/01/rdf-schema#")
-        owl = self.prefix_from_iri("http://www.w3.org/2002/07/owl#")
-        xsd = self.prefix_from_iri("http://www.w3.org/2001/XMLSchema#")
-        knora_api = self.prefix_from_iri("http://api.knora.org/ontology/knora-api/v2#")
-        salsah_gui = self.prefix_from_iri("http://api.knora.org/ontology/salsah-gui/v2#")
-
-        #if self.__is_iri(iristr):
-        if IriTest.test(iristr):
+        knora_api = self.system_prefixes.knora_api
+        salsah_gui = self.system_prefixes.salsah_gui
+
+        prefixed = self._prefixed.get(iristr)
+        if prefixed is not None:
+            iristr = prefixed
+        #elif self.__is_iri(iristr):
+        elif IriTest.test(iristr):
             iristr = self.get_prefixed_iri(iristr)
         tmp = iristr.split(':')
         if tmp[0] == knora_api or tmp[0] == salsah_gui:
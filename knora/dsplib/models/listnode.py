@@ -1,11 +1,13 @@
 import json
+from array import array
 from pystrict import strict
-from typing import List, Set, Dict, Tuple, Optional, Any, Union, NewType
+from typing import List, Set, Dict, Tuple, Optional, Any, Union, NewType, Iterator
 from urllib.parse import quote_plus
 
 from .helpers import Actions, BaseError
 from .langstring import Languages, LangStringParam, LangString
 from .connection import Connection
+from .asyncconnection import AsyncConnection
 from .model import Model
 from .project import Project
 
@@ -41,6 +43,9 @@ DELETE
     * Call the ``delete``-method on the instance
 
 In addition there is a static methods ``getAllProjects`` which returns a list of all projects
+
+For large controlled vocabularies that are only needed for lookups, ``getAllNodesCompact`` reads a whole list
+into a read-only CompactList instead of one ListNode instance per node.
 """
 
 
@@ -440,6 +445,23 @@ class ListNode(Model):
             result = self._con.post('/admin/lists', jsondata)
             return ListNode.fromJsonObj(self._con, result['list']['listinfo'])
 
+    async def createAsync(self, acon: AsyncConnection) -> 'ListNode':
+        """
+        Create a new List in Knora using the given AsyncConnection
+
+        :param acon: AsyncConnection instance
+        :return: JSON-object from Knora
+        """
+
+        jsonobj = self.toJsonObj(Actions.Create)
+        jsondata = json.dumps(jsonobj, cls=SetEncoder)
+        if self._parent is not None:
+            result = await acon.post('/admin/lists/' + quote_plus(self._parent), jsondata)
+            return ListNode.fromJsonObj(self._con, result['nodeinfo'])
+        else:
+            result = await acon.post('/admin/lists', jsondata)
+            return ListNode.fromJsonObj(self._con, result['list']['listinfo'])
+
     def read(self) -> Any:
         """
         Read a project from Knora
@@ -486,6 +508,40 @@ class ListNode(Model):
         """
 
         result = self._con.get('/admin/lists/' + quote_plus(self._id))
+        return self.__allNodesFromJsonObj(result)
+
+    async def getAllNodesAsync(self, acon: AsyncConnection) -> 'ListNode':
+        """
+        Get all nodes of the list using the given AsyncConnection. Must be called from a ListNode instance that
+        has at least set the list iri!
+
+        :param acon: AsyncConnection instance
+        :return: Root node of list with recursive ListNodes ("children"-attributes)
+        """
+
+        result = await acon.get('/admin/lists/' + quote_plus(self._id))
+        return self.__allNodesFromJsonObj(result)
+
+    def getAllNodesCompact(self) -> 'CompactList':
+        """
+        Get all nodes of the list as read-only CompactList. Must be called from a ListNode instance that has
+        at least set the list iri!
+
+        :return: CompactList with all nodes of the list
+        """
+
+        result = self._con.get('/admin/lists/' + quote_plus(self._id))
+        return CompactList.fromJsonObj(result)
+
+    def __allNodesFromJsonObj(self, result: Any) -> 'ListNode':
+        """
+        Internal method! Should not be used directly!
+
+        Creates the root node with all children from the JSON returned by "/admin/lists/<iri>"
+
+        :param result: JSON data returned by Knora as python3 object
+        :return: Root node of list with recursive ListNodes ("children"-attributes)
+        """
         if 'list' not in result:
             raise BaseError("Request got no list!")
         if 'listinfo' not in result['list']:
@@ -576,3 +632,252 @@ class ListNode(Model):
             print('             None')
         print('  Parent', self._parent)
         print('  IsRootNode: {}'.format(self._isRootNode))
+
+
+@strict
+class CompactList:
+    """
+    Read-only compact representation of a whole list (root node and all nodes below it). The nodes are
+    stored in flat arrays in depth-first order: node 0 is the root node, and the subtree of node i are the
+    nodes i ... end(i) - 1. The labels and comments are kept as flat tuples (language, value, language,
+    value, ...) and are decoded to LangString instances only when accessed.
+    """
+    _project: Optional[str]
+    _ids: List[str]
+    _names: List[Optional[str]]
+    _parents: array
+    _ends: array
+    _labels: List[Optional[Tuple[str, ...]]]
+    _comments: List[Optional[Tuple[str, ...]]]
+
+    def __init__(self, project: Optional[str], nodes: List[Tuple[int, Any]]):
+        """
+        :param project: IRI of the project
+        :param nodes: (parent index, JSON object of the node) of all nodes in depth-first order, the parent
+                      index of the root node is -1
+        """
+        self._project = project
+        self._ids = []
+        self._names = []
+        self._parents = array('l')
+        self._ends = array('l', [0] * len(nodes))
+        self._labels = []
+        self._comments = []
+        for i, (parent, node) in enumerate(nodes):
+            self._ids.append(node['id'])
+            self._names.append(node.get('name'))
+            self._parents.append(parent)
+            self._labels.append(self.__encode(node.get('labels')))
+            self._comments.append(self.__encode(node.get('comments')))
+        for i in range(len(nodes) - 1, -1, -1):
+            self._ends[i] = max(self._ends[i], i + 1)
+            if self._parents[i] >= 0:
+                self._ends[self._parents[i]] = max(self._ends[self._parents[i]], self._ends[i])
+
+    @staticmethod
+    def __encode(langstrings: Any) -> Optional[Tuple[str, ...]]:
+        if not langstrings:
+            return None
+        return tuple(x for langstring in langstrings for x in (langstring.get('language'), langstring.get('value')))
+
+    @staticmethod
+    def __decode(langstrings: Optional[Tuple[str, ...]]) -> LangString:
+        if not langstrings:
+            return LangString()
+        return LangString.fromJsonObj([{'language': langstrings[k], 'value': langstrings[k + 1]}
+                                       for k in range(0, len(langstrings), 2)])
+
+    @classmethod
+    def fromJsonObj(cls, result: Any) -> 'CompactList':
+        """
+        Create a CompactList from the JSON returned by "/admin/lists/<iri>"
+
+        :param result: JSON data returned by Knora as python3 object
+        :return: CompactList instance
+        """
+        if 'list' not in result:
+            raise BaseError("Request got no list!")
+        if 'listinfo' not in result['list']:
+            raise BaseError("Request got no proper list information!")
+        nodes: List[Tuple[int, Any]] = []
+        stack: List[Tuple[int, Any]] = [(-1, result['list']['listinfo'])]
+        roots_children = result['list'].get('children') or []
+        while stack:
+            parent, node = stack.pop()
+            index = len(nodes)
+            nodes.append((parent, node))
+            children = roots_children if parent < 0 else node.get('children') or []
+            stack.extend((index, child) for child in reversed(children))
+        return cls(result['list']['listinfo'].get('projectIri'), nodes)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def project(self) -> Optional[str]:
+        return self._project
+
+    @property
+    def name(self) -> Optional[str]:
+        """Name of the list, that is the name of the root node"""
+        return self._names[0]
+
+    def id(self, i: int) -> str:
+        return self._ids[i]
+
+    def node_name(self, i: int) -> Optional[str]:
+        return self._names[i]
+
+    def parent(self, i: int) -> Optional[int]:
+        return self._parents[i] if self._parents[i] >= 0 else None
+
+    def end(self, i: int) -> int:
+        """
+        :param i: Index of a node
+        :return: Index after the last node of the subtree of node i
+        """
+        return self._ends[i]
+
+    def label(self, i: int) -> LangString:
+        return self.__decode(self._labels[i])
+
+    def comment(self, i: int) -> LangString:
+        return self.__decode(self._comments[i])
+
+    def children(self, i: int = 0) -> Iterator[int]:
+        """
+        :param i: Index of a node [default: root node]
+        :return: Indices of the child nodes of node i
+        """
+        j = i + 1
+        while j < self._ends[i]:
+            yield j
+            j = self._ends[j]
+
+    def subtree(self, i: int = 0) -> range:
+        """
+        :param i: Index of a node [default: root node]
+        :return: Indices of node i and all nodes below it in depth-first order
+        """
+        return range(i, self._ends[i])
+
+    def path(self, i: int) -> str:
+        """
+        :param i: Index of a node
+        :return: Names of the nodes from below the root node to node i, separated by "/"
+        """
+        names: List[str] = []
+        while i > 0:
+            names.append(self._names[i])
+            i = self._parents[i]
+        return '/'.join(reversed(names))
+
+    def find(self, path: str) -> Optional[int]:
+        """
+        Find a node by its path
+
+        :param path: Names of the nodes from below the root node to the node, separated by "/"
+        :return: Index of the node or None
+        """
+        i = 0
+        for name in path.split('/'):
+            i = next((j for j in self.children(i) if self._names[j] == name), None)
+            if i is None:
+                return None
+        return i
+
+    def createDefinitionFileObj(self, i: int = 0) -> Any:
+        """
+        Create an object that corresponds to the syntax of the input to "create_onto" (depth-first export),
+        like ListNode.createDefinitionFileObj()
+
+        :param i: Index of the node to export [default: root node]
+        :return: A python object that can be jsonfied
+        """
+        objs: Dict[int, Any] = {}
+        for j in reversed(self.subtree(i)):
+            obj = {"name": self._names[j], "labels": self.label(j).createDefinitionFileObj()}
+            comment = self.comment(j)
+            if not comment.isEmpty():
+                obj["comment"] = comment.createDefinitionFileObj()
+            children = [objs.pop(k) for k in self.children(j)]
+            if children:
+                obj["nodes"] = children
+            objs[j] = obj
+        return objs[i]
+
+    def toListNode(self, con: Connection, i: int = 0) -> ListNode:
+        """
+        Convert the node i with all nodes below it to ListNode instances, as returned by
+        ListNode.getAllNodes()
+
+        :param con: Connection instance
+        :param i: Index of the node [default: root node]
+        :return: ListNode instance with the recursive ListNodes ("children"-attributes)
+        """
+        listnodes: Dict[int, ListNode] = {}
+        for j in reversed(self.subtree(i)):
+            children = [listnodes.pop(k) for k in self.children(j)]
+            parent = self.parent(j)
+            listnodes[j] = ListNode(con=con,
+                                    id=self._ids[j],
+                                    project=self._project,
+                                    label=self.label(j),
+                                    comment=self.comment(j),
+                                    name=self._names[j],
+                                    parent=self._ids[parent] if parent is not None else None,
+                                    isRootNode=j == 0,
+                                    children=children if children else None,
+                                    rootNodeIri=self._ids[0] if j > 0 else None)
+        return listnodes[i]
+
+
+@strict
+class ListIndex:
+    """
+    Hashed index of the nodes of lists. It maps the list name together with the node name, or the path of
+    node names below the root node separated by "/", to the IRI of the node. The index is built once, a
+    lookup is O(1).
+
+    If a node name is used more than once in a list, the node name refers to the first node in depth-first
+    order (as the former recursive search did), the other nodes can be addressed by their path.
+    """
+    _nodes: Dict[Tuple[str, str], str]
+    _paths: Dict[Tuple[str, str], str]
+
+    def __init__(self, lists: List[Union[ListNode, CompactList]]):
+        """
+        :param lists: The root nodes of the lists with all their children, as returned by "getAllNodes()",
+                      or the CompactLists as returned by "getAllNodesCompact()"
+        """
+        self._nodes = {}
+        self._paths = {}
+        for rootnode in lists:
+            if isinstance(rootnode, CompactList):
+                for i in rootnode.subtree()[1:]:
+                    self._nodes.setdefault((rootnode.name, rootnode.node_name(i)), rootnode.id(i))
+                    self._paths.setdefault((rootnode.name, rootnode.path(i)), rootnode.id(i))
+                continue
+            stack: List[Tuple[str, ListNode]] = [('', child) for child in reversed(rootnode.children or [])]
+            while stack:
+                path, node = stack.pop()
+                path = path + '/' + node.name if path else node.name
+                self._nodes.setdefault((rootnode.name, node.name), node.id)
+                self._paths.setdefault((rootnode.name, path), node.id)
+                stack.extend((path, child) for child in reversed(node.children or []))
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def get(self, listname: str, nodename: str) -> Optional[str]:
+        """
+        Get the IRI of a list node
+
+        :param listname: Name of the list (name of the root node)
+        :param nodename: Name of the node, or path of node names below the root node separated by "/"
+        :return: IRI of the node or None, if there is no such node
+        """
+        iri = self._nodes.get((listname, nodename))
+        if iri is None:
+            iri = self._paths.get((listname, nodename))
+        return iri
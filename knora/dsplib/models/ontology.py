@@ -1,16 +1,33 @@
 import json
 import copy
+from concurrent.futures import ProcessPoolExecutor
 from pystrict import strict
 from typing import List, Set, Dict, Tuple, Optional, Any, Union
 from urllib.parse import quote_plus
 
 from .connection import Connection
+from .asyncconnection import AsyncConnection
 from .helpers import Actions, BaseError, Context, LastModificationDate, OntoInfo
 from .model import Model
+from .ontologycache import OntologyCache
 from .project import Project
 from .propertyclass import PropertyClass
 from .resourceclass import ResourceClass
 
+
+def _parse_entities(entity_cls: Any, con: Connection, context: Context, objs: List[Any]) -> List[Any]:
+    """
+    Parse a chunk of resource or property classes of an ontology (runs in a worker process)
+
+    :param entity_cls: ResourceClass or PropertyClass
+    :param con: Connection instance
+    :param context: The context of the ontology
+    :param objs: The JSON-LD of the classes
+    :return: List of instances of entity_cls
+    """
+    return [entity_cls.fromJsonObj(con=con, context=context, json_obj=obj) for obj in objs]
+
+
 class SetEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, set):
@@ -211,8 +228,72 @@ class Ontology(Model):
     def context(self, value: Context):
         raise BaseError('"Context" cannot be set!')
 
+    @staticmethod
+    def classify_graph(graph: List[Any], knora_api: str) -> Tuple[List[Any], List[Any], List[Any]]:
+        """
+        Sort the entries of the "@graph" of an ontology by their kind in one pass
+
+        :param graph: The entries of the "@graph"
+        :param knora_api: The prefix of the knora-api ontology in the context of the graph
+        :return: Tuple of the lists of the resource classes, the standoff classes and the properties
+        """
+        is_resource_class = knora_api + ':isResourceClass'
+        is_standoff_class = knora_api + ':isStandoffClass'
+        is_resource_property = knora_api + ':isResourceProperty'
+        resclasses_obj: List[Any] = []
+        standoffclasses_obj: List[Any] = []
+        properties_obj: List[Any] = []
+        for entry in graph:
+            if entry.get(is_resource_class) is not None:
+                resclasses_obj.append(entry)
+            elif entry.get(is_standoff_class) is not None:
+                standoffclasses_obj.append(entry)
+            elif entry.get(is_resource_property) is not None:
+                properties_obj.append(entry)
+        return resclasses_obj, standoffclasses_obj, properties_obj
+
+    @staticmethod
+    def __parse_parallel(con: Connection,
+                         context: Context,
+                         entities: List[Tuple[Any, List[Any]]],
+                         jobs: int) -> List[List[Any]]:
+        """
+        Parse the resource and property classes in worker processes. The parsed instances are sent back
+        pickled, they are attached to the given connection and context again.
+
+        :param con: Connection instance
+        :param context: The context of the ontology
+        :param entities: List of pairs of a class (ResourceClass or PropertyClass) and the JSON-LD to parse
+        :param jobs: Number of worker processes
+        :return: The lists of the parsed instances, in the order of entities
+        """
+        chunksize = max(sum(len(objs) for _, objs in entities) // (jobs * 4), 1)
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [[executor.submit(_parse_entities, entity_cls, con, context, objs[i:i + chunksize])
+                        for i in range(0, len(objs), chunksize)] for entity_cls, objs in entities]
+            results = [[instance for future in fs for instance in future.result()] for fs in futures]
+        for instances in results:
+            for instance in instances:
+                instance._con = con
+                instance._context = context
+                if isinstance(instance, ResourceClass) and instance.has_properties is not None:
+                    for has_property in instance.has_properties.values():
+                        has_property._con = con
+                        has_property._context = context
+        return results
+
     @classmethod
-    def fromJsonObj(cls, con: Connection, json_obj: Any) -> 'Ontology':
+    def fromJsonObj(cls, con: Connection, json_obj: Any, jobs: Optional[int] = None) -> 'Ontology':
+        """
+        Create an Ontology instance from the JSON-LD of an ontology
+
+        :param con: Connection instance
+        :param json_obj: The JSON-LD of the ontology, including the "@graph" with the classes and properties
+        :param jobs: Number of worker processes to parse the classes and properties, worthwhile only for very
+                     large ontologies (thousands of classes and properties). None parses them in the calling
+                     process [default: None]
+        :return: Ontology instance
+        """
         #
         # First let's get the ID (IRI) of the ontology
         #
@@ -226,12 +307,7 @@ class Ontology(Model):
         context = Context(json_obj.get('@context'))
         onto_name = id.split('/')[-2]
         context.add_context(onto_name, id + '#')
-        rdf = context.prefix_from_iri("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
-        rdfs = context.prefix_from_iri("http://www.w3.org/2000/01/rdf-schema#")
-        owl = context.prefix_from_iri("http://www.w3.org/2002/07/owl#")
-        xsd = context.prefix_from_iri("http://www.w3.org/2001/XMLSchema#")
-        knora_api = context.prefix_from_iri("http://api.knora.org/ontology/knora-api/v2#")
-        salsah_gui = context.prefix_from_iri("http://api.knora.org/ontology/salsah-gui/v2#")
+        rdf, rdfs, owl, xsd, knora_api, salsah_gui = context.system_prefixes
         this_onto = context.prefix_from_iri(id + "#")
 
         label = json_obj.get(rdfs + ':label')
@@ -251,17 +327,16 @@ class Ontology(Model):
         resource_classes = None
         property_classes = None
         if json_obj.get('@graph') is not None:
-            resclasses_obj = list(filter(lambda a: a.get(knora_api + ':isResourceClass') is not None, json_obj.get('@graph')))
-            resource_classes = list(map(lambda a: ResourceClass.fromJsonObj(con=con,
-                                                                            context=context,
-                                                                            json_obj=a), resclasses_obj))
-            standoffclasses_obj = list(filter(lambda a: a.get(knora_api + ':isStandoffClass') is not None, json_obj.get('@graph')))
+            resclasses_obj, standoffclasses_obj, properties_obj = cls.classify_graph(json_obj['@graph'], knora_api)
             # ToDo: parse standoff classes
-
-            properties_obj = list(filter(lambda a: a.get(knora_api + ':isResourceProperty') is not None, json_obj.get('@graph')))
-            property_classes = list(map(lambda a: PropertyClass.fromJsonObj(con=con,
-                                                                            context=context,
-                                                                            json_obj=a), properties_obj))
+            if jobs is not None and jobs > 1:
+                resource_classes, property_classes = Ontology.__parse_parallel(
+                    con, context, [(ResourceClass, resclasses_obj), (PropertyClass, properties_obj)], jobs)
+            else:
+                resource_classes = [ResourceClass.fromJsonObj(con=con, context=context, json_obj=a)
+                                    for a in resclasses_obj]
+                property_classes = [PropertyClass.fromJsonObj(con=con, context=context, json_obj=a)
+                                    for a in properties_obj]
         return cls(con=con,
                    id=id,
                    label=label,
@@ -385,8 +460,7 @@ class Ontology(Model):
         return Ontology.fromJsonObj(self._con, result)
 
     def read(self) -> 'Ontology':
-        result = self._con.get('/v2/ontologies/allentities/' + quote_plus(self._id) + '?allLanguages=true')
-        return Ontology.fromJsonObj(self._con, result)
+        return Ontology.__get(self._con, '/v2/ontologies/allentities/' + quote_plus(self._id) + '?allLanguages=true')
 
     def delete(self) -> Optional[str]:
         result = self._con.delete('/v2/ontologies/' + quote_plus(self._id),
@@ -406,9 +480,38 @@ class Ontology(Model):
         return Ontology.allOntologiesFromJsonObj(con, result)
 
     @staticmethod
-    def getOntologyFromServer(con: Connection, shortcode: str, name: str) -> 'Ontology':
-        result = con.get("/ontology/" + shortcode + "/" + name + "/v2")
-        return Ontology.fromJsonObj(con, result)
+    def getOntologyFromServer(con: Connection,
+                              shortcode: str,
+                              name: str,
+                              lastModificationDate: Optional[Union[str, LastModificationDate]] = None,
+                              jobs: Optional[int] = None) -> 'Ontology':
+        """
+        Read an ontology from the server, or from the default OntologyCache if it is up to date
+
+        :param con: Connection instance
+        :param shortcode: Shortcode of the project of the ontology
+        :param name: Name of the ontology
+        :param lastModificationDate: The current last modification date of the ontology, if known. Otherwise a
+                                     cached ontology is revalidated with the metadata of the project [default: None]
+        :param jobs: Number of worker processes to parse the ontology, see fromJsonObj [default: None]
+        :return: Ontology instance
+        """
+        return Ontology.__get(con, "/ontology/" + shortcode + "/" + name + "/v2", lastModificationDate, jobs)
+
+    @staticmethod
+    def __get(con: Connection,
+              path: str,
+              lastModificationDate: Optional[Union[str, LastModificationDate]] = None,
+              jobs: Optional[int] = None) -> 'Ontology':
+        cache = OntologyCache.get_default()
+        if cache is None:
+            return Ontology.fromJsonObj(con, con.get(path), jobs)
+        return cache.get(con, path, lambda result: Ontology.fromJsonObj(con, result, jobs), lastModificationDate)
+
+    @staticmethod
+    async def getOntologyFromServerAsync(acon: AsyncConnection, shortcode: str, name: str) -> 'Ontology':
+        result = await acon.get("/ontology/" + shortcode + "/" + name + "/v2")
+        return Ontology.fromJsonObj(acon.connection, result)
 
     def createDefinitionFileObj(self):
         ontology = {
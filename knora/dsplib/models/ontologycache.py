@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import quote_plus
+
+from pystrict import strict
+
+from .connection import Connection
+from .helpers import LastModificationDate
+
+"""
+This module implements a persistent cache of ontologies in a local directory. For every ontology
+request (server and path, e.g. "/ontology/0001/anything/v2") two files are kept:
+
+- ``<key>.json``: A header line with the server, the path, the IRI, the project and the last
+  modification date of the ontology, followed by the raw JSON-LD as returned by the server.
+- ``<key>.pickle``: The header followed by the parsed ``Ontology`` instance (pre-parsed form). The
+  connection is not stored but replaced by the connection of the caller on loading.
+
+Both headers hold the format version of the cache, an entry written with another version (e.g. before
+an update of dsplib that changed the pickled model classes) is a cache miss.
+
+An entry is valid as long as the last modification date of the ontology is unchanged. The caller
+either knows the current date (e.g. from "/v2/ontologies/metadata" it has read anyway), or the cache
+requests the metadata of the project of the ontology, which is much cheaper than the ontology itself.
+Ontologies without a last modification date (the built-in ones) are not cached.
+
+The cache used by the ``Ontology`` methods and the ``ResourceInstanceFactory`` is set with
+``OntologyCache.set_default()``, or with the environment variable ``DSP_ONTOLOGY_CACHE`` holding the
+directory. The pickle files are trusted, the directory must not be writable by others.
+"""
+
+
+class _Pickler(pickle.Pickler):
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        return 'connection' if isinstance(obj, Connection) else None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: Any, con: Connection):
+        super().__init__(file)
+        self._con = con
+
+    def persistent_load(self, pid: str) -> Connection:
+        if pid != 'connection':
+            raise pickle.UnpicklingError('Unknown persistent id')
+        return self._con
+
+
+@strict
+class OntologyCache:
+    """
+    Persistent cache of the raw and the parsed ontologies, revalidated by the last modification date
+    """
+    _directory: str
+    FORMAT_VERSION = 3  # bump whenever the pickled model classes (Ontology, ResourceClass, ...) change
+    _default: Optional['OntologyCache'] = None
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Directory of the cache, it is created if it does not exist
+        """
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @staticmethod
+    def set_default(cache: Optional['OntologyCache']) -> None:
+        """
+        Set the cache used by all dsplib methods that read ontologies
+
+        :param cache: OntologyCache instance or None to disable caching
+        :return: None
+        """
+        OntologyCache._default = cache
+
+    @staticmethod
+    def get_default() -> Optional['OntologyCache']:
+        """
+        Get the cache used by all dsplib methods that read ontologies. If none has been set, the
+        directory given by the environment variable DSP_ONTOLOGY_CACHE is used.
+
+        :return: OntologyCache instance or None
+        """
+        if OntologyCache._default is None and os.environ.get('DSP_ONTOLOGY_CACHE'):
+            OntologyCache._default = OntologyCache(os.environ['DSP_ONTOLOGY_CACHE'])
+        return OntologyCache._default
+
+    def get_jsonld(self,
+                   con: Connection,
+                   path: str,
+                   lastModificationDate: Optional[Union[str, LastModificationDate]] = None) -> Any:
+        """
+        Get the raw JSON-LD of an ontology, from the cache if it is up to date, otherwise from the server
+
+        :param con: Connection instance
+        :param path: Path of the GET request for the ontology
+        :param lastModificationDate: The current last modification date of the ontology. If None, it is
+                                     read from the metadata of the ontologies of the project [default: None]
+        :return: JSON-LD of the ontology
+        """
+        key = self.__key(con.server, path)
+        header = self.__read_header(key + '.json')
+        if header is not None and header['lastModificationDate'] == self.__current_lmd(con, header, lastModificationDate):
+            jsonld = self.__read_jsonld(key + '.json')
+            if jsonld is not None:
+                return jsonld
+        jsonld = con.get(path)
+        self.__write_jsonld(key, con.server, path, jsonld)
+        return jsonld
+
+    def get(self,
+            con: Connection,
+            path: str,
+            parse: Callable[[Any], Any],
+            lastModificationDate: Optional[Union[str, LastModificationDate]] = None) -> Any:
+        """
+        Get the parsed ontology, from the cache if it is up to date, otherwise it is parsed from the cached
+        JSON-LD or read from the server
+
+        :param con: Connection instance, it is set in the objects loaded from the cache
+        :param path: Path of the GET request for the ontology
+        :param parse: Function that parses the JSON-LD of the ontology
+        :param lastModificationDate: The current last modification date of the ontology. If None, it is
+                                     read from the metadata of the ontologies of the project [default: None]
+        :return: The parsed ontology
+        """
+        key = self.__key(con.server, path)
+        header = self.__read_header(key + '.pickle')
+        if header is not None:
+            lmd = self.__current_lmd(con, header, lastModificationDate)
+            if header['lastModificationDate'] == lmd:
+                parsed = self.__read_parsed(key + '.pickle', con)
+                if parsed is not None:
+                    return parsed
+            lastModificationDate = lmd  # no need to request the metadata again
+        jsonld = self.get_jsonld(con, path, lastModificationDate)
+        parsed = parse(jsonld)
+        header = self.__make_header(con.server, path, jsonld)
+        if header['lastModificationDate'] is not None:
+            self.__write(key + '.pickle', lambda f: self.__dump_parsed(f, header, parsed))
+        return parsed
+
+    def clear(self) -> None:
+        """
+        Remove all entries of the cache
+
+        :return: None
+        """
+        for filename in os.listdir(self._directory):
+            if filename.endswith('.json') or filename.endswith('.pickle'):
+                os.remove(os.path.join(self._directory, filename))
+
+    def __key(self, server: str, path: str) -> str:
+        digest = hashlib.sha256((server + ' ' + path).encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, digest)
+
+    @staticmethod
+    def __make_header(server: str, path: str, jsonld: Any) -> Dict[str, Any]:
+        iri = jsonld.get('@id')
+        project = None
+        lmd = None
+        for name, value in jsonld.items():
+            if name.endswith(':attachedToProject') and isinstance(value, dict):
+                project = value.get('@id')
+            elif name.endswith(':lastModificationDate'):
+                lmd = str(LastModificationDate(value))
+        return {'version': OntologyCache.FORMAT_VERSION, 'server': server, 'path': path, 'iri': iri,
+                'project': project, 'lastModificationDate': lmd}
+
+    @staticmethod
+    def __current_lmd(con: Connection,
+                      header: Dict[str, Any],
+                      lastModificationDate: Optional[Union[str, LastModificationDate]]) -> Optional[str]:
+        """
+        Get the current last modification date of the cached ontology, if it is not given from the
+        metadata of the ontologies of its project
+        """
+        if lastModificationDate is not None:
+            return str(LastModificationDate(lastModificationDate))
+        if header.get('project') is None:
+            return None
+        result = con.get('/v2/ontologies/metadata/' + quote_plus(header['project']))
+        for onto in result.get('@graph', [result]):
+            if onto.get('@id') == header['iri']:
+                for name, value in onto.items():
+                    if name.endswith(':lastModificationDate'):
+                        return str(LastModificationDate(value))
+        return None
+
+    @staticmethod
+    def __read_header(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            if path.endswith('.pickle'):
+                with open(path, 'rb') as f:
+                    header = pickle.load(f)
+            else:
+                with open(path, encoding='utf-8') as f:
+                    header = json.loads(f.readline())
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None
+        if not isinstance(header, dict) or header.get('version') != OntologyCache.FORMAT_VERSION:
+            return None
+        return header
+
+    @staticmethod
+    def __read_jsonld(path: str) -> Any:
+        try:
+            with open(path, encoding='utf-8') as f:
+                f.readline()
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def __read_parsed(path: str, con: Connection) -> Any:
+        try:
+            with open(path, 'rb') as f:
+                pickle.load(f)  # header
+                return _Unpickler(f, con).load()
+        except Exception:  # an outdated pickle may fail in many ways, it is then parsed again
+            return None
+
+    @staticmethod
+    def __dump_parsed(f: Any, header: Dict[str, Any], parsed: Any) -> None:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(parsed)
+
+    def __write_jsonld(self, key: str, server: str, path: str, jsonld: Any) -> None:
+        header = self.__make_header(server, path, jsonld)
+        if header['lastModificationDate'] is None:
+            return
+
+        def dump(f: Any) -> None:
+            f.write((json.dumps(header) + '\n').encode('utf-8'))
+            f.write(json.dumps(jsonld, ensure_ascii=False).encode('utf-8'))
+
+        self.__write(key + '.json', dump)
+
+    def __write(self, path: str, dump: Callable[[Any], None]) -> None:
+        """
+        Write a file atomically, concurrent readers see either the old or the new file
+        """
+        fd, tmppath = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                dump(f)
+            os.replace(tmppath, path)
+        except BaseException:
+            os.remove(tmppath)
+            raise
@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Tuple
+
+from pystrict import strict
+
+from .helpers import BaseError
+from .ontology import Ontology
+from .propertyclass import PropertyClass
+from .resourceclass import ResourceClass
+
+"""
+This module implements an index of the resource classes and properties of a set of ontologies (e.g. the
+ontologies of a project and of the shared project). The classes and properties are found by their prefixed
+name ("anything:Thing") in a dict, and the transitive closures of the superclasses and superproperties as
+well as the knora base class of every resource class ("Resource", "StillImageRepresentation", ...) are
+computed once when the index is built.
+
+The prefix of a class or property is the name of its ontology, superclasses and superproperties of other
+ontologies (e.g. "knora-api:Resource" or "foaf:Person") are part of the closures but have no entries.
+"""
+
+
+@strict
+class OntologyIndex:
+    """
+    Index of the resource classes and properties of a set of ontologies with their precomputed hierarchies
+    """
+    _classes: Dict[str, ResourceClass]
+    _properties: Dict[str, PropertyClass]
+    _superclasses: Dict[str, Tuple[str, ...]]
+    _superproperties: Dict[str, Tuple[str, ...]]
+    _baseclasses: Dict[str, Optional[str]]
+
+    def __init__(self, ontologies: Dict[str, Ontology]):
+        """
+        Build the index
+
+        :param ontologies: The ontologies by their name (which is the prefix of their classes and properties)
+        """
+        self._classes = {}
+        self._properties = {}
+        for name, onto in ontologies.items():
+            self._classes.update({name + ':' + x.name: x for x in onto.resource_classes or []})
+            self._properties.update({name + ':' + x.name: x for x in onto.property_classes or []})
+        parents = {name: x.superclasses or [] for name, x in self._classes.items()}
+        self._superclasses = self.__closures(parents)
+        self._superproperties = self.__closures({name: x.superproperties or []
+                                                 for name, x in self._properties.items()})
+        self._baseclasses = {}
+        for name in self._classes:
+            self.__baseclass(name, parents)
+
+    @staticmethod
+    def __closures(parents: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+        """
+        Compute the transitive closures of a hierarchy, each in the order of a depth-first traversal
+
+        :param parents: The direct parents by name
+        :return: The tuples of all ancestors by name
+        """
+        closures: Dict[str, Tuple[str, ...]] = {}
+
+        def closure(name: str, visiting: Tuple[str, ...]) -> Tuple[str, ...]:
+            result = closures.get(name)
+            if result is not None:
+                return result
+            ancestors: Dict[str, None] = {}
+            for parent in parents.get(name, []):
+                if parent in visiting:
+                    raise BaseError('Cyclic hierarchy: ' + ' -> '.join(visiting + (parent,)))
+                ancestors[parent] = None
+                ancestors.update(dict.fromkeys(closure(parent, visiting + (parent,))))
+            result = tuple(ancestors)
+            if name in parents:
+                closures[name] = result
+            return result
+
+        for name in parents:
+            closure(name, (name,))
+        return closures
+
+    def __baseclass(self, name: str, parents: Dict[str, List[str]]) -> Optional[str]:
+        """
+        Find the knora base class of a resource class: the knora-api class reached first through the first
+        superclass that is either from knora-api or from one of the indexed ontologies
+
+        :param name: Prefixed name of the resource class
+        :param parents: The direct superclasses by name (without cycles)
+        :return: The name of the base class without prefix, e.g. "Resource", or None
+        """
+        if name in self._baseclasses:
+            return self._baseclasses[name]
+        baseclass = None
+        for superclass in parents[name]:
+            prefix, classname = superclass.split(':')
+            if prefix == 'knora-api':
+                baseclass = classname
+                break
+            if superclass in self._classes:
+                baseclass = self.__baseclass(superclass, parents)
+                break
+        self._baseclasses[name] = baseclass
+        return baseclass
+
+    @property
+    def classes(self) -> Dict[str, ResourceClass]:
+        return self._classes
+
+    @property
+    def properties(self) -> Dict[str, PropertyClass]:
+        return self._properties
+
+    def get_class(self, name: str) -> ResourceClass:
+        """
+        :param name: Prefixed name of the resource class, e.g. "anything:Thing"
+        :return: The resource class
+        """
+        resclass = self._classes.get(name)
+        if resclass is None:
+            raise BaseError('Resource class "{}" not found in the ontologies'.format(name))
+        return resclass
+
+    def get_property(self, name: str) -> PropertyClass:
+        """
+        :param name: Prefixed name of the property, e.g. "anything:hasText"
+        :return: The property class
+        """
+        propclass = self._properties.get(name)
+        if propclass is None:
+            raise BaseError('Property "{}" not found in the ontologies'.format(name))
+        return propclass
+
+    def superclasses(self, name: str) -> Tuple[str, ...]:
+        """
+        :param name: Prefixed name of the resource class
+        :return: The prefixed names of all (direct and indirect) superclasses
+        """
+        self.get_class(name)
+        return self._superclasses[name]
+
+    def superproperties(self, name: str) -> Tuple[str, ...]:
+        """
+        :param name: Prefixed name of the property
+        :return: The prefixed names of all (direct and indirect) superproperties
+        """
+        self.get_property(name)
+        return self._superproperties[name]
+
+    def baseclass(self, name: str) -> Optional[str]:
+        """
+        :param name: Prefixed name of the resource class
+        :return: The knora base class of the resource class without prefix (e.g. "StillImageRepresentation"),
+                 None if there is none
+        """
+        self.get_class(name)
+        return self._baseclasses[name]
+
+    def is_subclass_of(self, name: str, superclass: str) -> bool:
+        """
+        :param name: Prefixed name of the resource class
+        :param superclass: Prefixed name of the (possible) superclass
+        :return: True, if superclass is one of the direct or indirect superclasses of the resource class
+        """
+        return superclass in self.superclasses(name)
@@ -1,4 +1,5 @@
 from enum import Enum, unique
+from functools import lru_cache
 from typing import List, Set, Dict, Tuple, Optional, Any, Union, Type
 from pystrict import strict
 import re
@@ -98,13 +99,19 @@ class Permissions:
             tmpstr += str(permission) + ' ' + ",".join(groups)
         return tmpstr
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse(permstr: str) -> Tuple[Tuple[PermissionValue, Tuple[str, ...]], ...]:
+        # the same few permission strings occur on every value that is read, they are split only once
+        parsed = []
+        for s in permstr.split('|'):
+            key, *vals = re.split("[\\s,]+", s)
+            parsed.append((PermissionValue[key], tuple(vals)))
+        return tuple(parsed)
+
     @classmethod
     def fromString(cls, permstr: str):
-        tmpstr = permstr.split('|')
-        permissions: Dict[PermissionValue, List[str]] = {}
-        for s in tmpstr:
-            key, *vals = re.split("[\\s,]+", s)
-            permissions[PermissionValue[key]] = vals
+        permissions: Dict[PermissionValue, List[str]] = {key: list(vals) for key, vals in cls._parse(permstr)}
         return cls(permissions)
 
     @property
@@ -1,27 +1,36 @@
 import json
+import os
 import re
+from collections import deque
+from collections.abc import MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum, unique
+from itertools import islice
 from urllib.parse import quote_plus
 
 from pystrict import strict
 from rfc3987 import parse
-from typing import List, Set, Dict, Tuple, Optional, Any, Union, Type
-from copy import deepcopy
+from typing import List, Set, Dict, Tuple, Optional, Any, Union, Type, Callable, Iterable, Iterator, Deque
 
 from .group import Group
 from .langstring import LangString
 from .helpers import OntoInfo, Actions, BaseError, Cardinality, Context
 from .connection import Connection
+from .asyncconnection import AsyncConnection
 from .model import Model
 from .project import Project
-from .listnode import ListNode
+from .listnode import ListNode, ListIndex, CompactList
 from .ontology import Ontology
+from .ontologycache import OntologyCache
+from .ontologyindex import OntologyIndex
+from .gravsearch import GravsearchQuery
 from .propertyclass import PropertyClass
 from .resourceclass import ResourceClass, HasProperty
 from .permission import PermissionValue, PermissionsIterator, Permissions
 from .value import KnoraStandoffXml, Value, TextValue, ColorValue, DateValue, DecimalValue, GeomValue, GeonameValue, \
-    IntValue, BooleanValue, UriValue, TimeValue, IntervalValue, ListValue, LinkValue, fromJsonLdObj
+    IntValue, BooleanValue, UriValue, TimeValue, IntervalValue, ListValue, LinkValue, fromJsonLdObj, \
+    get_value_type
 
 
 from pprint import pprint
@@ -32,7 +41,7 @@ class KnoraStandoffXmlEncoder(json.JSONEncoder):
         if isinstance(obj, KnoraStandoffXml):
             return '<?xml version="1.0" encoding="UTF-8"?>\n<text>' + obj.getXml() + '</text>'
         elif isinstance(obj, OntoInfo):
-            return obj.iri + "#" if obj.hashtag else ""
+            return obj.iri + ("#" if obj.hashtag else "")
         return json.JSONEncoder.default(self, obj)
 
 @dataclass
@@ -43,6 +52,211 @@ class Propinfo:
     attributes: Optional[str] = None
 
 
+def jsonld_default(obj: Any) -> Any:
+    """Fallback of the JSON backends for the objects that are not JSON types (same as KnoraStandoffXmlEncoder)"""
+    if isinstance(obj, KnoraStandoffXml):
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<text>' + obj.getXml() + '</text>'
+    elif isinstance(obj, OntoInfo):
+        return obj.iri + ("#" if obj.hashtag else "")
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(obj).__name__))
+
+
+_compact_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=jsonld_default)
+
+
+def _dumps(obj: Any) -> bytes:
+    return _compact_encoder.encode(obj).encode('utf-8')
+
+
+@strict
+class ResourceEncoder:
+    """
+    Precompiled serialisation of the resources of one resource class for the creation with DSP-API.
+
+    The parts that are the same for all resources of the class (type and project) are encoded once when the
+    class is created, as well as the JSON keys of the properties and the prefixes they need. For each resource
+    only the label, the permissions and the values are encoded, as compact UTF-8 JSON by the C encoder of the
+    json module, or by the backend given in ``dumps`` (e.g. ``lambda obj: orjson.dumps(obj, default=jsonld_default)``).
+
+    The JSON-LD context of the project contains the prefixes of all ontologies of the project and of the
+    shared project. A payload gets the minimal context with only the prefixes it uses. These contexts are
+    encoded once for every combination of properties that occurs.
+    """
+    _head: bytes
+    _value_head: bytes
+    _context: Dict[str, Any]
+    _contexts: Dict[frozenset, bytes]
+    _keys: Dict[str, Tuple[str, frozenset]]
+    _base_prefixes: frozenset
+    _dumps: Callable[[Any], bytes]
+
+    # the value types that use datatypes of XML schema, e.g. "xsd:decimal"
+    xsd_valtypes = (DecimalValue, UriValue, TimeValue, IntervalValue)
+
+    def __init__(self,
+                 classname: str,
+                 project: str,
+                 context: Any,
+                 properties: Dict[str, Propinfo],
+                 dumps: Optional[Callable[[Any], bytes]] = None):
+        """
+        :param classname: Prefixed name of the resource class, e.g. "anything:Thing"
+        :param project: IRI of the project
+        :param context: The JSON-LD context of the resources (prefix -> IRI)
+        :param properties: The properties of the resource class
+        :param dumps: Function that encodes a JSON object as compact UTF-8 JSON [default: json C encoder]
+        """
+        self._dumps = dumps if dumps is not None else _dumps
+        self._head = _dumps({'@type': classname, 'knora-api:attachedToProject': {'@id': project}})[:-1]
+        self._value_head = _dumps({'@type': classname})[:-1]
+        self._context = dict(context)
+        self._contexts = {}
+        self._base_prefixes = frozenset((classname.split(':')[0], 'rdfs', 'knora-api'))
+        self._keys = {}
+        for propname, propinfo in properties.items():
+            prefixes = {propname.split(':')[0]}
+            if propinfo.valtype in self.xsd_valtypes:
+                prefixes.add('xsd')
+            key = propname + 'Value' if propinfo.valtype is LinkValue else propname
+            self._keys[propname] = (key, frozenset(prefixes))
+
+    def __key(self, propname: str, value: Union[Value, List[Value]]) -> Tuple[str, frozenset]:
+        key = self._keys.get(propname)
+        if key is None:  # not part of the data model, e.g. values read from the server
+            first = value[0] if type(value) is list else value
+            key = (propname + 'Value' if type(first) is LinkValue else propname,
+                   frozenset((propname.split(':')[0], 'xsd')))
+        return key
+
+    def context(self, prefixes: frozenset) -> bytes:
+        """
+        The encoded minimal context for the given prefixes
+
+        :param prefixes: Set of the prefixes used in the payload
+        :return: The encoded "@context" member, including the closing brace of the payload
+        """
+        encoded = self._contexts.get(prefixes)
+        if encoded is None:
+            encoded = b',"@context":' + _dumps({p: iri for p, iri in self._context.items() if p in prefixes}) + b'}'
+            self._contexts[prefixes] = encoded
+        return encoded
+
+    def __body(self, head: bytes, obj: Dict[str, Any], prefixes: frozenset) -> bytes:
+        body = self._dumps(obj)
+        return head + (b',' + body[1:-1] if len(body) > 2 else b'') + self.context(prefixes)
+
+    def encode(self, resource: 'ResourceInstance') -> bytes:
+        """
+        Encode the JSON-LD for the creation of the resource
+
+        :param resource: Instance of the resource class
+        :return: UTF-8 encoded JSON
+        """
+        tmp = {'rdfs:label': resource._label}
+        if resource._permissions:
+            tmp["knora-api:hasPermissions"] = resource._permissions.toJsonLdObj()
+        if resource._stillimage:
+            tmp["knora-api:hasStillImageFileValue"] = {
+                "@type": "knora-api:StillImageFileValue",
+                "knora-api:fileValueHasFilename": resource._stillimage
+            }
+        prefixes = self._base_prefixes
+        for propname, value in resource._values.items():
+            key, key_prefixes = self.__key(propname, value)
+            if not key_prefixes <= prefixes:
+                prefixes = prefixes | key_prefixes
+            if type(value) is list:
+                tmp[key] = [v.toJsonLdObj(Actions.Create) for v in value]
+            else:
+                tmp[key] = value.toJsonLdObj(Actions.Create)
+        return self.__body(self._head, tmp, prefixes)
+
+    def encode_value(self, iri: str, propname: str, value: Value) -> bytes:
+        """
+        Encode the JSON-LD for the creation of a value of an existing resource
+
+        :param iri: IRI of the resource
+        :param propname: Prefixed name of the property
+        :param value: The value
+        :return: UTF-8 encoded JSON
+        """
+        key, key_prefixes = self.__key(propname, value)
+        return self.__body(self._value_head, {'@id': iri, key: value.toJsonLdObj(Actions.Create)},
+                           self._base_prefixes | key_prefixes)
+
+
+_undecoded = object()
+
+
+@strict
+class LazyValues(MutableMapping):
+    """
+    The values of a resource read from DSP-API (property name -> Value or list of Values). The values are
+    kept as the raw JSON-LD and converted to Value instances on first access of the property, so that a
+    caller that uses only a few properties of a large resource does not pay for decoding all of them.
+    Apart from that it behaves as a dict.
+    """
+    _data: Dict[str, Any]
+    _raw: Dict[str, Any]
+
+    def __init__(self, raw: Dict[str, Any]):
+        """
+        :param raw: The JSON-LD of the values (property name -> JSON-LD object or list of JSON-LD objects)
+        """
+        self._data = dict.fromkeys(raw, _undecoded)
+        self._raw = raw
+
+    @staticmethod
+    def decode(propname: str, obj: Any) -> Union[Value, List[Value]]:
+        try:
+            if isinstance(obj, list):
+                return [fromJsonLdObj(o) for o in obj]
+            return fromJsonLdObj(obj)
+        except KeyError:
+            raise BaseError("Invalid data in JSON-LD: \"{}\" has value class \"{}\"!".format(
+                propname, obj[0].get("@type") if isinstance(obj, list) else obj.get("@type")))
+
+    @property
+    def decoded(self) -> Set[str]:
+        """
+        The names of the properties whose values are converted to Value instances
+        """
+        return {key for key, value in self._data.items() if value is not _undecoded}
+
+    def __getitem__(self, key: str) -> Union[Value, List[Value]]:
+        value = self._data[key]
+        if value is _undecoded:
+            value = self.decode(key, self._raw[key])
+            self._data[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Union[Value, List[Value]]) -> None:
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def copy(self) -> 'LazyValues':
+        """
+        Copy in which the values can be added or removed independently, the undecoded values stay undecoded
+        """
+        newvalues = LazyValues(self._raw)
+        newvalues._data = {key: list(value) if type(value) is list else value for key, value in self._data.items()}
+        return newvalues
+
+
 @strict
 class ResourceInstance(Model):
     _iri: Union[str, None]
@@ -54,6 +268,13 @@ class ResourceInstance(Model):
     _stillimage: Union[str, None]
     _values: Union[Dict[Value, List[Value]], None]
 
+    # the members of the JSON-LD of a resource that are not values
+    _not_values = frozenset((
+        '@id', '@type', '@context', "rdfs:label", "knora-api:arkUrl", "knora-api:versionArkUrl",
+        "knora-api:creationDate", "knora-api:attachedToUser", "knora-api:attachedToProject",
+        "knora-api:hasPermissions", "knora-api:userHasPermission", "knora-api:hasStillImageFileValue"
+    ))
+
     def __init__(self,
                  con: Connection,
                  iri: Optional[str] = None,
@@ -97,24 +318,26 @@ class ResourceInstance(Model):
                                 self._values[propname].append(val)
                             elif type(val) is dict:
                                 if propinfo.valtype is ListValue:
-                                    val['lists'] = self.lists
+                                    val['lists'] = self.listindex
                                 self._values[propname].append(propinfo.valtype(**val))
                             else:
                                 if propinfo.valtype is ListValue:
-                                    val = {'value': val, 'lists': self.list}
-                                self._values[propname].append(propinfo.valtype(val))
+                                    self._values[propname].append(propinfo.valtype(value=val, lists=self.listindex))
+                                else:
+                                    self._values[propname].append(propinfo.valtype(val))
                             valcnt = valcnt + 1
                     else:  # we do have only one value for this property
                         if type(vals) is Value:
                             self._values[propname] = vals
                         elif type(vals) is dict:
                             if propinfo.valtype is ListValue:
-                                vals['lists'] = self.lists
+                                vals['lists'] = self.listindex
                             self._values[propname] = propinfo.valtype(**vals)
                         else:
                             if propinfo.valtype is ListValue:
-                                vals = {'value': val, 'lists': self.list}
-                            self._values[propname] = propinfo.valtype(vals)
+                                self._values[propname] = propinfo.valtype(value=vals, lists=self.listindex)
+                            else:
+                                self._values[propname] = propinfo.valtype(vals)
                 else:
                     if propinfo.cardinality == Cardinality.C_1 or propinfo.cardinality == Cardinality.C_1_n:
                         raise BaseError("Cardinality does require at least one value for \"{}\"!".format(propname))
@@ -134,43 +357,71 @@ class ResourceInstance(Model):
     def vark(self) -> str:
         return self._vark
 
+    def __new_instance(self, iri: Optional[str], ark: Optional[str], vark: Optional[str]) -> 'ResourceInstance':
+        """
+        New instance of the same resource class with the attributes of this one. The constructor is not run,
+        its checks are for new resources and the attributes of this instance have passed them already.
+        """
+        newinstance = type(self).__new__(type(self))
+        newinstance.__dict__.update(self.__dict__)
+        newinstance.__dict__.update(_changed=set(), _iri=iri, _ark=ark, _vark=vark)
+        return newinstance
+
+    @staticmethod
+    def _get_stillimage(jsonld_obj: Any) -> Optional[str]:
+        """
+        :param jsonld_obj: JSON-LD of a resource from DSP-API
+        :return: The filename of the knora-api:hasStillImageFileValue of the resource, None if there is none
+        """
+        fileval = jsonld_obj.get("knora-api:hasStillImageFileValue")
+        if type(fileval) is list:
+            fileval = fileval[0] if fileval else None
+        if fileval is None:
+            return None
+        return fileval.get("knora-api:fileValueHasFilename")
+
     def clone(self) -> 'ResourceInstance':
-        return deepcopy(self)
-
-    def fromJsonLdObj(self, con: Connection, jsonld_obj: Any) -> 'ResourceInstance':
-        newinstance = self.clone()
-        newinstance._iri = jsonld_obj.get('@id')
-        resclass = jsonld_obj.get('@type')
-        context = Context(jsonld_obj.get('@context'))
-        newinstance._label = jsonld_obj.get("rdfs:label")
-        newinstance._ark = Value.get_typed_value("knora-api:arkUrl", jsonld_obj)
-        newinstance._vark = Value.get_typed_value("knora-api:versionArkUrl", jsonld_obj)
-        newinstance._permissions = Permissions.fromString(jsonld_obj.get("knora-api:hasPermissions"))
-        newinstance._upermission = PermissionValue[jsonld_obj.get("knora-api:userHasPermission", jsonld_obj)]
-        creation_date = Value.get_typed_value("knora-api:creationDate", jsonld_obj)
-        user = Value.get_typed_value("knora-api:attachedToUser", jsonld_obj)
-        project = Value.get_typed_value("knora-api:attachedToProject", jsonld_obj)
-        to_be_ignored = [
-            '@id', '@type', '@context', "rdfs:label", "knora-api:arkUrl", "knora-api:versionArkUrl",
-            "knora-api:creationDate", "knora-api:attachedToUser", "knora-api:attachedToProject",
-            "knora-api:hasPermissions", "knora-api:userHasPermission"
-        ]
-        if id is None:
+        """
+        Copy of the resource instance. The connection, the permissions and the value objects are shared
+        with the original, the values can be added or removed independently.
+
+        :return: New instance of the same resource class
+        """
+        newinstance = self.__new_instance(self._iri, self._ark, self._vark)
+        newinstance._values = self.__copy_values()
+        return newinstance
+
+    def __copy_values(self) -> Dict[str, Union[Value, List[Value]]]:
+        if isinstance(self._values, LazyValues):
+            return self._values.copy()
+        return {name: list(val) if type(val) is list else val for name, val in self._values.items()}
+
+    @classmethod
+    def fromJsonLdObj(cls, con: Connection, jsonld_obj: Any) -> 'ResourceInstance':
+        """
+        Resource instance of this class from the JSON-LD of a resource returned by DSP-API. The constructor
+        is not run, its checks are for new resources: e.g. the stillimage of a StillImageRepresentation is
+        taken from the knora-api:hasStillImageFileValue of the JSON-LD.
+
+        :param con: Connection instance of the new resource instance
+        :param jsonld_obj: JSON-LD of the resource
+        :return: New instance of this resource class
+        """
+        iri = jsonld_obj.get('@id')
+        if iri is None:
             raise BaseError('Resource "id" is missing in JSON-LD from DSP-API')
-        type = jsonld_obj.get('@type')
-        newinstance._values: Dict[str, Union[Value, List[Value]]] = {}
-        for key, obj in jsonld_obj.items():
-            if key in to_be_ignored:
-                continue
-            try:
-                if isinstance(obj, list):
-                    newinstance._values[key] = []
-                    for o in obj:
-                        newinstance._values[key].append(fromJsonLdObj(o))
-                else:
-                    newinstance._values[key] = fromJsonLdObj(obj)
-            except KeyError as kerr:
-                raise BaseError("Invalid data in JSON-LD: \"{}\" has value class \"{}\"!".format(key, obj.get("@type")))
+        newinstance = cls.__new__(cls)
+        newinstance.__dict__.update(
+            _con=con,
+            _changed=set(),
+            _iri=iri,
+            _label=jsonld_obj.get("rdfs:label"),
+            _ark=Value.get_typed_value("knora-api:arkUrl", jsonld_obj),
+            _vark=Value.get_typed_value("knora-api:versionArkUrl", jsonld_obj),
+            _permissions=Permissions.fromString(jsonld_obj.get("knora-api:hasPermissions")),
+            _upermission=PermissionValue[jsonld_obj.get("knora-api:userHasPermission", jsonld_obj)],
+            _stillimage=cls._get_stillimage(jsonld_obj),
+            _values=LazyValues({key: obj for key, obj in jsonld_obj.items() if key not in cls._not_values}))
         return newinstance
 
     def toJsonLdObj(self, action: Actions) -> Any:
@@ -205,21 +456,79 @@ class ResourceInstance(Model):
             pass
         return tmp
 
-    def create(self):
-        jsonobj = self.toJsonLdObj(Actions.Create)
-        jsondata = json.dumps(jsonobj, indent=4, separators=(',', ': '), cls=KnoraStandoffXmlEncoder)
-        print(jsondata)
-        result = self._con.post('/v2/resources', jsondata)
-        newinstance = self.clone()
-        newinstance._iri = result['@id']
-        newinstance._ark = result['knora-api:arkUrl']['@value']
-        newinstance._vark = result['knora-api:versionArkUrl']['@value']
+    @classmethod
+    def get_encoder(cls) -> ResourceEncoder:
+        """
+        The precompiled encoder of the resource class. The classes created by the ResourceInstanceFactory
+        have it from the start, for other classes it is compiled on first use.
+        """
+        encoder = cls.__dict__.get('encoder')
+        if encoder is None:
+            encoder = ResourceEncoder(cls.classname, cls.project, cls.context, cls.properties)
+            cls.encoder = encoder
+        return encoder
+
+    def _create_jsondata(self) -> bytes:
+        return self.get_encoder().encode(self)
+
+    def _from_create_result(self, result: Any) -> 'ResourceInstance':
+        newinstance = self.__new_instance(result['@id'],
+                                          result['knora-api:arkUrl']['@value'],
+                                          result['knora-api:versionArkUrl']['@value'])
+        newinstance._stillimage = self._get_stillimage(result)
+        newinstance._values = self.__copy_values()
         return newinstance
 
+    def create(self):
+        result = self._con.post('/v2/resources', self._create_jsondata())
+        return self._from_create_result(result)
+
+    async def createAsync(self, acon: AsyncConnection) -> 'ResourceInstance':
+        """
+        Same as create(), but the request is sent through the given AsyncConnection
+        """
+        result = await acon.post('/v2/resources', self._create_jsondata())
+        return self._from_create_result(result)
+
+    def _value_jsondata(self, propname: str, value: Union[str, Dict[str, str], Value]) -> bytes:
+        propinfo = self.properties.get(propname)
+        if propinfo is None:
+            raise BaseError("Property \"{}\" is not part of data model!".format(propname))
+        if not isinstance(value, Value):
+            if type(value) is dict:
+                value = propinfo.valtype(**value)
+            else:
+                value = propinfo.valtype(value)
+        return self.get_encoder().encode_value(self._iri, propname, value)
+
+    def createValue(self, propname: str, value: Union[str, Dict[str, str], Value]) -> str:
+        """
+        Add a value to the existing resource using the values endpoint of DSP-API
+
+        :param propname: Prefixed name of the property, e.g. "anything:hasOtherThing"
+        :param value: The value, given as in the values-parameter of the constructor
+        :return: IRI of the new value
+        """
+        result = self._con.post('/v2/values', self._value_jsondata(propname, value))
+        return result['@id']
+
+    async def createValueAsync(self, acon: AsyncConnection, propname: str, value: Union[str, Dict[str, str], Value]) -> str:
+        """
+        Same as createValue(), but the request is sent through the given AsyncConnection
+        """
+        result = await acon.post('/v2/values', self._value_jsondata(propname, value))
+        return result['@id']
+
     def read(self) -> 'ResourceInstance':
         result = self._con.get('/v2/resources/' + quote_plus(self._iri))
         return self.fromJsonLdObj(con=self._con, jsonld_obj=result)
 
+    async def readAsync(self, acon: AsyncConnection) -> 'ResourceInstance':
+        """
+        Same as read(), but the request is sent through the given AsyncConnection
+        """
+        result = await acon.get('/v2/resources/' + quote_plus(self._iri))
+        return self.fromJsonLdObj(con=self._con, jsonld_obj=result)
 
     def update(self):
         pass
@@ -243,19 +552,61 @@ class ResourceInstance(Model):
                 print(name, ':', str(val))
 
 
+class _LazyClassAttribute:
+    """
+    Class attribute that is computed on access, e.g. the lists of a resource class created by the
+    ResourceInstanceFactory, which are converted to ListNode instances only if they are used
+    """
+
+    def __init__(self, compute: Callable[[], Any]):
+        self._compute = compute
+
+    def __get__(self, instance: Any, owner: Type) -> Any:
+        return self._compute()
+
+
 @strict
 class ResourceInstanceFactory:
+    """
+    Creates the python classes for the resource classes of the ontologies of a project.
+
+    The project, its lists and the ontologies of the project and of the shared project ("0000") are read
+    from the server with concurrent requests. Optionally, the downloaded lists and ontologies are stored in a
+    snapshot file. At the next start, the snapshot is used instead of downloading them again, if the last
+    modification dates of all ontologies and the set of lists are unchanged (this needs only the cheap
+    metadata requests). If an OntologyCache is set as default, the ontologies are read through it and
+    the parsed ontologies are taken from the cache.
+    """
     _con: Connection
     _project: Project
-    _lists = List[ListNode]
+    _lists = List[CompactList]
+    _listnodes = Optional[List[ListNode]]
+    _listindex: ListIndex
     _ontologies = Dict[str, Ontology]
     _ontoname2iri = Dict[str, str]
     _context: Context
+    _index: OntologyIndex
+    _resclasses: Dict[str, Type]
+    _errors: Dict[str, str]
+    _jobs: int
+    SNAPSHOT_VERSION = 1
 
     def __init__(self,
                  con: Connection,
-                 projident: str):
+                 projident: str,
+                 snapshot: Optional[str] = None,
+                 jobs: int = 8):
+        """
+        :param con: Connection instance
+        :param projident: Shortcode, shortname or IRI of the project
+        :param snapshot: Path of the snapshot file of the lists and ontologies. It is created if it does
+                         not exist or is outdated [default: None, no snapshot]
+        :param jobs: Number of concurrent requests [default: 8]
+        """
         self._con = con
+        self._jobs = jobs
+        self._resclasses = {}
+        self._errors = {}
         if re.match("^[0-9aAbBcCdDeEfF]{4}$", projident):
             project = Project(con=self._con, shortcode=projident)
         elif re.match("^[\\w-]+$", projident):
@@ -264,77 +615,175 @@ class ResourceInstanceFactory:
             project = Project(con=self._con, shortname=projident)
         else:
             raise BaseError("Invalid project identification!")
-        self._project = project.read()
 
-        tmp = ListNode.getAllLists(con=self._con, project_iri=self._project.id)
-        self._lists = []
-        for rnode in tmp:
-            self._lists.append(rnode.getAllNodes())
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='ResourceInstanceFactory') as executor:
+            #
+            # first the metadata: project, lists and ontologies of the project and of the shared project
+            #
+            shared_project = executor.submit(Project(con=self._con, shortcode="0000").read)
+            self._project = project.read()
+            rootnodes = executor.submit(ListNode.getAllLists, con=self._con, project_iri=self._project.id)
+            ontologies = executor.submit(Ontology.getProjectOntologies, con, self._project.id)
+            shared_ontologies = Ontology.getProjectOntologies(con, shared_project.result().id)
+            tmp_ontologies = ontologies.result() + shared_ontologies
+            list_ids = [rnode.id for rnode in rootnodes.result()]
+
+            #
+            # then the complete lists and ontologies, either from the snapshot or from the server
+            #
+            lmds = {x.id: str(x.lastModificationDate) if x.lastModificationDate is not None else None
+                    for x in tmp_ontologies}
+            cache = OntologyCache.get_default()
+            data = self.__read_snapshot(snapshot, lmds, list_ids) if snapshot else None
+            parsed: Dict[str, Future] = {}
+            if data is None:
+                list_futures = {iri: executor.submit(con.get, '/admin/lists/' + quote_plus(iri)) for iri in list_ids}
+                if cache is not None and not snapshot:
+                    # the pre-parsed ontologies, the JSON-LD is only read if the cached parse is outdated
+                    parsed = {x.id: executor.submit(cache.get, con, self.__ontology_path(x.id),
+                                                    lambda result: Ontology.fromJsonObj(con, result), lmds[x.id])
+                              for x in tmp_ontologies if lmds[x.id] is not None}
+                if cache is not None:
+                    onto_futures = {x.id: executor.submit(cache.get_jsonld, con, self.__ontology_path(x.id), lmds[x.id])
+                                    for x in tmp_ontologies if x.id not in parsed}
+                else:
+                    onto_futures = {x.id: executor.submit(con.get, self.__ontology_path(x.id)) for x in tmp_ontologies}
+                data = {
+                    'version': self.SNAPSHOT_VERSION,
+                    'server': con.server,
+                    'project': self._project.id,
+                    'lists': {iri: future.result() for iri, future in list_futures.items()},
+                    'ontologies': {iri: {'lastModificationDate': lmds[iri], 'jsonld': future.result()}
+                                   for iri, future in onto_futures.items()}
+                }
+                if snapshot:
+                    self.__write_snapshot(snapshot, data)
 
-        tmp_ontologies = Ontology.getProjectOntologies(con, self._project.id)
-        shared_project = Project(con=self._con, shortcode="0000").read()
-        shared_ontologies = Ontology.getProjectOntologies(con, shared_project.id)
-        tmp_ontologies.extend(shared_ontologies)
-        self._ontoname2iri = {x.name: x.id for x in tmp_ontologies}
+        self._lists = [CompactList.fromJsonObj(data['lists'][iri]) for iri in list_ids]
+        self._listnodes = None
+        self._listindex = ListIndex(self._lists)
 
-        ontology_ids = [x.id for x in tmp_ontologies]
+        self._ontoname2iri = {x.name: x.id for x in tmp_ontologies}
         self._ontologies = {}
-        self._properties = {}
         self._context = {}
-        for onto in ontology_ids:
-            oparts = onto.split("/")
-            name = oparts[len(oparts) - 2]
-            shortcode = oparts[len(oparts) - 3]
-            self._ontologies[name] = Ontology.getOntologyFromServer(con=con, shortcode=shortcode, name=name)
-            self._properties.update({name + ':' + x.name: x for x in self._ontologies[name].property_classes})
+        for onto in tmp_ontologies:
+            name = onto.id.split("/")[-2]
+            if onto.id in parsed:
+                self._ontologies[name] = parsed[onto.id].result()
+            elif cache is not None and lmds[onto.id] is not None:
+                # the pre-parsed ontology, the JSON-LD has just been cached if it was outdated
+                self._ontologies[name] = cache.get(con, self.__ontology_path(onto.id),
+                                                   lambda result: Ontology.fromJsonObj(con, result), lmds[onto.id])
+            else:
+                self._ontologies[name] = Ontology.fromJsonObj(con, data['ontologies'][onto.id]['jsonld'])
             self._context.update(self._ontologies[name].context)
+        self._index = OntologyIndex(self._ontologies)
+        for name in self._index.classes:
+            try:
+                self._resclasses[name] = self.__make_resclass(name)
+            except BaseError as err:
+                # e.g. a property of another ontology, only this class is unusable
+                self._errors[name] = err.message
+
+    @staticmethod
+    def __ontology_path(onto_iri: str) -> str:
+        oparts = onto_iri.split("/")
+        return "/ontology/" + oparts[-3] + "/" + oparts[-2] + "/v2"
+
+    def __read_snapshot(self, path: str, lmds: Dict[str, Optional[str]], list_ids: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot file, if it exists and is up to date
+
+        :param path: Path of the snapshot file
+        :param lmds: The current last modification dates of the ontologies (ontology IRI -> date)
+        :param list_ids: The IRI's of the current lists
+        :return: The content of the snapshot or None
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.SNAPSHOT_VERSION or data.get('server') != self._con.server or \
+                data.get('project') != self._project.id:
+            return None
+        if set(data.get('lists', {})) != set(list_ids):
+            return None
+        ontologies = data.get('ontologies', {})
+        if set(ontologies) != set(lmds):
+            return None
+        for iri, lmd in lmds.items():
+            if lmd is None or ontologies[iri].get('lastModificationDate') != lmd:
+                return None
+        return data
+
+    @staticmethod
+    def __write_snapshot(path: str, data: Dict[str, Any]) -> None:
+        tmppath = path + '.tmp'
+        with open(tmppath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmppath, path)
 
     @property
     def lists(self) -> List[ListNode]:
+        """
+        The lists of the project as ListNode instances, converted from the compact lists on first access
+        """
+        if self._listnodes is None:
+            self._listnodes = [lst.toListNode(self._con) for lst in self._lists]
+        return self._listnodes
+
+    @property
+    def compact_lists(self) -> List[CompactList]:
         return self._lists
 
+    @property
+    def listindex(self) -> ListIndex:
+        return self._listindex
+
+    @property
+    def context(self) -> Dict[str, OntoInfo]:
+        """
+        The prefixes of the ontologies of the project and the shared project (prefix -> OntoInfo)
+        """
+        return self._context
+
+    @property
+    def index(self) -> OntologyIndex:
+        """
+        The index of the resource classes and properties of the ontologies with their hierarchies
+        """
+        return self._index
+
     def get_resclass_names(self) -> List[str]:
-        resclass_names: List[str] = []
-        for name, onto in self._ontologies.items():
-            for resclass in onto.resource_classes:
-                resclass_names.append(onto.context.get_prefixed_iri(resclass.id))
-        return resclass_names
-
-    def _get_baseclass(self, superclasses: List[str]) -> Union[str, None]:
-        for sc in superclasses:
-            ontoname, classname = sc.split(':')
-            if ontoname == 'knora-api':
-                return classname
-            o = self._ontologies.get(ontoname)
-            if o is None:
-                continue
-            gaga = [x for x in o.resource_classes if x.name == classname][0]
-            return self._get_baseclass(gaga.superclasses)
-        return None
+        return list(self._index.classes)
 
     def get_resclass(self, prefixedresclass: str) -> Type:
-        prefix, resclass_name = prefixedresclass.split(':')
-        resclass = [x for x in self._ontologies[prefix].resource_classes if x.name == resclass_name][0]
-        baseclass = self._get_baseclass(resclass.superclasses)
+        """
+        The Python class of a resource class of the project. The classes of all resource classes are
+        created once by the constructor (each with its compiled encoder), the error of a class that
+        could not be created is raised here
+
+        :param prefixedresclass: Prefixed name of the resource class, e.g. "anything:Thing"
+        :return: Subclass of ResourceInstance
+        """
+        resclass = self._resclasses.get(prefixedresclass)
+        if resclass is None:
+            if prefixedresclass in self._errors:
+                raise BaseError('Resource class "{}" cannot be used: {}'.format(prefixedresclass,
+                                                                                 self._errors[prefixedresclass]))
+            raise BaseError('Resource class "{}" not found in the ontologies'.format(prefixedresclass))
+        return resclass
+
+    def __make_resclass(self, prefixedresclass: str) -> Type:
+        resclass = self._index.get_class(prefixedresclass)
+        resclass_name = resclass.name
+        baseclass = self._index.baseclass(prefixedresclass)
         props: Dict[str, Propinfo] = {}
-        switcher = {
-            'knora-api:TextValue': TextValue,
-            'knora-api:ColorValue': ColorValue,
-            'knora-api:DateValue': DateValue,
-            'knora-api:DecimalValue': DecimalValue,
-            'knora-api:GeomValue': GeomValue,
-            'knora-api:GeonameValue': GeonameValue,
-            'knora-api:IntValue': IntValue,
-            'knora-api:BooleanValue': BooleanValue,
-            'knora-api:UriValue': UriValue,
-            'knora-api:TimeValue': TimeValue,
-            'knora-api:IntervalValue': IntervalValue,
-            'knora-api:ListValue': ListValue,
-            'knora-api:LinkValue': LinkValue,
-        }
-        for propname, has_property in resclass.has_properties.items():
+        for propname, has_property in (resclass.has_properties or {}).items():
             if has_property.ptype == HasProperty.Ptype.other:
-                valtype = switcher.get(self._properties[propname].object)
+                propclass = self._index.get_property(propname)
+                valtype = get_value_type(propclass.object)
                 if valtype == LinkValue:
                     continue  # we have the Link to the LinkValue which we do not use
                 if valtype is None:
@@ -342,7 +791,7 @@ class ResourceInstanceFactory:
                     props[propname] = Propinfo(valtype=valtype,
                                                cardinality=has_property.cardinality,
                                                gui_order=has_property.gui_order,
-                                               attributes=self._properties[propname].object)
+                                               attributes=propclass.object)
                 else:
                     props[propname] = Propinfo(valtype=valtype,
                                                cardinality=has_property.cardinality,
@@ -352,6 +801,74 @@ class ResourceInstanceFactory:
                                                          'baseclass': baseclass,
                                                          'context': self._context,
                                                          'properties': props,
-                                                         'lists': self._lists})
-
-
+                                                         'lists': _LazyClassAttribute(lambda: self.lists),
+                                                         'compact_lists': self._lists,
+                                                         'listindex': self._listindex,
+                                                         'encoder': ResourceEncoder(prefixedresclass,
+                                                                                    self._project.id,
+                                                                                    self._context,
+                                                                                    props)})
+
+    def read_many(self,
+                  iris: Iterable[str],
+                  batch_size: int = 25,
+                  jobs: Optional[int] = None) -> Iterator[ResourceInstance]:
+        """
+        Read many resources. The IRI's are sent in batches as multi-resource requests
+        ("GET /v2/resources/<iri1>/<iri2>/..."), the batches are requested concurrently. The resources
+        are instances of the classes of get_resclass() and are yielded in the order of the given IRI's
+        as soon as their batch has been read. Only a bounded number of batches is read ahead.
+
+        :param iris: IRI's of the resources (any iterable, it is consumed lazily)
+        :param batch_size: Number of IRI's per request, the DSP-API limits the number of resources
+                           per request [default: 25]
+        :param jobs: Number of concurrent requests [default: the number of jobs of the factory]
+        :return: Iterator over the resource instances
+        """
+        if batch_size < 1:
+            raise BaseError("The batch size must be at least 1!")
+        jobs = jobs or self._jobs
+
+        def read_batch(batch: List[str]) -> List[Any]:
+            result = self._con.get('/v2/resources/' + '/'.join(quote_plus(iri) for iri in batch))
+            graph = result.get('@graph', [result])
+            byiri = {jsonld_obj.get('@id'): jsonld_obj for jsonld_obj in graph}
+            missing = [iri for iri in batch if iri not in byiri]
+            if missing:
+                raise BaseError("Resources not found: " + ", ".join(missing))
+            return [byiri[iri] for iri in batch]
+
+        pending: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='read_many')
+        try:
+            it = iter(iris)
+            while True:
+                batch = list(islice(it, batch_size))
+                if batch:
+                    pending.append(executor.submit(read_batch, batch))
+                if pending and (not batch or len(pending) >= 2 * jobs):
+                    yield from self.__instances(pending.popleft().result())
+                elif not batch:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def search(self, query: GravsearchQuery, prefetch: int = 1) -> Iterator[ResourceInstance]:
+        """
+        Stream the resources found by a Gravsearch query. The results are read page by page, the next
+        page(s) are requested while the caller consumes the current one, so only a bounded number of
+        pages is held in memory regardless of the number of results. Use query.count() for the number
+        of results only.
+
+        :param query: GravsearchQuery instance, e.g. GravsearchQuery("anything:Thing", factory.context)
+        :param prefetch: Number of pages requested ahead [default: 1]
+        :return: Iterator over the resource instances
+        """
+        for graph in query.pages(self._con, prefetch):
+            yield from self.__instances(graph)
+
+    def __instances(self, graph: List[Any]) -> Iterator[ResourceInstance]:
+        for jsonld_obj in graph:
+            yield self.get_resclass(jsonld_obj['@type']).fromJsonLdObj(self._con, jsonld_obj)
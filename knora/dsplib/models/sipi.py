@@ -1,10 +1,26 @@
 import requests
+from requests.adapters import HTTPAdapter
 from .helpers import BaseError
 
 class Sipi:
-    def __init__(self, sipiserver: str, token: str):
+    """
+    Uploads files to SIPI. All uploads are sent through one pooled keep-alive HTTP session, therefore
+    one Sipi instance can be shared by several upload threads.
+    """
+
+    def __init__(self, sipiserver: str, token: str, pool_maxsize: int = 10):
+        """
+        :param sipiserver: Address of the SIPI server
+        :param token: Token of the logged in user
+        :param pool_maxsize: Maximal number of keep-alive connections [default: 10]. Should be at least
+               the number of threads that share this instance.
+        """
         self.sipiserver = sipiserver
         self.token = token
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, pool_block=True)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
 
     def on_api_error(self, res):
         """
@@ -20,11 +36,19 @@ class Sipi:
             raise BaseError("SIPI-ERROR: API error: " + res.error)
 
     def upload_image(self, filepath):
-        files = {
-            'file': (filepath, open(filepath, 'rb')),
-        }
-        req = requests.post(self.sipiserver + "/upload?token=" + self.token,
-                            files=files)
+        with open(filepath, 'rb') as bitstream:
+            files = {
+                'file': (filepath, bitstream),
+            }
+            req = self._session.post(self.sipiserver + "/upload?token=" + self.token,
+                                     files=files)
         self.on_api_error(req)
         res = req.json()
         return res
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections
+        :return: None
+        """
+        self._session.close()
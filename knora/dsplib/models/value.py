@@ -2,7 +2,7 @@ import json
 import re
 
 from pystrict import strict
-from typing import List, Set, Dict, Tuple, Optional, Any, Union, Type
+from typing import List, Set, Dict, Tuple, Optional, Any, Union, Type, NamedTuple, Callable, Iterable
 from rfc3987 import parse
 from pprint import pprint
 
@@ -12,7 +12,19 @@ from .langstring import LangString
 from .connection import Connection
 from .permission import PermissionValue, PermissionsIterator, Permissions
 
-from .listnode import ListNode
+from .listnode import ListNode, ListIndex
+
+#
+# the patterns used to validate the values, compiled once
+#
+_color_regexp = re.compile('^#(?:[0-9a-fA-F]{3}){1,2}$')
+_date_regexp = re.compile(
+    '(GREGORIAN:|JULIAN:)?(CE:|BCE:)?(\\d{4})?(-\\d{1,2})?(-\\d{1,2})?(:CE|:BCE)?(:\\d{4})?(-\\d{1,2})?(-\\d{1,2})?')
+_decimal_regexp = re.compile('^[-+]?[0-9]*\\.?[0-9]+([eE][-+]?[0-9]+)?$')
+_int_regexp = re.compile('^[-+]?[0-9]+$')
+_iri_regexp = re.compile("^(http)s?://([\\w\\.\\-~]+)?(:\\d{,6})?(/[\\w\\-~]+)*(#[\\w\\-~]*)?")
+_time_regexp = re.compile(
+    "^([+-])?(\\d{4}-[0-1]\\d-[0-3]\\dT[0-2]\\d:[0-5]\\d:[0-5]\\d)(.\\d+)?(Z|[+-][0-2]\\d:[0-5]\\d)$")
 
 
 @strict
@@ -38,6 +50,27 @@ class KnoraStandoffXml:
         self.__xmlstr = self.__xmlstr.replace(fromStr, toStr)
 
 
+@strict
+class ColumnError(BaseError):
+    """
+    The invalid rows of a column given to from_column()
+    """
+    _errors: List[Tuple[int, str]]
+
+    def __init__(self, errors: List[Tuple[int, str]]) -> None:
+        """
+        :param errors: List of (row index, error message)
+        """
+        super().__init__("Invalid values in {} rows: ".format(len(errors)) +
+                         "; ".join("row {}: {}".format(row, message) for row, message in errors[:10]) +
+                         ("; ..." if len(errors) > 10 else ""))
+        self._errors = errors
+
+    @property
+    def errors(self) -> List[Tuple[int, str]]:
+        return self._errors
+
+
 @strict
 class Value:
     _iri: Union[str, None]
@@ -111,23 +144,24 @@ class Value:
             pass
         return tmp
 
+    # conversion of the typed literals of the JSON-LD ("@type" -> python type)
+    _typed_literals: Dict[str, Callable[[Any], Union[str, int, float, bool]]] = {
+        "xsd:decimal": float,
+        "xsd:integer": int,
+        "xsd:boolean": bool,
+        "xsd:anyURI": str,
+        "xsd:dateTimeStamp": str,
+    }
+
     @staticmethod
     def get_typed_value(key: str, jsonld_obj: Any) -> Union[str, float]:
         try:
             tmp = jsonld_obj[key]
-            if tmp.get("@type") == "xsd:decimal":
-                result = float(tmp["@value"])
-            elif tmp.get("@type") == "xsd:integer":
-                result = int(tmp["@value"])
-            elif tmp.get("@type") == "xsd:boolean":
-                result = bool(tmp["@value"])
-            elif tmp.get("@type") == "xsd:anyURI":
-                result = str(tmp["@value"])
-            elif tmp.get("@type") == "xsd:dateTimeStamp":
-                result = str(tmp["@value"])
-            elif tmp.get("@id") is not None:
-                result = tmp["@id"]
-            else:
+            convert = Value._typed_literals.get(tmp.get("@type"))
+            if convert is not None:
+                return convert(tmp["@value"])
+            result = tmp.get("@id")
+            if result is None:
                 raise BaseError("Invalid data type in JSON-LD: \"{}\"!".format(tmp["@type"]))
             return result
         except KeyError as kerr:
@@ -145,6 +179,48 @@ class Value:
             'upermission': PermissionValue[jsonld_obj.get("knora-api:userHasPermission", jsonld_obj)]
         }
 
+    @classmethod
+    def from_column(cls, column: Iterable[Any], **kwargs: Any) -> List['Value']:
+        """
+        Create the values of a column (e.g. of a table), one value per row. All rows are validated before
+        an error is raised, the ColumnError reports the invalid rows by their index.
+
+        :param column: The values of the rows, as accepted by the constructor
+        :param kwargs: Further arguments of the constructor for all values, e.g. permissions
+        :return: List of the values in the order of the rows
+        """
+        values: List[Value] = []
+        errors: List[Tuple[int, str]] = []
+        for row, cell in enumerate(column):
+            try:
+                values.append(cls(cell, **kwargs))
+            except BaseError as err:
+                errors.append((row, err.message))
+            except (TypeError, ValueError) as err:
+                errors.append((row, str(err)))
+        if errors:
+            raise ColumnError(errors)
+        return values
+
+    @classmethod
+    def _from_validated(cls,
+                        rows: Iterable[Dict[str, Any]],
+                        comment: Optional[LangString],
+                        permissions: Optional[Permissions]) -> List['Value']:
+        #
+        # the rows of a column are validated and converted already, the instances are created without
+        # running the validation of the constructor again for every row
+        #
+        common = {'_iri': None, '_comment': comment, '_permissions': permissions, '_upermission': None,
+                  '_ark_url': None, '_vark_url': None}
+        values = []
+        for attrs in rows:
+            value = cls.__new__(cls)
+            value.__dict__.update(common)
+            value.__dict__.update(attrs)
+            values.append(value)
+        return values
+
 
 @strict
 class TextValue(Value):
@@ -223,7 +299,7 @@ class ColorValue(Value):
         #
         # a color value as used in HTML (e.g. "#aaccff"
         #
-        m = re.match('^#(?:[0-9a-fA-F]{3}){1,2}$', str(value))
+        m = _color_regexp.match(str(value))
         if not m:
             raise BaseError("Invalid ColorValue format! " + str(value))
         self._value = str(value)
@@ -257,6 +333,21 @@ class ColorValue(Value):
         return self._value + ' ' + super().__str__()
 
 
+class DateComponents(NamedTuple):
+    """
+    The parts of a date value as given in the JSON-LD of DSP-API
+    """
+    calendar: str
+    e1: str
+    y1: Optional[int]
+    m1: Optional[int]
+    d1: Optional[int]
+    e2: str
+    y2: Optional[int]
+    m2: Optional[int]
+    d2: Optional[int]
+
+
 @strict
 class DateValue(Value):
     _calendar: str
@@ -269,49 +360,28 @@ class DateValue(Value):
     _m2: int
     _d2: int
 
+    # the attributes that hold the parts of the date, in the order of DateComponents
+    _attrs = ('_calendar', '_e1', '_y1', '_m1', '_d1', '_e2', '_y2', '_m2', '_d2')
+
     def __init__(self,
-                 value: str,
+                 value: Optional[str] = None,
                  comment: Optional[LangString] = None,
                  permissions: Optional[Permissions] = None,
                  upermission: Optional[PermissionValue] = None,
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
-                 vark_url: Optional[str] = None):
-        #
-        # A knora date value
-        #
-        m = re.match(
-            '(GREGORIAN:|JULIAN:)?(CE:|BCE:)?(\\d{4})?(-\\d{1,2})?(-\\d{1,2})?(:CE|:BCE)?(:\\d{4})?(-\\d{1,2})?(-\\d{1,2})?',
-            str(value))
-        if not m:
-            raise BaseError("Invalid date format: \"{}\"!".format(str(value)))
-        dp = m.groups()
-        self._calendar = 'GREGORIAN' if dp[0] is None else dp[0].strip('-: ')
-        self._e1 = 'CE' if dp[1] is None else dp[1].strip('-: ')
-        self._y1 = None if dp[2] is None else int(dp[2].strip('-: '))
-        self._m1 = None if dp[3] is None else int(dp[3].strip('-: '))
-        self._d1 = None if dp[4] is None else int(dp[4].strip('-: '))
-        self._e2 = 'CE' if dp[5] is None else dp[5].strip('-: ')
-        self._y2 = None if dp[6] is None else int(dp[6].strip('-: '))
-        self._m2 = None if dp[7] is None else int(dp[7].strip('-: '))
-        self._d2 = None if dp[8] is None else int(dp[8].strip('-: '))
-        if self._y1 is None:
-            raise BaseError("Invalid date format! " + str(value))
-        if self._y2 is not None:
-            date1 = self._y1 * 10000
-            if self._m1 is not None:
-                date1 += self._m1 * 100
-            if self._d1 is not None:
-                date1 += self._d1
-            date2 = self._y2 * 10000
-            if self._m2 is not None:
-                date2 += self._m2 * 100
-            if self._d2 is not None:
-                date2 += self._d2
-            if date1 > date2:
-                self._y1, self._y2 = self._y2, self._y1
-                self._m1, self._m2 = self._m2, self._m1
-                self._d1, self._d2 = self._d2, self._d1
+                 vark_url: Optional[str] = None,
+                 components: Optional[DateComponents] = None):
+        """
+        :param value: The date as string, e.g. "GREGORIAN:CE:2014-01-31:CE:2014-02-01"
+        :param components: The parts of the date instead of the string (used for the JSON-LD of DSP-API)
+        """
+        if components is None:
+            if value is None:
+                raise BaseError("\"value\" or \"components\" must be given to constructor!")
+            components = self.parse(value)
+        self._calendar, self._e1, self._y1, self._m1, self._d1, self._e2, self._y2, self._m2, self._d2 = \
+            self.normalize(components, value)
         super().__init__(iri=iri,
                          comment=comment,
                          permissions=permissions,
@@ -323,30 +393,98 @@ class DateValue(Value):
     def value(self) -> str:
         return self._value
 
+    @staticmethod
+    def parse(value: str) -> DateComponents:
+        """
+        Split a date string into its parts
+
+        :param value: The date as string, e.g. "GREGORIAN:CE:2014-01-31:CE:2014-02-01"
+        :return: The parts of the date
+        """
+        m = _date_regexp.match(str(value))
+        if not m:
+            raise BaseError("Invalid date format: \"{}\"!".format(str(value)))
+        dp = m.groups()
+        return DateComponents('GREGORIAN' if dp[0] is None else dp[0].strip('-: '),
+                              'CE' if dp[1] is None else dp[1].strip('-: '),
+                              None if dp[2] is None else int(dp[2].strip('-: ')),
+                              None if dp[3] is None else int(dp[3].strip('-: ')),
+                              None if dp[4] is None else int(dp[4].strip('-: ')),
+                              'CE' if dp[5] is None else dp[5].strip('-: '),
+                              None if dp[6] is None else int(dp[6].strip('-: ')),
+                              None if dp[7] is None else int(dp[7].strip('-: ')),
+                              None if dp[8] is None else int(dp[8].strip('-: ')))
+
+    @staticmethod
+    def normalize(components: DateComponents, value: Optional[str] = None) -> DateComponents:
+        """
+        Check the parts of a date and order start and end
+
+        :param components: The parts of the date
+        :param value: The date string the parts are taken from (for the error message)
+        :return: The parts of the date with the start before the end
+        """
+        calendar, e1, y1, m1, d1, e2, y2, m2, d2 = components
+        if y1 is None:
+            raise BaseError("Invalid date format! " + str(value if value is not None else components))
+        if y2 is not None:
+            date1 = y1 * 10000
+            if m1 is not None:
+                date1 += m1 * 100
+            if d1 is not None:
+                date1 += d1
+            date2 = y2 * 10000
+            if m2 is not None:
+                date2 += m2 * 100
+            if d2 is not None:
+                date2 += d2
+            if date1 > date2:
+                return DateComponents(calendar, e1, y2, m2, d2, e2, y1, m1, d1)
+        return components
+
+    @classmethod
+    def from_column(cls,
+                    column: Iterable[str],
+                    comment: Optional[LangString] = None,
+                    permissions: Optional[Permissions] = None) -> List['DateValue']:
+        """
+        Create the date values of a column, see Value.from_column(). Every distinct date string is parsed only once.
+
+        :param column: The dates of the rows as strings, e.g. "GREGORIAN:CE:2014-01-31:CE:2014-02-01"
+        :param comment: Comment of all values [default: None]
+        :param permissions: Permissions of all values [default: None]
+        :return: List of the values in the order of the rows
+        """
+        parsed: Dict[str, Dict[str, Any]] = {}
+        rows: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        for row, cell in enumerate(column):
+            attrs = parsed.get(cell)
+            if attrs is None:
+                try:
+                    attrs = dict(zip(cls._attrs, cls.normalize(cls.parse(cell), cell)))
+                except BaseError as err:
+                    errors.append((row, err.message))
+                    continue
+                parsed[cell] = attrs
+            rows.append(attrs)
+        if errors:
+            raise ColumnError(errors)
+        return cls._from_validated(rows, comment, permissions)
+
     @classmethod
     def fromJsonLdObj(cls, jsonld_obj: Any) -> Dict[str, Any]:
         tmp = Value.getFromJsonLd(jsonld_obj)
-
-        datestr = ""
-        datestr += jsonld_obj.get("knora-api:dateValueHasCalendar") + ":" \
-            if jsonld_obj.get("knora-api:dateValueHasCalendar") is not None else ""
-        datestr += jsonld_obj.get("knora-api:dateValueHasStartEra") + ":" \
-            if jsonld_obj.get("knora-api:dateValueHasStartEra") is not None else ""
-        datestr += str(jsonld_obj.get("knora-api:dateValueHasStartYear")) \
-            if jsonld_obj.get("knora-api:dateValueHasStartYear") is not None else ""
-        datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasStartMonth")) \
-            if jsonld_obj.get("knora-api:dateValueHasStartMonth") is not None else ""
-        datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasStartDay")) \
-            if jsonld_obj.get("knora-api:dateValueHasStartDay") is not None else ""
-        datestr += ":" + jsonld_obj.get("knora-api:dateValueHasEndEra") \
-            if jsonld_obj.get("knora-api:dateValueHasEndEra") is not None else ""
-        datestr += ":" + str(jsonld_obj.get("knora-api:dateValueHasEndYear")) \
-            if jsonld_obj.get("knora-api:dateValueHasEndYear") is not None else ""
-        datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasEndMonth")) \
-            if jsonld_obj.get("knora-api:dateValueHasEndMonth") is not None else ""
-        datestr += "-" + str(jsonld_obj.get("knora-api:dateValueHasEndDay")) \
-            if jsonld_obj.get("knora-api:dateValueHasEndDay") is not None else ""
-        tmp['value'] = datestr
+        tmp['components'] = DateComponents(
+            jsonld_obj.get("knora-api:dateValueHasCalendar") or 'GREGORIAN',
+            jsonld_obj.get("knora-api:dateValueHasStartEra") or 'CE',
+            jsonld_obj.get("knora-api:dateValueHasStartYear"),
+            jsonld_obj.get("knora-api:dateValueHasStartMonth"),
+            jsonld_obj.get("knora-api:dateValueHasStartDay"),
+            jsonld_obj.get("knora-api:dateValueHasEndEra") or 'CE',
+            jsonld_obj.get("knora-api:dateValueHasEndYear"),
+            jsonld_obj.get("knora-api:dateValueHasEndMonth"),
+            jsonld_obj.get("knora-api:dateValueHasEndDay"))
         return cls(**tmp)
 
     def toJsonLdObj(self, action: Actions) -> Dict[str, Any]:
@@ -408,19 +546,7 @@ class DecimalValue(Value):
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
-        self._value = value
-        if isinstance(value, str):
-            m = re.match('^[-+]?[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?$', value)
-            if m:
-                self._value = float(value)
-            else:
-                raise BaseError("String does not represent decimal/float number! \"" + value + "\"")
-        elif isinstance(value, float):
-            self._value = value
-        elif isinstance(value, int):
-            self._value = float(value)
-        else:
-            raise BaseError("String does not represent decimal/float number! \"" + value + "\"")
+        self._value = self._to_float(value)
         super().__init__(iri=iri,
                          comment=comment,
                          permissions=permissions,
@@ -432,6 +558,41 @@ class DecimalValue(Value):
     def value(self) -> float:
         return self._value
 
+    @staticmethod
+    def _to_float(value: Union[float, int, str]) -> float:
+        """
+        Convert a decimal given as float, int or str, the conversion of the constructor and from_column()
+        """
+        if isinstance(value, float):
+            return value
+        if isinstance(value, int) or (isinstance(value, str) and _decimal_regexp.match(value)):
+            return float(value)
+        raise BaseError("String does not represent decimal/float number! \"{}\"".format(value))
+
+    @classmethod
+    def from_column(cls,
+                    column: Iterable[Union[float, int, str]],
+                    comment: Optional[LangString] = None,
+                    permissions: Optional[Permissions] = None) -> List['DecimalValue']:
+        """
+        Create the decimal values of a column, see Value.from_column()
+
+        :param column: The numbers of the rows, as float, int or str
+        :param comment: Comment of all values [default: None]
+        :param permissions: Permissions of all values [default: None]
+        :return: List of the values in the order of the rows
+        """
+        rows: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        for row, cell in enumerate(column):
+            try:
+                rows.append({'_value': cls._to_float(cell)})
+            except BaseError as err:
+                errors.append((row, err.message))
+        if errors:
+            raise ColumnError(errors)
+        return cls._from_validated(rows, comment, permissions)
+
     @classmethod
     def fromJsonLdObj(cls, jsonld_obj: Any) -> Dict[str, Any]:
         tmp = Value.getFromJsonLd(jsonld_obj)
@@ -552,7 +713,7 @@ class IntValue(Value):
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
         if isinstance(value, str):
-            m = re.match('^[-+]?[0-9]+$', value)
+            m = _int_regexp.match(value)
             if m and m.span()[1] == len(str(value)):
                 self._value = int(value)
             else:
@@ -570,6 +731,34 @@ class IntValue(Value):
     def value(self) -> int:
         return self._value
 
+    @classmethod
+    def from_column(cls,
+                    column: Iterable[Union[int, str]],
+                    comment: Optional[LangString] = None,
+                    permissions: Optional[Permissions] = None) -> List['IntValue']:
+        """
+        Create the integer values of a column, see Value.from_column()
+
+        :param column: The integers of the rows, as int or str
+        :param comment: Comment of all values [default: None]
+        :param permissions: Permissions of all values [default: None]
+        :return: List of the values in the order of the rows
+        """
+        rows: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        for row, cell in enumerate(column):
+            if isinstance(cell, bool):
+                errors.append((row, "Boolean does not represent integer number! \"{}\"".format(cell)))
+            elif isinstance(cell, int):
+                rows.append({'_value': cell})
+            elif isinstance(cell, str) and _int_regexp.match(cell) and not cell.endswith('\n'):
+                rows.append({'_value': int(cell)})
+            else:
+                errors.append((row, "String does not represent integer number! \"{}\"".format(cell)))
+        if errors:
+            raise ColumnError(errors)
+        return cls._from_validated(rows, comment, permissions)
+
     @classmethod
     def fromJsonLdObj(cls, jsonld_obj: Any) -> Dict[str, Any]:
         tmp = Value.getFromJsonLd(jsonld_obj)
@@ -654,7 +843,7 @@ class UriValue(Value):
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
-        m = re.match("^(http)s?://([\\w\\.\\-~]+)?(:\\d{,6})?(/[\\w\\-~]+)*(#[\\w\\-~]*)?", str(value))
+        m = _iri_regexp.match(str(value))
         if m:
             self._value = str(value)
         else:
@@ -708,8 +897,7 @@ class TimeValue(Value):
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
-        m = re.match("^([+-])?(\\d{4}-[0-1]\\d-[0-3]\\dT[0-2]\\d:[0-5]\\d:[0-5]\\d)(.\\d+)?(Z|[+-][0-2]\\d:[0-5]\\d)$",
-                     str(value))
+        m = _time_regexp.match(str(value))
         if m:
             self._value = str(value)
         else:
@@ -793,9 +981,8 @@ class IntervalValue(Value):
     @classmethod
     def fromJsonLdObj(cls, jsonld_obj: Any) -> Dict[str, Any]:
         tmp = Value.getFromJsonLd(jsonld_obj)
-        start = Value.get_typed_value("knora-api:intervalValueHasStart", jsonld_obj)
-        end = Value.get_typed_value("knora-api:intervalValueHasEnd", jsonld_obj)
-        tmp['value'] = str(start) + ":" + str(end)
+        tmp['iv_start'] = Value.get_typed_value("knora-api:intervalValueHasStart", jsonld_obj)
+        tmp['iv_end'] = Value.get_typed_value("knora-api:intervalValueHasEnd", jsonld_obj)
         return cls(**tmp)
 
     def toJsonLdObj(self, action: Actions) -> Dict[str, Any]:
@@ -825,45 +1012,32 @@ class ListValue(Value):
 
     def __init__(self,
                  value: str,
-                 lists: List[ListNode] = None,
+                 lists: Union[ListIndex, List[ListNode], None] = None,
                  comment: Optional[LangString] = None,
                  permissions: Optional[Permissions] = None,
                  upermission: Optional[PermissionValue] = None,
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
-
-        def find_listnode(nodes: List[ListNode], name: str) -> Union[str, None]:
-            for node in nodes:
-                print('node.name=', node.name, '  name=', name)
-                if node.name == name:
-                    return node.id
-                else:
-                    if node.children is not None:
-                        node_id = find_listnode(node.children, name)
-                        if node_id is not None:
-                            return node_id
-            return None
-
+        """
+        :param value: IRI of the list node, or "listname:nodename" (or "listname:path/of/nodenames")
+        :param lists: Index of the list nodes (see ResourceInstanceFactory). A list of root nodes is accepted too,
+                      but then the index is built for every value.
+        """
         if IriTest.test(str(value)):
             self._value = str(value)
         else:
-            tmp = str(value).split(':')
-            if len(tmp) > 1:
-                if tmp[0]:
-                    listname = tmp[0]
-                    nodename = tmp[1]
-                else:
-                    raise BaseError("Invalid list node: \"" + str(value) + "\" !")
+            tmp = str(value).split(':', 1)
+            if len(tmp) > 1 and tmp[0] and tmp[1]:
+                listname = tmp[0]
+                nodename = tmp[1]
             else:
                 raise BaseError("Invalid list node: \"" + str(value) + "\" !")
             if lists is None:
                 raise BaseError("Lists from ResourceInstanceFactory must be provided!")
-            node_iri = None
-            for list in lists:
-                if list.name == listname:
-                    node_iri = find_listnode(list.children, nodename)
-                    print('=====>', node_iri)
+            if not isinstance(lists, ListIndex):
+                lists = ListIndex(lists)
+            node_iri = lists.get(listname, nodename)
             if node_iri is not None:
                 self._value = node_iri
             else:
@@ -920,7 +1094,7 @@ class LinkValue(Value):
                  iri: Optional[str] = None,
                  ark_url: Optional[str] = None,
                  vark_url: Optional[str] = None):
-        m = re.match("^(http)s?://([\\w\\.\\-~]+)?(:\\d{,6})?(/[\\w\\-~]+)*(#[\\w\\-~]*)?", str(value))
+        m = _iri_regexp.match(str(value))
         if m:
             self._value = str(value)
         else:
@@ -971,23 +1145,51 @@ class LinkValue(Value):
         return self._value + ' ' + super().__str__()
 
 
+#
+# the value classes by the value type of the JSON-LD, see register_value_type()
+#
+_value_types: Dict[str, Type[Value]] = {
+    'knora-api:TextValue': TextValue,
+    'knora-api:ColorValue': ColorValue,
+    'knora-api:DateValue': DateValue,
+    'knora-api:DecimalValue': DecimalValue,
+    'knora-api:GeomValue': GeomValue,
+    'knora-api:GeonameValue': GeonameValue,
+    'knora-api:IntValue': IntValue,
+    'knora-api:BooleanValue': BooleanValue,
+    'knora-api:UriValue': UriValue,
+    'knora-api:TimeValue': TimeValue,
+    'knora-api:IntervalValue': IntervalValue,
+    'knora-api:ListValue': ListValue,
+    'knora-api:LinkValue': LinkValue,
+}
+
+
+def register_value_type(jsonld_type: str, valtype: Type[Value]) -> None:
+    """
+    Register the class of a value type. The class must implement the class method fromJsonLdObj(jsonld_obj).
+    The values of this type are then decoded by fromJsonLdObj() and the properties with this object type
+    get this class in the resource classes of ResourceInstanceFactory.
+
+    :param jsonld_type: Prefixed value type, e.g. "knora-api:TextValue"
+    :param valtype: Subclass of Value
+    :return: None
+    """
+    _value_types[jsonld_type] = valtype
+
+
+def get_value_type(jsonld_type: str) -> Optional[Type[Value]]:
+    """
+    The class of a value type
+
+    :param jsonld_type: Prefixed value type, e.g. "knora-api:TextValue"
+    :return: Subclass of Value or None, if the value type is not registered
+    """
+    return _value_types.get(jsonld_type)
+
+
 def fromJsonLdObj(jsonld_obj: str) -> Value:
-    switcher = {
-        'knora-api:TextValue': TextValue,
-        'knora-api:ColorValue': ColorValue,
-        'knora-api:DateValue': DateValue,
-        'knora-api:DecimalValue': DecimalValue,
-        'knora-api:GeomValue': GeomValue,
-        'knora-api:GeonameValue': GeonameValue,
-        'knora-api:IntValue': IntValue,
-        'knora-api:BooleanValue': BooleanValue,
-        'knora-api:UriValue': UriValue,
-        'knora-api:TimeValue': TimeValue,
-        'knora-api:IntervalValue': IntervalValue,
-        'knora-api:ListValue': ListValue,
-        'knora-api:LinkValue': LinkValue,
-    }
-    return switcher[jsonld_obj.get('@type')].fromJsonLdObj(jsonld_obj)
+    return _value_types[jsonld_obj.get('@type')].fromJsonLdObj(jsonld_obj)
 
 
 def make_value(value: Value,
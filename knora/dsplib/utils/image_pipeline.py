@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Dict, Tuple, Callable, Iterable
+
+from ..models.helpers import BaseError
+
+"""
+This module implements the pipelined upload of the images of a bulk upload to SIPI. A feeder thread hands
+the images over to a pool of upload workers in the order the resources will be created, ahead of the
+creation of the resources. For each image a Future is returned that resolves to the internal filename
+in SIPI, the resource can be created as soon as it is resolved. The images are either given all at once
+to start(), or one after the other to submit().
+
+Two limits apply:
+
+- At most ``queue_size`` images are uploaded ahead, that is, uploaded or in flight but not yet consumed
+  by the creation of their resource (see ``done()``). This gives backpressure if the creation of the
+  resources is slower than the upload, and avoids that temporary files in SIPI expire before they are used.
+- The sum of the sizes of the files in flight is limited by ``max_bytes``. A single file that is larger
+  than the budget is uploaded alone.
+"""
+
+
+class ImagePipeline:
+    """
+    Uploads images concurrently with a pool of workers, ahead of the consumers of the internal filenames
+    """
+    _upload: Callable[[str], str]
+    _workers: int
+    _queue_size: int
+    _max_bytes: int
+    _pending: queue.Queue
+    _queue: queue.Queue
+    _ahead: threading.Semaphore
+    _budget: threading.Condition
+    _bytes_in_flight: int
+    _stopped: threading.Event
+    _threads: List[threading.Thread]
+    _futures: Dict[str, Future]
+
+    def __init__(self,
+                 upload: Callable[[str], str],
+                 workers: int = 4,
+                 queue_size: int = 16,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        :param upload: Function that uploads the file with the given path and returns the internal filename.
+                       It is called by the worker threads.
+        :param workers: Number of concurrent uploads [default: 4]
+        :param queue_size: Maximal number of images uploaded ahead of their consumers [default: 16]
+        :param max_bytes: Maximal number of bytes in flight [default: 256 MB]
+        """
+        if workers < 1 or queue_size < 1 or max_bytes < 1:
+            raise BaseError("The number of workers, the queue size and the byte budget must be at least 1!")
+        self._upload = upload
+        self._workers = workers
+        self._queue_size = queue_size
+        self._max_bytes = max_bytes
+        self._pending = queue.Queue()
+        self._queue = queue.Queue(maxsize=workers)
+        self._ahead = threading.Semaphore(queue_size)
+        self._budget = threading.Condition()
+        self._bytes_in_flight = 0
+        self._stopped = threading.Event()
+        self._threads = []
+        self._futures = {}
+
+    @property
+    def bytes_in_flight(self) -> int:
+        with self._budget:
+            return self._bytes_in_flight
+
+    def start(self, images: Iterable[Tuple[str, str]] = ()) -> Dict[str, Future]:
+        """
+        Start the upload of the images
+
+        :param images: (key, path) of the images in the order they are needed, the key is e.g. the resource id.
+                       More images can be added with submit().
+        :return: Dict of key -> Future resolving to the internal filename
+        """
+        self._threads.append(threading.Thread(target=self.__feed, name='ImagePipeline-feeder', daemon=True))
+        for i in range(self._workers):
+            self._threads.append(threading.Thread(target=self.__work, name='ImagePipeline-{}'.format(i), daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return {key: self.submit(key, path) for key, path in images}
+
+    def submit(self, key: str, path: str) -> Future:
+        """
+        Add an image to the end of the pipeline
+
+        :param key: The key of the image, e.g. the resource id
+        :param path: Path of the image file
+        :return: Future resolving to the internal filename
+        """
+        future = Future()
+        with self._budget:
+            self._futures[key] = future
+        self._pending.put((key, path, future))
+        return future
+
+    def done(self, key: str) -> None:
+        """
+        Signal that the internal filename of the image has been consumed (or is not needed anymore). This
+        frees a place for the upload of the next image.
+
+        :param key: The key of the image as given to start() or submit()
+        :return: None
+        """
+        with self._budget:
+            if self._futures.pop(key, None) is None:
+                return
+        self._ahead.release()
+
+    def __feed(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            self._ahead.acquire()
+            if self._stopped.is_set():
+                break
+            self._queue.put(item)
+        for i in range(self._workers):
+            self._queue.put(None)
+
+    def __work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            key, path, future = item
+            if self._stopped.is_set() or not future.set_running_or_notify_cancel():
+                self.done(key)
+                continue
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            with self._budget:
+                while self._bytes_in_flight > 0 and self._bytes_in_flight + size > self._max_bytes:
+                    self._budget.wait()
+                self._bytes_in_flight += size
+            try:
+                future.set_result(self._upload(path))
+            except BaseException as err:
+                future.set_exception(err)
+            finally:
+                with self._budget:
+                    self._bytes_in_flight -= size
+                    self._budget.notify_all()
+
+    def close(self) -> None:
+        """
+        Stop the pipeline. Images not yet uploaded are cancelled, running uploads are finished.
+        :return: None
+        """
+        self._stopped.set()
+        with self._budget:
+            futures = list(self._futures.values())
+        for future in futures:
+            future.cancel()
+        self._pending.put(None)
+        self._ahead.release()  # wake up the feeder
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> 'ImagePipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
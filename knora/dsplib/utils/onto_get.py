@@ -39,12 +39,12 @@ def get_ontology(projident: str, outfile: str, server: str, user: str, password:
     projectobj["ontologies"] = []
     prefixes: Dict[str, str] = {}
     ontologies = Ontology.getProjectOntologies(con, project.id)
-    ontology_ids = [x.id for x in ontologies]
-    for ontology in ontology_ids:
-        oparts = ontology.split("/")
+    for ontology in ontologies:
+        oparts = ontology.id.split("/")
         name = oparts[len(oparts) - 2]
         shortcode = oparts[len(oparts) - 3]
-        ontology = Ontology.getOntologyFromServer(con=con, shortcode=shortcode, name=name)
+        ontology = Ontology.getOntologyFromServer(con=con, shortcode=shortcode, name=name,
+                                                  lastModificationDate=ontology.lastModificationDate)
         projectobj["ontologies"].append(ontology.createDefinitionFileObj())
         prefixes.update(ontology.context.get_externals_used())
 
@@ -0,0 +1,202 @@
+from collections import deque
+from typing import List, Set, Dict, Tuple, Optional, Any, Callable, Deque
+
+from ..models.helpers import BaseError, IriTest
+
+"""
+This module implements the reference graph between the resources of a bulk upload. The graph is built once
+with index based adjacency lists: each resource gets an integer index, and for each resource the indices of
+the referenced resources (resptr-props and standoff links) and of the referencing resources are stored.
+
+The topological sort (Kahn's algorithm) is O(resources + references). If the references cannot be resolved,
+a single ResourceGraphError reports all reference cycles and all dangling references at once.
+"""
+
+
+class ResourceGraphError(BaseError):
+    """
+    Error raised if the references of the resources cannot be resolved. It holds the complete report.
+    """
+    cycles: List[List[str]]
+    dangling: Dict[str, List[str]]
+
+    def __init__(self, cycles: List[List[str]], dangling: Dict[str, List[str]]):
+        """
+        :param cycles: List of reference cycles, each given as list of resource id's
+        :param dangling: Dict of resource id -> references that are neither a resource id nor an IRI
+        """
+        lines = ["Cannot resolve resptr dependencies"]
+        for cycle in cycles:
+            lines.append("Reference cycle: " + " -> ".join(cycle + [cycle[0]]))
+        for resid, refs in dangling.items():
+            lines.append("Resource {} has dangling references to: {}".format(resid, ", ".join(refs)))
+        super().__init__("\n".join(lines))
+        self.cycles = cycles
+        self.dangling = dangling
+
+
+class ResourceGraph:
+    """
+    The reference graph of a list of resources. References to id's that are not part of the list are
+    ignored if they are valid IRI's (references to existing resources), otherwise they are dangling.
+    """
+    _resources: List[Any]
+    _ids: List[str]
+    _index: Dict[str, int]
+    _refs: List[List[int]]
+    _dependents: List[List[int]]
+    _dangling: Dict[str, List[str]]
+
+    def __init__(self, resources: List[Any], key: Callable[[Any], str] = lambda r: r.id):
+        """
+        Build the graph. The method ``get_resptrs()`` is called exactly once for each resource.
+
+        :param resources: List of resources
+        :param key: Function that returns the unique id of a resource [default: the attribute "id"]
+        """
+        self._resources = list(resources)
+        self._ids = [key(resource) for resource in self._resources]
+        self._index = {resid: i for i, resid in enumerate(self._ids)}
+        self._refs = []
+        self._dependents = [[] for i in range(len(self._resources))]
+        self._dangling = {}
+        for i, resource in enumerate(self._resources):
+            refs: List[int] = []
+            seen: Set[int] = set()
+            for ref in resource.get_resptrs():
+                j = self._index.get(ref)
+                if j is None:
+                    if not IriTest.test(ref):
+                        self._dangling.setdefault(self._ids[i], []).append(ref)
+                elif j not in seen:
+                    seen.add(j)
+                    refs.append(j)
+                    self._dependents[j].append(i)
+            self._refs.append(refs)
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    @property
+    def resources(self) -> List[Any]:
+        return self._resources
+
+    @property
+    def dangling(self) -> Dict[str, List[str]]:
+        return self._dangling
+
+    def id(self, i: int) -> str:
+        return self._ids[i]
+
+    def index(self, resid: str) -> Optional[int]:
+        return self._index.get(resid)
+
+    def refs(self, i: int) -> List[int]:
+        """
+        :param i: Index of a resource
+        :return: Indices of the resources referenced by the resource
+        """
+        return self._refs[i]
+
+    def dependents(self, i: int) -> List[int]:
+        """
+        :param i: Index of a resource
+        :return: Indices of the resources referencing the resource
+        """
+        return self._dependents[i]
+
+    def sort(self) -> List[Any]:
+        """
+        Sort the resources such that resources that reference other resources come after the referenced
+        resources. The original order is kept as far as possible.
+
+        :return: Sorted list of resources
+        """
+        indegree = [len(refs) for refs in self._refs]
+        ready: Deque[int] = deque(i for i, cnt in enumerate(indegree) if cnt == 0)
+        order: List[int] = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for j in self._dependents[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    ready.append(j)
+        cycles = self.find_cycles([i for i, cnt in enumerate(indegree) if cnt > 0]) if len(order) < len(self) else []
+        if cycles or self._dangling:
+            raise ResourceGraphError(cycles, self._dangling)
+        return [self._resources[i] for i in order]
+
+    def find_cycles(self, nodes: Optional[List[int]] = None) -> List[List[str]]:
+        """
+        Find the reference cycles. The strongly connected components are determined with an iterative
+        variant of Tarjan's algorithm, and one concrete cycle is reported for each component that contains
+        a cycle.
+
+        :param nodes: Indices of the resources to be examined [default: all]
+        :return: List of cycles, each given as list of resource id's
+        """
+        if nodes is None:
+            nodes = list(range(len(self)))
+        members = set(nodes)
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        for start in nodes:
+            if start in index:
+                continue
+            work: List[Tuple[int, int]] = [(start, 0)]
+            while work:
+                v, pos = work.pop()
+                if pos == 0:
+                    index[v] = lowlink[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack.add(v)
+                refs = self._refs[v]
+                while pos < len(refs):
+                    w = refs[pos]
+                    pos += 1
+                    if w not in members:
+                        continue
+                    if w not in index:
+                        work.append((v, pos))
+                        work.append((w, 0))
+                        break
+                    elif w in on_stack:
+                        lowlink[v] = min(lowlink[v], index[w])
+                else:
+                    if lowlink[v] == index[v]:
+                        component: List[int] = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component.append(w)
+                            if w == v:
+                                break
+                        if len(component) > 1 or v in self._refs[v]:
+                            components.append(component)
+                    if work:
+                        u = work[-1][0]
+                        lowlink[u] = min(lowlink[u], lowlink[v])
+        return [self.__cycle_in(component) for component in components]
+
+    def __cycle_in(self, component: List[int]) -> List[str]:
+        """
+        Follow the references within a strongly connected component until a resource is visited twice
+
+        :param component: Indices of the resources of the component
+        :return: The cycle as list of resource id's
+        """
+        members = set(component)
+        path: List[int] = []
+        position: Dict[int, int] = {}
+        v = min(component)
+        while v not in position:
+            position[v] = len(path)
+            path.append(v)
+            v = next(w for w in self._refs[v] if w in members)
+        return [self._ids[i] for i in path[position[v]:]]
@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+from typing import Iterator, Set, Dict, Tuple, Optional
+
+from ..models.helpers import BaseError
+
+"""
+This module implements the checkpoint journal of the bulk upload. Every completed step of the upload is
+recorded as soon as it succeeds:
+
+- the IRI of each created resource (XML id -> IRI)
+- the internal filename of each image uploaded to SIPI (image path -> internal filename)
+- the IRI of each value added in the link phase of a two-phase upload ((XML id, index) -> IRI)
+- in a streamed two-phase upload, the deferred links of each resource (XML id -> record), which are
+  read back in the link phase instead of being held in memory
+
+The journal is a SQLite database in WAL mode. A record costs one small append to the write-ahead log
+(synchronous=NORMAL), which survives a crash of the upload process. If the upload is restarted with
+resume=True, the completed steps are read back and skipped. A journal with records is only cleared with
+restart=True, otherwise it cannot be opened without resume.
+"""
+
+
+class UploadJournal:
+    """
+    A crash-safe, thread safe on-disk journal of the completed steps of an upload
+    """
+    _path: str
+    _db: sqlite3.Connection
+    _lock: threading.Lock
+    _resources: Dict[str, str]
+    _images: Dict[str, str]
+    _links: Set[Tuple[str, int]]
+
+    def __init__(self, path: str, server: str, resume: bool = False, restart: bool = False):
+        """
+        Open the journal
+
+        :param path: Path of the journal file, usually next to the XML file
+        :param server: URL of the DSP server. A journal can only be resumed with the same server
+        :param resume: If True, the records of an existing journal are kept
+        :param restart: If True, the records of an existing journal are removed. If neither resume nor restart
+                        is given, an existing journal with records is an error
+        """
+        if resume and restart:
+            raise BaseError("An upload cannot be resumed and restarted at the same time!")
+        self._path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS resources (id TEXT PRIMARY KEY, iri TEXT NOT NULL)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS images (path TEXT PRIMARY KEY, filename TEXT NOT NULL)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS links (id TEXT, idx INTEGER, iri TEXT NOT NULL, PRIMARY KEY (id, idx))')
+        self._db.execute('CREATE TABLE IF NOT EXISTS deferred (id TEXT PRIMARY KEY, record TEXT NOT NULL)')
+        if resume:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'server'").fetchone()
+            if row is not None and row[0] != server:
+                self._db.close()
+                raise BaseError("The journal \"{}\" belongs to an upload to \"{}\", not to \"{}\"!".format(
+                    path, row[0], server))
+        else:
+            if not restart and any(self._db.execute('SELECT 1 FROM {} LIMIT 1'.format(table)).fetchone()
+                                   for table in ('resources', 'images', 'links', 'deferred')):
+                self._db.close()
+                raise BaseError("The journal \"{}\" of a previous upload exists, resume or restart the upload!".format(
+                    path))
+            for table in ('meta', 'resources', 'images', 'links', 'deferred'):
+                self._db.execute('DELETE FROM {}'.format(table))
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('server', ?)", (server,))
+        self._resources = dict(self._db.execute('SELECT id, iri FROM resources'))
+        self._images = dict(self._db.execute('SELECT path, filename FROM images'))
+        self._links = set(self._db.execute('SELECT id, idx FROM links'))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def resources(self) -> Dict[str, str]:
+        """
+        The resources created so far as dict of XML id -> IRI
+        """
+        with self._lock:
+            return dict(self._resources)
+
+    def add_resource(self, resid: str, iri: str) -> None:
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO resources (id, iri) VALUES (?, ?)', (resid, iri))
+            self._resources[resid] = iri
+
+    def get_image(self, path: str) -> Optional[str]:
+        """
+        :param path: Path of the image file as given in the XML file
+        :return: The internal filename in SIPI, if the image has been uploaded already, else None
+        """
+        with self._lock:
+            return self._images.get(path)
+
+    def add_image(self, path: str, filename: str) -> None:
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO images (path, filename) VALUES (?, ?)', (path, filename))
+            self._images[path] = filename
+
+    def has_link(self, resid: str, index: int) -> bool:
+        """
+        :param resid: XML id of the resource
+        :param index: Index of the value within the deferred links of the resource
+        :return: True, if the value has been added already
+        """
+        with self._lock:
+            return (resid, index) in self._links
+
+    def add_link(self, resid: str, index: int, iri: str) -> None:
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO links (id, idx, iri) VALUES (?, ?, ?)', (resid, index, iri))
+            self._links.add((resid, index))
+
+    def add_deferred_links(self, resid: str, record: str) -> None:
+        """
+        Record the deferred links of a resource for the link phase. They are kept in the journal only.
+
+        :param resid: XML id of the resource
+        :param record: The links serialised as string
+        :return: None
+        """
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO deferred (id, record) VALUES (?, ?)', (resid, record))
+
+    def deferred_links(self, batch_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """
+        Read back the deferred links in the order they have been recorded, batch by batch
+
+        :param batch_size: Number of records read at a time [default: 1000]
+        :return: Iterator over (XML id, record)
+        """
+        rowid = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute('SELECT rowid, id, record FROM deferred WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                                        (rowid, batch_size)).fetchall()
+            if not rows:
+                return
+            for rowid, resid, record in rows:
+                yield resid, record
+
+    def close(self) -> None:
+        """
+        Checkpoint the write-ahead log and close the journal
+        :return: None
+        """
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> 'UploadJournal':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,272 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import List, Set, Dict, Tuple, Optional, Any, Union, Callable, Iterable, Iterator, Deque
+
+from ..models.helpers import BaseError, IriTest
+from .resource_graph import ResourceGraph, ResourceGraphError
+
+"""
+This module implements the concurrent creation of resources for the bulk upload. A resource can be
+created as soon as all resources it references (by resptr-props or by standoff links in texts) have been
+created, that is, as soon as their IRI's are known. The scheduler keeps track of the number of unresolved
+references for each resource and hands a resource over to the pool of workers as soon as this number
+drops to zero. The IRI of a new resource is published into the thread safe IriLookup immediately after
+its creation, thus the dependent resources are unlocked without waiting for other resources.
+
+The resources must have an attribute ``id`` (the unique id within the XML file) and a method
+``get_resptrs()`` that returns the id's (or IRI's) of the referenced resources. References to id's that
+are not part of the upload are ignored, they are assumed to be IRI's of existing resources. The references
+are taken from a ResourceGraph, which may be passed in directly if it has already been built.
+
+For very large uploads, run_stream() consumes the resources lazily from an iterator (e.g. the streaming
+XML reader) and keeps at most a window of resources in memory that have not been created yet. A resource
+that references a resource further down in the file waits in the window until the referenced resource
+has been read and created.
+"""
+
+
+class IriLookup:
+    """
+    A thread safe dict that maps the unique id's of the XML file to the IRI's of the created resources
+    """
+    _lookup: Dict[str, str]
+    _lock: threading.Lock
+
+    def __init__(self, lookup: Optional[Dict[str, str]] = None):
+        self._lookup = dict(lookup) if lookup else {}
+        self._lock = threading.Lock()
+
+    def get(self, resid: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            return self._lookup.get(resid, default)
+
+    def __getitem__(self, resid: str) -> str:
+        with self._lock:
+            return self._lookup[resid]
+
+    def __setitem__(self, resid: str, iri: str) -> None:
+        with self._lock:
+            self._lookup[resid] = iri
+
+    def __contains__(self, resid: str) -> bool:
+        with self._lock:
+            return resid in self._lookup
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._lookup)
+
+    def items(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._lookup.items())
+
+
+class UploadScheduler:
+    """
+    Creates resources concurrently with a pool of workers, respecting the references between the resources
+    """
+    _jobs: int
+
+    def __init__(self, jobs: int = 1):
+        """
+        :param jobs: Number of resources that are created concurrently [default: 1]
+        """
+        if jobs < 1:
+            raise BaseError("The number of jobs must be at least 1!")
+        self._jobs = jobs
+
+    @property
+    def jobs(self) -> int:
+        return self._jobs
+
+    def run(self,
+            resources: Union[List[Any], ResourceGraph],
+            create: Callable[[Any], str],
+            lookup: IriLookup,
+            prerequisites: Optional[Dict[str, Future]] = None) -> None:
+        """
+        Create all resources. The resources are handed over to the workers in the order given, as soon as
+        all the resources they reference are created. Resources that are already in the lookup (e.g. from
+        a resumed upload) are not created again.
+
+        :param resources: List of resources to be created, or the ResourceGraph of the resources
+        :param create: Function that creates a resource and returns its IRI. It is called by the worker threads.
+        :param lookup: The IRI's of the created resources are added to this lookup
+        :param prerequisites: Dict of resource id -> Future (e.g. the upload of its image) that must be
+                              resolved before the resource is created
+        :return: None
+        """
+        graph = resources if isinstance(resources, ResourceGraph) else ResourceGraph(resources)
+        known: List[bool] = [graph.id(i) in lookup for i in range(len(graph))]
+        waiting: List[int] = [0] * len(graph)
+        pending: Dict[Future, List[int]] = {}
+        ready: Deque[int] = deque()
+        for i in range(len(graph)):
+            waiting[i] = sum(1 for j in graph.refs(i) if not known[j])
+            prerequisite = prerequisites.get(graph.id(i)) if prerequisites else None
+            if prerequisite is not None and not known[i]:
+                pending.setdefault(prerequisite, []).append(i)
+                waiting[i] += 1
+            if waiting[i] == 0 and not known[i]:
+                ready.append(i)
+
+        def task(resource: Any) -> str:
+            iri = create(resource)
+            lookup[resource.id] = iri  # publish as early as possible
+            return iri
+
+        def failure(future: Future) -> Optional[BaseException]:
+            if future.cancelled():
+                return BaseError("Prerequisite has been cancelled")
+            return future.exception()
+
+        running: Dict[Future, int] = {}
+        error: Optional[BaseException] = None
+        done_cnt = 0
+        with ThreadPoolExecutor(max_workers=self._jobs, thread_name_prefix='UploadScheduler') as executor:
+            while ready or running or (pending and error is None):
+                while ready and len(running) < self._jobs and error is None:
+                    i = ready.popleft()
+                    running[executor.submit(task, graph.resources[i])] = i
+                if not running and (error is not None or not pending):
+                    break
+                finished, _ = wait(list(running) + list(pending), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in pending:
+                        unlocked = pending.pop(future)
+                        if failure(future) is not None:
+                            if error is None:
+                                error = failure(future)
+                            continue
+                    else:
+                        i = running.pop(future)
+                        if failure(future) is not None:
+                            if error is None:
+                                error = failure(future)
+                            continue
+                        done_cnt += 1
+                        unlocked = graph.dependents(i)
+                    for j in unlocked:
+                        waiting[j] -= 1
+                        if waiting[j] == 0:
+                            ready.append(j)
+        if error is not None:
+            raise error
+        if done_cnt < len(graph) - sum(known):
+            unresolved = [graph.id(i) for i, cnt in enumerate(waiting) if cnt > 0]
+            raise BaseError("Cannot resolve resptr dependencies of {} resources: {}".format(
+                len(unresolved), ", ".join(unresolved)))
+
+    def run_stream(self,
+                   resources: Iterable[Any],
+                   create: Callable[[Any], str],
+                   lookup: IriLookup,
+                   window: int = 10000,
+                   prepare: Optional[Callable[[Any], Optional[Future]]] = None) -> None:
+        """
+        Create all resources, reading them lazily from an iterable. At most ``window`` resources are read
+        ahead that have not yet been created. Resources that are already in the lookup (e.g. from a resumed
+        upload) are not created again.
+
+        :param resources: Iterable of the resources to be created, e.g. a generator
+        :param create: Function that creates a resource and returns its IRI. It is called by the worker threads.
+        :param lookup: The IRI's of the created resources are added to this lookup
+        :param window: Maximal number of resources held in memory that are not yet created [default: 10000]
+        :param prepare: Function that is called as soon as all references of a resource are resolved. It may
+                        return a Future (e.g. the upload of its image) that must be resolved before the
+                        resource is created.
+        :return: None
+        """
+        if window < 1:
+            raise BaseError("The window must be at least 1!")
+        source: Iterator[Any] = iter(resources)
+        exhausted = False
+        held: Dict[str, Any] = {}
+        waiting: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {}
+        pending: Dict[Future, str] = {}
+        ready: Deque[str] = deque()
+
+        def unlock(resid: str) -> None:
+            prerequisite = prepare(held[resid]) if prepare is not None else None
+            if prerequisite is not None:
+                pending[prerequisite] = resid
+            else:
+                ready.append(resid)
+
+        def admit(resource: Any) -> None:
+            resid = resource.id
+            if resid in lookup:
+                return
+            held[resid] = resource
+            refs = {ref for ref in resource.get_resptrs()
+                    if ref not in lookup and not IriTest.test(ref)}
+            waiting[resid] = len(refs)
+            for ref in refs:
+                dependents.setdefault(ref, []).append(resid)
+            if not refs:
+                unlock(resid)
+
+        def task(resource: Any) -> str:
+            iri = create(resource)
+            lookup[resource.id] = iri  # publish as early as possible
+            return iri
+
+        def failure(future: Future) -> Optional[BaseException]:
+            if future.cancelled():
+                return BaseError("Prerequisite has been cancelled")
+            return future.exception()
+
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=self._jobs, thread_name_prefix='UploadScheduler') as executor:
+            while True:
+                while not exhausted and error is None and len(held) < window:
+                    try:
+                        admit(next(source))
+                    except StopIteration:
+                        exhausted = True
+                    except Exception as err:  # e.g. a validation error further down in the XML file
+                        exhausted = True
+                        error = err
+                while ready and len(running) < self._jobs and error is None:
+                    resid = ready.popleft()
+                    running[executor.submit(task, held[resid])] = resid
+                if not running and (error is not None or not pending):
+                    if not exhausted and error is None:
+                        error = BaseError("All {} resources in the window wait for resources further down in "
+                                          "the file. Increase the window!".format(len(held)))
+                    break
+                finished, _ = wait(list(running) + list(pending), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in pending:
+                        resid = pending.pop(future)
+                        if failure(future) is not None:
+                            if error is None:
+                                error = failure(future)
+                            continue
+                        ready.append(resid)
+                    else:
+                        resid = running.pop(future)
+                        if failure(future) is not None:
+                            if error is None:
+                                error = failure(future)
+                            continue
+                        del held[resid]
+                        del waiting[resid]
+                        for dependent in dependents.pop(resid, []):
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0:
+                                unlock(dependent)
+        if error is not None:
+            raise error
+        if held:
+            unresolved = list(held.values())
+            dangling: Dict[str, List[str]] = {}
+            for resource in unresolved:
+                refs = [ref for ref in resource.get_resptrs()
+                        if ref not in held and ref not in lookup and not IriTest.test(ref)]
+                if refs:
+                    dangling[resource.id] = refs
+            raise ResourceGraphError(ResourceGraph(unresolved).find_cycles(), dangling)
@@ -1,19 +1,28 @@
+import functools
+import json
 import os
 import re
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor, Future
+from itertools import islice
 
-from typing import List, Set, Dict, Tuple, Optional, Union
+from typing import Any, List, Set, Dict, Tuple, Optional, Union, Iterator
 from lxml import etree
-from pprint import pprint
 
 from dsplib.models.connection import Connection
 from dsplib.models.group import Group
-from dsplib.models.helpers import IriTest
+from dsplib.models.helpers import IriTest, Cardinality
 from dsplib.models.project import Project
 from dsplib.models.resource import ResourceInstanceFactory
 from dsplib.models.value import BooleanValue, ColorValue, DateValue, DecimalValue, IntValue, IntervalValue, TextValue, \
     UriValue, KnoraStandoffXml, make_value
 from dsplib.models.permission import PermissionValue, Permissions
 from dsplib.models.sipi import Sipi
+from dsplib.utils.image_pipeline import ImagePipeline
+from dsplib.utils.resource_graph import ResourceGraph, ResourceGraphError
+from dsplib.utils.upload_journal import UploadJournal
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
 
 StrDict = Dict[str, str]
 
@@ -26,7 +35,52 @@ richtext_tags = [
     'table', 'tr', 'td', 'br', 'hr', 'pre', 'cite', 'blockquote', 'code'
 ]
 
-class XmlError(BaseException):
+#
+# the property tags and the value types they contain
+#
+property_tags = {
+    'text-prop': 'text', 'color-prop': 'color', 'date-prop': 'date', 'decimal-prop': 'decimal',
+    'geometry-prop': 'geometry', 'geoname-prop': 'geoname', 'list-prop': 'list', 'iconclass-prop': 'iconclass',
+    'integer-prop': 'integer', 'interval-prop': 'interval', 'period-prop': 'period', 'resptr-prop': 'resptr',
+    'time-prop': 'time', 'uri-prop': 'uri', 'boolean-prop': 'boolean'
+}
+
+
+def intern_name(name: Optional[str]) -> Optional[str]:
+    """
+    Intern a name that is repeated many times in a XML data file (property names, resource types,
+    permission id's, resource id's). All occurrences then share one string object.
+
+    :param name: The name or None
+    :return: The interned name or None
+    """
+    return sys.intern(name) if name is not None else None
+
+@functools.lru_cache(maxsize=None)
+def load_xmlschema(xsdfile: str = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                               'knora-data-schema.xsd')) -> etree.XMLSchema:
+    """
+    Load and compile a XML schema. The compiled schema is cached and reused by subsequent calls.
+
+    :param xsdfile: Path of the XSD file [default: knora-data-schema.xsd of dsplib]
+    :return: The compiled schema
+    """
+    return etree.XMLSchema(etree.parse(xsdfile))
+
+
+def free_element(node: etree.Element) -> None:
+    """
+    Release a completely processed element and its preceding siblings from the tree built by iterparse
+
+    :param node: The element that has been processed
+    :return: None
+    """
+    node.clear()
+    while node.getprevious() is not None:
+        del node.getparent()[0]
+
+
+class XmlError(Exception):
 
     def __init__(self, msg: str):
         self._message = msg
@@ -78,39 +132,84 @@ class ProjectContext:
         return self._project_name
 
 
+class KnoraProperty:
+    """
+    A property as used in the XML data file. The instances are flyweights: there is only one instance for
+    each combination of property name and value type, which is shared by all values of this property. An
+    instance is dropped from the registry as soon as no value refers to it anymore.
+    """
+    __slots__ = ('_name', '_valtype', '__weakref__')
+    _name: str
+    _valtype: str
+    __instances: 'weakref.WeakValueDictionary[Tuple[str, str], KnoraProperty]' = weakref.WeakValueDictionary()
+
+    def __init__(self, name: str, valtype: str):
+        self._name = intern_name(name)
+        self._valtype = valtype
+
+    @classmethod
+    def get(cls, node: etree.Element, valtype: str, default_ontology: Optional[str] = None) -> 'KnoraProperty':
+        """
+        Get the shared instance for a property node of the XML DOM
+
+        :param node: The DOM node of the property (e.g. <text-prop>)
+        :param valtype: The type of the values of the property (e.g. "text")
+        :param default_ontology: Name of the ontology used for property names without prefix
+        :return: The shared instance
+        """
+        tmp = node.attrib['name'].split(':')
+        if len(tmp) > 1:
+            if tmp[0]:
+                name = node.attrib['name']
+            else:
+                name = default_ontology + ':' + tmp[1]
+        else:
+            name = 'knora-admin:' + tmp[0]
+        return cls.shared(name, valtype)
+
+    @classmethod
+    def shared(cls, name: str, valtype: str) -> 'KnoraProperty':
+        """
+        Get the shared instance for a property name and value type
+
+        :param name: Prefixed name of the property
+        :param valtype: The type of the values of the property (e.g. "text")
+        :return: The shared instance
+        """
+        instance = cls.__instances.get((name, valtype))
+        if instance is None:
+            instance = cls.__instances.setdefault((name, valtype), cls(name, valtype))
+        return instance
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def valtype(self):
+        return self._valtype
+
+
 class KnoraValue:
+    __slots__ = ('_property', '_value', '_resrefs', '_comment', '_permissions')
+    _property: KnoraProperty
     _value: Union[str, KnoraStandoffXml]
     _resrefs: List[str]
     _comment: str
     _permissions: str
-    is_richtext: bool
+    __texttag = re.compile(r'^<text[^>]*/>$|^<text[^>]*>|</text>$')
 
     def __init__(self,
                  context: etree.iterparse,
                  node: Tuple,
-                 valtype: str,
+                 property: KnoraProperty,
                  listname: Optional[str] = None) -> None:
 
+        valtype = property.valtype
+        self._property = property
         self._resrefs = None
         self._comment = node.get('comment')
-        self._permissions = node.get('permissions')
-        if node.get('encoding') == 'xml':
-            node.attrib.clear()
-            xmlstr = etree.tostring(node, encoding="unicode", method="xml")
-            xmlstr = xmlstr.replace('<text xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">', '')
-            xmlstr = xmlstr.replace('</text>', '')
-            self._value = KnoraStandoffXml(xmlstr)
-            tmpidlist = self._value.findall()
-            if tmpidlist:
-                refs = set()
-                for tmpid in tmpidlist:
-                    refs.add(tmpid.split(':')[1])
-                self._resrefs = list(refs)
-        else:
-            if valtype == 'list':
-                self._value = listname + ':' + "".join(node.itertext())
-            else:
-                self._value = "".join(node.itertext())
+        self._permissions = intern_name(node.get('permissions'))
         richtext_stack: List[str] = []
         while True:
             event, subnode = next(context)
@@ -127,9 +226,37 @@ class KnoraValue:
                 if subnode.tag == valtype:
                     break
                 else:
-                    pprint(richtext_stack)
                     raise XmlError('Unexpected end tag: "{}", but </{}> expected!'.format(subnode.tag, valtype))
 
+        #
+        # the content is read at the end event of the value, only then the element is complete
+        #
+        if node.get('encoding') == 'xml':
+            node.attrib.clear()
+            xmlstr = etree.tostring(node, encoding="unicode", method="xml", with_tail=False)
+            xmlstr = self.__texttag.sub('', xmlstr)
+            self._value = KnoraStandoffXml(xmlstr)
+            tmpidlist = self._value.findall()
+            if tmpidlist:
+                refs = set()
+                for tmpid in tmpidlist:
+                    refs.add(intern_name(tmpid.split(':')[1]))
+                self._resrefs = list(refs)
+        else:
+            # only a rich text has child elements, the content of all other values is node.text
+            text = "".join(node.itertext()) if len(node) else node.text or ''
+            if valtype == 'list':
+                self._value = intern_name(listname + ':' + text)
+            elif valtype == 'resptr':
+                self._value = intern_name(text)  # shared with the id of the resource
+            else:
+                self._value = text
+        node.clear()
+
+    @property
+    def prop(self) -> KnoraProperty:
+        return self._property
+
     @property
     def value(self):
         return self._value
@@ -146,6 +273,39 @@ class KnoraValue:
     def permissions(self):
         return self._permissions
 
+    @property
+    def is_link(self) -> bool:
+        """
+        True, if the value references other resources (resptr value or text with standoff links)
+        """
+        return self._property.valtype == 'resptr' or self._resrefs is not None
+
+    def to_record(self) -> List[Any]:
+        """
+        The value as a JSON serialisable list, from which from_record() restores it
+
+        :return: [property name, value type, value, is standoff XML, comment, permissions, resource refs]
+        """
+        return [self._property.name, self._property.valtype, str(self._value),
+                isinstance(self._value, KnoraStandoffXml), self._comment, self._permissions, self._resrefs]
+
+    @classmethod
+    def from_record(cls, record: List[Any]) -> 'KnoraValue':
+        """
+        Restore a value from the list returned by to_record() (without parsing XML)
+
+        :param record: The list returned by to_record()
+        :return: The value
+        """
+        name, valtype, value, xml, comment, permissions, resrefs = record
+        instance = cls.__new__(cls)
+        instance._property = KnoraProperty.shared(name, valtype)
+        instance._value = KnoraStandoffXml(value) if xml else value
+        instance._comment = comment
+        instance._permissions = permissions
+        instance._resrefs = resrefs
+        return instance
+
     def print(self) -> None:
         """
         Print value to stdout for debugging...
@@ -160,69 +320,19 @@ class KnoraValue:
                 print('    resref: ' + i)
 
 
-class KnoraProperty:
-    _name: str
-    _valtype: str
-    _values: List[KnoraValue]
-
-    def __init__(self, context: etree.iterparse, node: Tuple, valtype: str, default_ontology: Optional[str] = None):
-        tmp = node.attrib['name'].split(':')
-        if len(tmp) > 1:
-            if tmp[0]:
-                self._name = node.attrib['name']
-            else:
-                self._name = default_ontology + ':' + tmp[1]
-        else:
-            self._name = 'knora-admin:' + tmp[0]
-        listname = node.attrib.get('list')  # safe the list name if given (only for lists)
-        self._valtype = valtype
-        self._values = []
-
-        while True:
-            event, subnode = next(context)
-            if event == 'start':
-                if subnode.tag == valtype:  # the subnode must correspond to the expected value type
-                    self._values.append(KnoraValue(context, subnode, valtype, listname))
-                else:
-                    raise XmlError('Unexpected start tag: "{}" <property> may contain only <value> tags!'.format(subnode.tag))
-            else:
-                if subnode.tag == 'text-prop' or subnode.tag == 'color-prop' or \
-                    subnode.tag == 'date-prop' or subnode.tag == 'decimal-prop' or \
-                    subnode.tag == 'geometry-prop' or subnode.tag == 'geoname-prop' or \
-                    subnode.tag == 'list-prop' or subnode.tag == 'iconclass-prop' or \
-                    subnode.tag == 'integer-prop' or subnode.tag == 'interval-prop' or \
-                    subnode.tag == 'period-prop' or subnode.tag == 'resptr-prop' or \
-                    subnode.tag == 'resptr-prop' or subnode.tag == 'time-prop' or \
-                    subnode.tag == 'uri-prop' or subnode.tag == 'boolean-prop':
-                    break
-                else:
-                    raise XmlError('Unknown endtag for property: "{}"!'.format(subnode.tag))
-
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def valtype(self):
-        return self._valtype
-
-    @property
-    def values(self):
-        return self._values
-
-    def print(self) -> None:
-        print('  Property: {} Type: {}'.format(self._name, self._valtype))
-        for value in self._values:
-            value.print()
-
-
 class KnoraResource:
+    """
+    A resource of the XML data file. To keep the memory footprint small, the values of all properties are
+    held in one flat tuple, each value references its shared KnoraProperty.
+    """
+    __slots__ = ('_id', '_label', '_restype', '_permissions', '_image', '_values', '_links')
     _id: str
     _label: str
     _restype: str
     _permissions: str
     _image: str
-    _properties: List[KnoraProperty]
+    _values: Tuple[KnoraValue, ...]
+    _links: Tuple[KnoraValue, ...]
 
     def __init__(self, context: etree.iterparse, node: Tuple, default_ontology: Optional[str] = None) -> None:
         """
@@ -231,54 +341,27 @@ class KnoraResource:
         :param context: Context for DOM node traversal
         :param node: The DOM node to be processed (representing a resource)
         """
-        self._id = node.attrib['id']  # safe the unique id
+        self._id = intern_name(node.attrib['id'])  # safe the unique id
         self._label = node.attrib['label']
         tmp = node.attrib['restype'].split(':')
         if len(tmp) > 1:
             if tmp[0]:
-                self._restype = node.attrib['restype']
+                self._restype = intern_name(node.attrib['restype'])
             else:
-                self._restype = default_ontology + ':' + tmp[1]
+                self._restype = intern_name(default_ontology + ':' + tmp[1])
         else:
-            self._restype = 'knora-admin:' + tmp[0]
-        self._permissions = node.attrib['permissions']
+            self._restype = intern_name('knora-admin:' + tmp[0])
+        self._permissions = intern_name(node.attrib['permissions'])
         self._image = None
-        self._properties = []
+        self._links = ()
+        values: List[KnoraValue] = []
         while True:
             event, subnode = next(context)
             if event == 'start':
                 if subnode.tag == 'image':
-                    self._image = node.text
-                elif subnode.tag == 'text-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'text', default_ontology))
-                elif subnode.tag == 'color-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'color', default_ontology))
-                elif subnode.tag == 'date-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'date', default_ontology))
-                elif subnode.tag == 'decimal-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'decimal', default_ontology))
-                elif subnode.tag == 'geometry-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'geometry', default_ontology))
-                elif subnode.tag == 'geoname-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'geoname', default_ontology))
-                elif subnode.tag == 'list-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'list', default_ontology))
-                elif subnode.tag == 'iconclass-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'iconclass', default_ontology))
-                elif subnode.tag == 'integer-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'integer', default_ontology))
-                elif subnode.tag == 'interval-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'interval', default_ontology))
-                elif subnode.tag == 'period-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'period', default_ontology))
-                elif subnode.tag == 'resptr-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'resptr', default_ontology))
-                elif subnode.tag == 'time-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'time', default_ontology))
-                elif subnode.tag == 'uri-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'uri', default_ontology))
-                elif subnode.tag == 'boolean-prop':
-                    self._properties.append(KnoraProperty(context, subnode, 'boolean', default_ontology))
+                    pass  # the filename is read at the end event, only then the element is complete
+                elif subnode.tag in property_tags:
+                    self.__read_property(context, subnode, property_tags[subnode.tag], default_ontology, values)
                 else:
                     raise XmlError('Unexpected start tag: "{}" <resource> may contain only <property> or <image> tags!'.format(subnode.tag))
             else:
@@ -288,6 +371,38 @@ class KnoraResource:
                     self._image = "".join(subnode.itertext())
                 else:
                     raise XmlError('Unexpected end tag: "{}" </resource> expected!'.format(subnode.tag))
+        self._values = tuple(values)
+
+    @staticmethod
+    def __read_property(context: etree.iterparse,
+                        node: Tuple,
+                        valtype: str,
+                        default_ontology: Optional[str],
+                        values: List[KnoraValue]) -> None:
+        """
+        Parse a property node from the XML DOM and append its values
+
+        :param context: Context for DOM node traversal
+        :param node: The DOM node of the property
+        :param valtype: The type of the values of the property
+        :param default_ontology: Name of the ontology used for property names without prefix
+        :param values: The values are appended to this list
+        :return: None
+        """
+        property = KnoraProperty.get(node, valtype, default_ontology)
+        listname = node.attrib.get('list')  # safe the list name if given (only for lists)
+        while True:
+            event, subnode = next(context)
+            if event == 'start':
+                if subnode.tag == valtype:  # the subnode must correspond to the expected value type
+                    values.append(KnoraValue(context, subnode, property, listname))
+                else:
+                    raise XmlError('Unexpected start tag: "{}" <property> may contain only <value> tags!'.format(subnode.tag))
+            else:
+                if subnode.tag in property_tags:
+                    break
+                else:
+                    raise XmlError('Unknown endtag for property: "{}"!'.format(subnode.tag))
 
     @property
     def id(self) -> str:
@@ -313,24 +428,91 @@ class KnoraResource:
         print('Resource: id={} restype: {} label: {}'.format(self._id, self._restype, self._label))
         if self._image is not None:
             print(' Image: ' + self._image)
-        for property in self._properties:
-            property.print()
+        property = None
+        for value in self._values:
+            if value.prop is not property:
+                property = value.prop
+                print('  Property: {} Type: {}'.format(property.name, property.valtype))
+            value.print()
+
+    @staticmethod
+    def _refs(values: Tuple[KnoraValue, ...]) -> List[str]:
+        refs: List[str] = []
+        for value in values:
+            if value.prop.valtype == 'resptr':
+                refs.append(value.value)
+            elif value.resrefs is not None:
+                refs.extend(value.resrefs)
+        return refs
 
     def get_resptrs(self) -> List[str]:
         """
         Return a list of all reesource id's  that a referenced by this resource
         :return: List of resources identified by their unique id's
         """
-        resptrs: List[str] = []
-        for property in self._properties:
-            if property.valtype == 'resptr':
-                for value in property.values:
-                    resptrs.append(value.value)
-            elif property.valtype == 'text':
-                for value in property.values:
-                    if value.resrefs is not None:
-                        resptrs.extend(value.resrefs)
-        return resptrs
+        return self._refs(self._values)
+
+    def defer_links(self, required: Set[str]) -> int:
+        """
+        Move the values that reference other resources out of the resource. These values are not
+        returned by get_resptrs() and get_propvals() anymore, but by get_links(). If a property that
+        requires at least one value has only values with references, they are kept in the resource.
+
+        :param required: Names of the properties that require at least one value
+        :return: Number of values moved
+        """
+        nonlinks: Set[KnoraProperty] = {value.prop for value in self._values if not value.is_link}
+        links = [value for value in self._values
+                 if value.is_link and (value.prop.name not in required or value.prop in nonlinks)]
+        if links:
+            self._links = self._links + tuple(links)
+            self._values = tuple(value for value in self._values if value not in links)
+        return len(self._links)
+
+    @property
+    def has_links(self) -> bool:
+        return len(self._links) > 0
+
+    def get_link_refs(self) -> List[str]:
+        """
+        Return the resource id's referenced by the values that have been moved out by defer_links()
+        :return: List of resources identified by their unique id's
+        """
+        return self._refs(self._links)
+
+    @staticmethod
+    def _make_propval(value: KnoraValue,
+                      resiri_lookup: StrDict,
+                      permissions_lookup: StrDict) -> StrObj:
+        v: str
+        if value.prop.valtype == 'resptr':  # we have a resptr, therefore simple lookup or IRI
+            iri = resiri_lookup.get(value.value)
+            if iri is not None:
+                v = iri
+            else:
+                v = value.value  # if we do not find the unique_id, we assume it's a valid knora IRI
+        elif value.prop.valtype == 'text':
+            if isinstance(value.value, KnoraStandoffXml):
+                irirefs = value.value.findall()  # The IRI's must be embedded  as "...IRI:unique_id:IRI..."
+                for iriref in irirefs:
+                    resid = iriref.split(':')[1]
+                    iri = resiri_lookup.get(resid)
+                    value.value.replace(iriref, iri)
+            v = value.value
+        else:
+            v = value.value
+
+        if value.comment is None and value.permissions is None:
+            # no comment or permissions
+            return v
+        else:
+            # we have comment or permissions
+            tmp = {'value': v}
+            if value.comment is not None:
+                tmp['comment'] = value.comment
+            if value.permissions is not None:
+                tmp['permissions'] = permissions_lookup.get(value.permissions)
+            return tmp
 
     def get_propvals(self,
                      resiri_lookup: StrDict,
@@ -343,41 +525,54 @@ class KnoraResource:
         :return: A dict of values with the property name as key and a single value. This dict represents
                  the JSON structure that Knora.create_resource() expects.
         """
-        propdata = {}
-        for property in self._properties:
-            vals: List[StrObj] = []  # == List[Union[str,StrDict]
-            for value in property.values:
-                v: str
-                if property.valtype == 'resptr':  # we have a resptr, therefore simple lookup or IRI
-                    iri = resiri_lookup.get(value.value)
-                    if iri is not None:
-                        v = iri
-                    else:
-                        v = value.value  # if we do not find the unique_id, we assume it's a valid knora IRI
-                elif property.valtype == 'text':
-                    if isinstance(value.value, KnoraStandoffXml):
-                        irirefs = value.value.findall()  # The IRI's must be embedded  as "...IRI:unique_id:IRI..."
-                        for iriref in irirefs:
-                            resid = iriref.split(':')[1]
-                            iri = resiri_lookup.get(resid)
-                            value.value.replace(iriref, iri)
-                    v = value.value
-                else:
-                    v = value.value
+        propvals: Dict[str, List[StrObj]] = {}
+        for value in self._values:
+            propvals.setdefault(value.prop.name, []).append(
+                self._make_propval(value, resiri_lookup, permissions_lookup))
+        return {name: vals if len(vals) > 1 else vals[0] for name, vals in propvals.items()}
 
-                if value.comment is None and value.permissions is None:
-                    # no comment or permissions
-                    vals.append(v)
-                else:
-                    # we have comment or permissions
-                    tmp = {'value': v}
-                    if value.comment is not None:
-                        tmp['comment'] = value.comment
-                    if value.permissions is not None:
-                        tmp['permissions'] = permissions_lookup.get(value.permissions)
-                    vals.append(tmp)
-            propdata[property.name] = vals if len(vals) > 1 else vals[0]  # append a Union[StrObj,List[StrObj]]
-        return propdata
+    def get_links(self,
+                  resiri_lookup: StrDict,
+                  permissions_lookup: StrDict) -> List[Tuple[str, StrObj]]:
+        """
+        Returns the values that have been moved out of the resource by defer_links()
+
+        :param resiri_lookup: Is used to solve internal unique_id's of resourcs to real IRI's
+        :param permissions_lookup: Is usd to resolve thee permission ID's to permission sets
+        :return: List of (property name, value) in the form expected by ResourceInstance.createValue()
+        """
+        return [(value.prop.name, self._make_propval(value, resiri_lookup, permissions_lookup))
+                for value in self._links]
+
+    def to_link_record(self) -> str:
+        """
+        The part of the resource needed to add the values moved out by defer_links() as JSON, e.g. for the
+        journal of a streamed upload. The resource is restored from it by from_link_record().
+
+        :return: JSON with the resource class, the image and the deferred values
+        """
+        return json.dumps({'restype': self._restype, 'image': self._image,
+                           'links': [value.to_record() for value in self._links]})
+
+    @classmethod
+    def from_link_record(cls, resid: str, record: str) -> 'KnoraResource':
+        """
+        Restore a resource with the values moved out by defer_links() only
+
+        :param resid: The unique id of the resource
+        :param record: The JSON returned by to_link_record()
+        :return: The resource without label, permissions and values, but with its deferred values
+        """
+        data = json.loads(record)
+        instance = cls.__new__(cls)
+        instance._id = resid
+        instance._label = None
+        instance._restype = data['restype']
+        instance._permissions = None
+        instance._image = data['image']
+        instance._values = ()
+        instance._links = tuple(KnoraValue.from_record(value) for value in data['links'])
+        return instance
 
 
 class XmlAllow:
@@ -478,55 +673,100 @@ class XmlPermission:
 def do_sortorder(resources: List[KnoraResource]) -> List[KnoraResource]:
     """
     Sort the list of resources such that resources that reference other resources are
-    added after the referenced resources. It will fail with an error if there are circular
-    references.
+    added after the referenced resources. The reference graph is built once and sorted in
+    linear time. If there are circular or dangling references, a ResourceGraphError is raised
+    that lists all of them.
 
     :param resources: List of resources before sorting
     :return: Sorted list of resources
     """
-    #
-    # here we sort the resources according to outgoing resptrs
-    #
-    ok_resources: [KnoraResource] = []
-    notok_resources: [KnoraResource] = []
-    ok_resids : [str] = []
-    cnt = 0
-    notok_len = 9999999
-    while len(resources) > 0 and cnt < 10000:
-        for resource in resources:
-            resptrs = resource.get_resptrs()
-            if len(resptrs) == 0:
-                ok_resources.append(resource)
-                ok_resids.append(resource.id)
-            else:
-                ok = True
-                for resptr in resptrs:
-                    if resptr in ok_resids:
-                        pass
-                    else:
-                        ok = False;
-                if ok:
-                    ok_resources.append(resource)
-                    ok_resids.append(resource.id)
-                else:
-                    notok_resources.append(resource)
-        resources = notok_resources
-        if not len(notok_resources) < notok_len:
-            print('Cannot resolve resptr dependencies. Giving up....')
-            print(len(notok_resources))
-            for r in notok_resources:
-                print('Resource {} has unresolvable resptrs to: '.format(r.id), end=' ')
-                for x in r.get_resptrs():
-                    print(x, end=' ')
-                print('')
-                print('=============')
-            exit(5)
-        notok_len = len(notok_resources)
-        notok_resources = []
-        cnt += 1
-        print('{}. Ordering pass Finished!'.format(cnt))
-    print('Remaining: {}'.format(len(resources)))
-    return ok_resources
+    return ResourceGraph(resources).sort()
+
+
+class XmlDataReader:
+    """
+    Streaming reader of the XML data file. The file is validated against the schema while it is read. The
+    header (shortcode, default ontology) and the permission sets are read by the constructor, the resources
+    are read lazily one after the other by resources(). Each element is released from the lxml tree as
+    soon as it has been processed, thus only the current resource is kept in memory by the reader.
+    """
+    _context: etree.iterparse
+    _proj_context: ProjectContext
+    _shortcode: Union[str, None]
+    _default_ontology: Union[str, None]
+    _permissions: Dict[str, XmlPermission]
+    _node: Union[etree.Element, None]
+
+    def __init__(self, input_file: str, proj_context: ProjectContext) -> None:
+        """
+        Open the XML data file and read everything before the first resource
+
+        :param input_file: Path to the XML data file
+        :param proj_context: The context of the project, used to resolve the groups of the permissions
+        """
+        self._context = etree.iterparse(input_file, events=("start", "end"), schema=load_xmlschema())
+        self._proj_context = proj_context
+        self._shortcode = None
+        self._default_ontology = None
+        self._permissions = {}
+        self._node = None
+        for event, node in self._context:
+            if event == 'start':
+                if node.tag == 'knora':
+                    self._default_ontology = node.attrib['default-ontology']
+                    self._shortcode = node.attrib['shortcode']
+                    proj_context.shortcode = self._shortcode
+                elif node.tag == 'permissions':
+                    permission = XmlPermission(self._context, node, proj_context)
+                    self._permissions[permission.id] = permission
+                    free_element(node)
+                elif node.tag == 'resource':
+                    self._node = node  # the permissions precede the resources
+                    break
+
+    @property
+    def shortcode(self) -> Union[str, None]:
+        return self._shortcode
+
+    @property
+    def default_ontology(self) -> Union[str, None]:
+        return self._default_ontology
+
+    @property
+    def permissions(self) -> Dict[str, XmlPermission]:
+        return self._permissions
+
+    def resources(self) -> Iterator[KnoraResource]:
+        """
+        Read the resources lazily. Can be called only once.
+
+        :return: Generator of the resources in the order of the XML file
+        """
+        node = self._node
+        self._node = None
+        while node is not None:
+            resource = KnoraResource(self._context, node, self._default_ontology)
+            free_element(node)
+            yield resource
+            node = None
+            for event, subnode in self._context:
+                if event == 'start' and subnode.tag == 'resource':
+                    node = subnode
+                    break
+
+
+def parse_xml(input_file: str,
+              proj_context: ProjectContext) -> Tuple[str, str, List[KnoraResource], Dict[str, XmlPermission]]:
+    """
+    Read the complete XML data file in a single streaming pass using the XmlDataReader.
+
+    :param input_file: Path to the XML data file
+    :param proj_context: The context of the project, used to resolve the groups of the permissions
+    :return: Tuple of shortcode, default ontology, list of resources and dict of permission sets
+    """
+    reader = XmlDataReader(input_file, proj_context)
+    resources = list(reader.resources())
+    return reader.shortcode, reader.default_ontology, resources, reader.permissions
 
 
 def xml_upload(input_file: str,
@@ -535,60 +775,72 @@ def xml_upload(input_file: str,
                password: str,
                imgdir: str,
                sipi: str,
-               verbose: bool) -> bool:
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-
-    xmlschema_doc = etree.parse(os.path.join(current_dir, 'knora-data-schema.xsd'))
-    xmlschema = etree.XMLSchema(xmlschema_doc)
-    doc = etree.parse(input_file)
-    xmlschema.assertValid(doc)
-
-    del xmlschema
-    del doc
-    del xmlschema_doc
-
-    print("The input data file is syntactically correct and passed validation!")
-
+               verbose: bool,
+               jobs: int = 1,
+               two_phase: bool = False,
+               resume: bool = False,
+               restart: bool = False,
+               image_workers: int = 4,
+               image_queue: int = 16,
+               image_budget: int = 256 * 1024 * 1024,
+               stream: bool = False,
+               window: int = 10000,
+               schema_snapshot: Optional[str] = None) -> bool:
+    """
+    Upload all resources of a XML data file to a DSP server
+
+    :param input_file: Path to the XML data file
+    :param server: URL of the DSP server
+    :param user: Username (email) for the login
+    :param password: Password for the login
+    :param imgdir: Directory containing the images
+    :param sipi: URL of the SIPI server
+    :param verbose: Verbose feedback
+    :param jobs: Number of resources that are created concurrently [default: 1]
+    :param two_phase: First create all resources without the optional links to other resources, then add
+                      the links. This allows circular references [default: False]
+    :param resume: Skip the steps recorded as completed in the journal of a previous, interrupted upload
+                   of the same file. The journal is the file "<input_file>.journal" [default: False]
+    :param restart: Clear the journal of a previous upload of the same file and upload all resources again.
+                    Without resume or restart, an existing journal is an error [default: False]
+    :param image_workers: Number of images uploaded to SIPI concurrently [default: 4]
+    :param image_queue: Maximal number of images uploaded ahead of the creation of their resources [default: 16]
+    :param image_budget: Maximal number of bytes of images in flight [default: 256 MB]
+    :param stream: Read the resources lazily while they are uploaded, thus the memory does not grow with the
+                   size of the XML file. Errors further down in the file are detected only when they are
+                   reached, the upload can then be continued with resume [default: False]
+    :param window: Maximal number of resources held in memory in streaming mode that are not yet created.
+                   A resource that references a resource further down in the file waits within this
+                   window. In a two-phase upload, the deferred links are kept in the journal and read back
+                   in chunks of this size for the link phase [default: 10000]
+    :param schema_snapshot: Path of a snapshot file of the lists and ontologies of the project. If it is up to
+                            date, the schema is read from it instead of the server, otherwise it is
+                            rewritten [default: None]
+    :return: True, if all resources have been uploaded
+    """
     #
     # Connect to the DaSCH Service Platform API
     #
-    con = Connection(server)
+    con = Connection(server, pool_maxsize=max(jobs, 10))
     con.login(user, password)
 
     proj_context = ProjectContext(con=con)
 
     #
-    # read the XML file containing the data, including project shortcode
+    # read the XML file containing the data, including project shortcode. In streaming mode only the
+    # header and the permissions are read here, the resources are read while they are uploaded
     #
-    context: etree.iterparse = etree.iterparse(input_file, events=("start", "end"))
+    reader: Optional[XmlDataReader] = None
     resources: List[KnoraResource] = []
-    permissions: Dict[str, XmlPermission] = {}
-    shortcode: Union[str, None] = None
-    default_ontology = None
-    while True:
-        event, node = next(context)
-        if event == 'start':
-            if node.tag == 'knora':
-                default_ontology = node.attrib['default-ontology']
-                shortcode = node.attrib['shortcode']
-                proj_context.shortcode = shortcode
-            elif event == 'start' and node.tag == 'resource':
-                resources.append(KnoraResource(context, node, default_ontology))
-            elif event == 'start' and node.tag == 'permissions':
-                permission = XmlPermission(context, node, proj_context)
-                permissions[permission.id] = permission
-        elif event == 'end':
-            if node.tag == 'knora':
-                break
+    if stream:
+        reader = XmlDataReader(input_file, proj_context)
+        shortcode, default_ontology, permissions = reader.shortcode, reader.default_ontology, reader.permissions
+        print("The header of the input data file passed validation, the resources are validated while they are uploaded!")
+    else:
+        shortcode, default_ontology, resources, permissions = parse_xml(input_file, proj_context)
+        print("The input data file is syntactically correct and passed validation!")
 
-    #
-    # sort the resources so that resources which do not link to others come first
-    #
-    resources = do_sortorder(resources)
-
-    sipi = Sipi(sipi, con.get_token())
-
-    factory = ResourceInstanceFactory(con, shortcode)
+    factory = ResourceInstanceFactory(con, shortcode, snapshot=schema_snapshot)
 
     permissions_lookup: Dict[str, Permissions] = {}
     for key, perm in permissions.items():
@@ -596,20 +848,122 @@ def xml_upload(input_file: str,
 
     resclassnames = factory.get_resclass_names()
     resclasses: Dict[str, type] = {}
+    required_props: Dict[str, Set[str]] = {}
     for resclassname in resclassnames:
         resclasses[resclassname] = factory.get_resclass(resclassname)
-    resiri_lookup: StrDict = {}
+        required_props[resclassname] = {name for name, propinfo in resclasses[resclassname].properties.items()
+                                        if propinfo.cardinality in (Cardinality.C_1, Cardinality.C_1_n)}
 
-    for resource in resources:
-        if resource.image:
-            img = sipi.upload_image(os.path.join(imgdir, resource.image))
-            stillimage = img['uploadedFiles'][0]['internalFilename']
-        else:
-            stillimage = None
-        instance = resclasses[resource.restype](con=con,
-                                                label=resource.label,
-                                                permissions=permissions_lookup.get(resource.permissions),
-                                                stillimage=stillimage,
-                                                values=resource.get_propvals(resiri_lookup, permissions_lookup)).create()
-        resiri_lookup[resource.id] = instance.iri
-        print("Created:", instance.iri)
+    #
+    # build the reference graph of the resources and check it for cycles and dangling references
+    #
+    if two_phase and not stream:
+        dangling = ResourceGraph(resources).dangling
+        if dangling:
+            raise ResourceGraphError([], dangling)
+        for resource in resources:
+            resource.defer_links(required_props[resource.restype])
+    if not stream:
+        graph = ResourceGraph(resources)
+        ordered = graph.sort()
+
+    #
+    # every completed step is recorded in the journal, a resumed upload skips them
+    #
+    with UploadJournal(input_file + '.journal', server, resume, restart) as journal:
+        resiri_lookup = IriLookup(journal.resources)
+        if resume:
+            print("Resuming upload, {} resources have been created already".format(len(resiri_lookup)))
+
+        def upload_image(path: str) -> str:
+            stillimage = journal.get_image(path)
+            if stillimage is None:
+                img = sipi.upload_image(path)
+                stillimage = img['uploadedFiles'][0]['internalFilename']
+                journal.add_image(path, stillimage)
+            return stillimage
+
+        #
+        # the images are uploaded by the pipeline ahead of the creation of their resources
+        #
+        sipi = Sipi(sipi, con.get_token(), pool_maxsize=max(image_workers, 10))
+        pipeline = ImagePipeline(upload_image, workers=image_workers, queue_size=image_queue, max_bytes=image_budget)
+        images: Dict[str, Future] = {}
+
+        def create_resource(resource: KnoraResource) -> str:
+            try:
+                instance = resclasses[resource.restype](con=con,
+                                                        label=resource.label,
+                                                        permissions=permissions_lookup.get(resource.permissions),
+                                                        stillimage=images[resource.id].result() if resource.image else None,
+                                                        values=resource.get_propvals(resiri_lookup, permissions_lookup)).create()
+            finally:
+                pipeline.done(resource.id)
+                images.pop(resource.id, None)
+            journal.add_resource(resource.id, instance.iri)
+            print("Created:", instance.iri)
+            return instance.iri
+
+        def add_links(resource: KnoraResource) -> None:
+            stillimage = journal.get_image(os.path.join(imgdir, resource.image)) if resource.image else None
+            instance = resclasses[resource.restype](con=con,
+                                                    iri=resiri_lookup[resource.id],
+                                                    label=resource.label,
+                                                    stillimage=stillimage)
+            for index, (propname, value) in enumerate(resource.get_links(resiri_lookup, permissions_lookup)):
+                if not journal.has_link(resource.id, index):
+                    journal.add_link(resource.id, index, instance.createValue(propname, value))
+            print("Linked:", instance.iri)
+
+        def read_resources() -> Iterator[KnoraResource]:
+            for resource in reader.resources():
+                if two_phase:
+                    resource.defer_links(required_props[resource.restype])
+                    if resource.has_links:
+                        # only the deferred links are kept for the link phase, in the journal
+                        journal.add_deferred_links(resource.id, resource.to_link_record())
+                yield resource
+
+        def read_deferred_links() -> Iterator[KnoraResource]:
+            for resid, record in journal.deferred_links():
+                yield KnoraResource.from_link_record(resid, record)
+
+        def prepare(resource: KnoraResource) -> Optional[Future]:
+            if not resource.image:
+                return None
+            images[resource.id] = pipeline.submit(resource.id, os.path.join(imgdir, resource.image))
+            return images[resource.id]
+
+        # the pipeline and the pool of the scheduler are shut down on leaving their with blocks, the
+        # pooled connections to SIPI are closed on any exit as well
+        try:
+            with pipeline:
+                if stream:
+                    # the images are submitted as soon as their resources are ready to be created
+                    pipeline.start()
+                    UploadScheduler(jobs).run_stream(read_resources(), create_resource, resiri_lookup, window, prepare)
+                else:
+                    images = pipeline.start([(r.id, os.path.join(imgdir, r.image)) for r in ordered
+                                             if r.image and r.id not in resiri_lookup])
+                    UploadScheduler(jobs).run(graph, create_resource, resiri_lookup, images)
+        finally:
+            sipi.close()
+        if two_phase:
+            if stream:
+                dangling = {}
+                for resource in read_deferred_links():
+                    refs = [ref for ref in resource.get_link_refs() if ref not in resiri_lookup and not IriTest.test(ref)]
+                    if refs:
+                        dangling[resource.id] = refs
+                if dangling:
+                    raise ResourceGraphError([], dangling)
+            # the values of one resource are added sequentially, different resources concurrently. In
+            # streaming mode, no more than window resources are read back from the journal at a time
+            linked = read_deferred_links() if stream else (r for r in resources if r.has_links)
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='LinkPhase') as executor:
+                while True:
+                    chunk = list(islice(linked, window))
+                    if not chunk:
+                        break
+                    list(executor.map(add_links, chunk))
+    return True
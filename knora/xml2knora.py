@@ -10,6 +10,8 @@ import sys
 import requests
 import re
 from knora import KnoraError, KnoraStandoffXml, Knora, Sipi
+from dsplib.utils.resource_graph import ResourceGraph
+from dsplib.utils.xml_upload import load_xmlschema, free_element
 
 #==============================================================================
 # Some type defitions
@@ -443,55 +445,14 @@ def create_permission(con: Knora, permission: Permission) -> str:
 def do_sortorder(resources: List[KnoraResource]) -> List[KnoraResource]:
     """
     Sort the list of resources such that resources that reference other resources are
-    added after the referenced resources. It will fail with an error if there are circular
-    references.
+    added after the referenced resources. The reference graph is built once and sorted in
+    linear time. If there are circular or dangling references, a ResourceGraphError is raised
+    that lists all of them.
 
     :param resources: List of resources before sorting
     :return: Sorted list of resources
     """
-    #
-    # here we sort the resources according to outgoing resptrs
-    #
-    ok_resources: [KnoraResource] = []
-    notok_resources: [KnoraResource] = []
-    ok_resids : [str] = []
-    cnt = 0
-    notok_len = 9999999
-    while len(resources) > 0 and cnt < 10000:
-        for resource in resources:
-            resptrs = resource.get_resptrs()
-            if len(resptrs) == 0:
-                ok_resources.append(resource)
-                ok_resids.append(resource.unique_id)
-            else:
-                ok = True
-                for resptr in resptrs:
-                    if resptr in ok_resids:
-                        pass
-                    else:
-                        ok = False;
-                if ok:
-                    ok_resources.append(resource)
-                    ok_resids.append(resource.unique_id)
-                else:
-                    notok_resources.append(resource)
-        resources = notok_resources
-        if not len(notok_resources) < notok_len:
-            print('Cannot resolve resptr dependencies. Giving up....')
-            print(len(notok_resources))
-            for r in notok_resources:
-                print('Resource {} has unresolvable resptrs to: '.format(r.unique_id), end= ' ')
-                for x in r.get_resptrs():
-                    print(x, end=' ')
-                print('')
-                print('=============')
-            exit(5)
-        notok_len = len(notok_resources)
-        notok_resources = []
-        cnt += 1
-        print('{}. Ordering pass Finished!'.format(cnt))
-    print('Remaining: {}'.format(len(resources)))
-    return ok_resources
+    return ResourceGraph(resources, key=lambda r: r.unique_id).sort()
 
 def program(args) -> None:
     """
@@ -542,40 +503,34 @@ def program(args) -> None:
     else:
         infile_path = args.infile
 
-    xmlschema_doc = etree.parse(os.path.join(current_dir, 'knora-data-schema.xsd'))
-    xmlschema = etree.XMLSchema(xmlschema_doc)
-    doc = etree.parse(infile_path)
-    xmlschema.assertValid(doc)
-
-    del xmlschema
-    del doc
-    del xmlschema_doc
-
-    print("The imput data file is syntactically correct and passed validation!")
-
-    if args.validate:
-        exit(0)
-
     #
-    # read the XML file containing the data, including project shortcode
+    # read the XML file containing the data, including project shortcode. The file is validated
+    # against the (cached) schema while it is parsed, the parse stops at the first validation
+    # error. Processed elements are released
     #
-    context: etree.iterparse = etree.iterparse(infile_path, events=("start", "end"))
+    context: etree.iterparse = etree.iterparse(infile_path, events=("start", "end"),
+                                               schema=load_xmlschema(os.path.join(current_dir, 'knora-data-schema.xsd')))
     resources: List[KnoraResource] = []
     permissions: Dict[str,Permission] = {}
-    while True:
-        event, node = next(context)
+    for event, node in context:
+        if len(context.error_log) > 0 and context.error_log.filter_from_errors():
+            raise etree.DocumentInvalid(context.error_log.filter_from_errors()[0].message, context.error_log)
         if event == 'start':
             if node.tag == 'knora':
                 ontology = node.attrib['ontology']
                 shortcode = node.attrib['shortcode']
-            elif event == 'start' and node.tag == 'resource':
+            elif node.tag == 'resource':
                 resources.append(KnoraResource(context, node))
-            elif event == 'start' and node.tag == 'permissions':
+                free_element(node)
+            elif node.tag == 'permissions':
                 permission = Permission(context, node)
                 permissions[permission.id] = permission
-        elif event == 'end':
-            if node.tag == 'knora':
-                break;
+                free_element(node)
+
+    print("The imput data file is syntactically correct and passed validation!")
+
+    if args.validate:
+        exit(0)
 
     context = None  # delete XML tree tto save memory
 
@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Tuple, Optional, Any, Callable, Union
+from urllib.parse import urlsplit, unquote
+
+"""
+A minimal local stand-in for a DSP-API server. It is used by the tests and the benchmarks that must run
+without a complete DSP stack.
+
+A route maps (method, path) to either a python object that is returned as JSON with status 200, or to a
+callable with the signature ``handler(method, path, query, body) -> (status, python object)``. The path
+is matched URL-decoded and without the query string. All requests are recorded in ``requests``.
+"""
+
+RouteHandler = Callable[[str, str, str, Optional[bytes]], Tuple[int, Any]]
+
+
+class StubServer:
+    """
+    A local HTTP/1.1 (keep-alive) server which answers with canned JSON responses
+    """
+    _routes: Dict[Tuple[str, str], Union[Any, RouteHandler]]
+    _default: Optional[RouteHandler]
+    _delay: float
+    _httpd: Optional[ThreadingHTTPServer]
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+    requests: List[Tuple[str, str, Dict[str, str]]]
+    connections: int
+
+    def __init__(self,
+                 routes: Optional[Dict[Tuple[str, str], Union[Any, RouteHandler]]] = None,
+                 default: Optional[RouteHandler] = None,
+                 delay: float = 0.0):
+        """
+        :param routes: Dict of (method, path) -> response object or handler
+        :param default: Handler used for requests that do not match any route (default: status 404)
+        :param delay: Artificial server latency in seconds per request
+        """
+        self._routes = dict(routes) if routes else {}
+        self._routes.setdefault(('POST', '/v2/authentication'), {'token': 'stub-token'})
+        self._routes.setdefault(('DELETE', '/v2/authentication'), {'message': 'credentials removed'})
+        self._default = default
+        self._delay = delay
+        self._httpd = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.requests = []
+        self.connections = 0
+
+    def add_route(self, method: str, path: str, response: Union[Any, RouteHandler]) -> None:
+        self._routes[(method, path)] = response
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self) -> 'StubServer':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self, method: str):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length > 0 else None
+                parts = urlsplit(self.path)
+                path = unquote(parts.path)
+                with stub._lock:
+                    stub.requests.append((method, self.path, dict(self.headers)))
+                if stub._delay > 0.0:
+                    time.sleep(stub._delay)
+                route = stub._routes.get((method, path))
+                if route is None:
+                    if stub._default is not None:
+                        status, obj = stub._default(method, path, parts.query, body)
+                    else:
+                        status, obj = 404, {'error': 'no route for {} {}'.format(method, path)}
+                elif callable(route):
+                    status, obj = route(method, path, parts.query, body)
+                else:
+                    status, obj = 200, route
+                data = json.dumps(obj).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'StubServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
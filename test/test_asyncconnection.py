@@ -0,0 +1,131 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+import unittest
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError
+from dsplib.models.asyncconnection import AsyncConnection
+from dsplib.models.connection import Connection
+from dsplib.models.langstring import Languages, LangString
+from dsplib.models.listnode import ListNode
+from stub_server import StubServer
+
+
+class TestAsyncConnection(unittest.TestCase):
+    listinfo = {
+        'id': 'http://rdfh.ch/lists/0001/treeList',
+        'projectIri': 'http://rdfh.ch/projects/0001',
+        'name': 'treelistroot',
+        'labels': [{'value': 'Listenwurzel', 'language': 'de'}],
+        'comments': [],
+        'isRootNode': True
+    }
+    children = [
+        {
+            'id': 'http://rdfh.ch/lists/0001/treeList01',
+            'name': 'Tree list node 01',
+            'labels': [{'value': 'Tree list node 01', 'language': 'en'}],
+            'comments': [],
+            'children': [
+                {
+                    'id': 'http://rdfh.ch/lists/0001/treeList10',
+                    'name': 'Tree list node 10',
+                    'labels': [{'value': 'Tree list node 10', 'language': 'en'}],
+                    'comments': [],
+                }
+            ]
+        }
+    ]
+
+    def test_AsyncConnection(self):
+        acon = AsyncConnection('http://0.0.0.0:3333')
+        self.assertIsInstance(acon, AsyncConnection)
+        self.assertIsInstance(acon.connection, Connection)
+        acon.close()
+
+    def test_loginout(self):
+        async def run(acon: AsyncConnection):
+            await acon.login('root@example.com', 'test')
+            self.assertEqual(acon.token, 'stub-token')
+            await acon.logout()
+            self.assertIsNone(acon.token)
+
+        with StubServer() as stub:
+            acon = AsyncConnection(stub.url)
+            asyncio.run(run(acon))
+            acon.close()
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        inflight = {'current': 0, 'max': 0}
+
+        def handler(method, path, query, body):
+            with lock:
+                inflight['current'] += 1
+                inflight['max'] = max(inflight['max'], inflight['current'])
+            time.sleep(0.05)
+            with lock:
+                inflight['current'] -= 1
+            return 200, {'path': path}
+
+        async def run(acon: AsyncConnection):
+            return await asyncio.gather(*[acon.get('/v2/resources/res{}'.format(i)) for i in range(40)])
+
+        with StubServer(default=handler) as stub:
+            acon = AsyncConnection(stub.url, concurrency=8)
+            start = time.perf_counter()
+            results = asyncio.run(run(acon))
+            duration = time.perf_counter() - start
+            acon.close()
+        self.assertEqual([r['path'] for r in results], ['/v2/resources/res{}'.format(i) for i in range(40)])
+        self.assertLessEqual(inflight['max'], 8)
+        self.assertGreater(inflight['max'], 1)
+        self.assertLess(duration, 40 * 0.05)
+
+    def test_error(self):
+        with StubServer() as stub:
+            acon = AsyncConnection(stub.url)
+            with self.assertRaises(BaseError):
+                asyncio.run(acon.get('/gagaga'))
+            acon.close()
+
+    def test_ListNode_getAllNodesAsync(self):
+        routes = {
+            ('GET', '/admin/lists/http://rdfh.ch/lists/0001/treeList'): {
+                'list': {'listinfo': self.listinfo, 'children': self.children}
+            }
+        }
+        with StubServer(routes=routes) as stub:
+            acon = AsyncConnection(stub.url)
+            root = asyncio.run(ListNode(con=acon.connection, id='http://rdfh.ch/lists/0001/treeList').getAllNodesAsync(acon))
+            acon.close()
+        self.assertEqual(root.name, 'treelistroot')
+        self.assertEqual(root.children[0].name, 'Tree list node 01')
+        self.assertEqual(root.children[0].children[0].id, 'http://rdfh.ch/lists/0001/treeList10')
+
+    def test_ListNode_createAsync(self):
+        def handler(method, path, query, body):
+            req = json.loads(body)
+            listinfo = dict(self.listinfo, name=req['name'], labels=[{'value': 'root node 1', 'language': 'de'}])
+            return 200, {'list': {'listinfo': listinfo}}
+
+        with StubServer(routes={('POST', '/admin/lists'): handler}) as stub:
+            acon = AsyncConnection(stub.url)
+            node = ListNode(
+                con=acon.connection,
+                project='http://rdfh.ch/projects/0001',
+                label=LangString({Languages.DE: "root node 1"}),
+                name="test_node_1"
+            )
+            node = asyncio.run(node.createAsync(acon))
+            acon.close()
+        self.assertEqual(node.name, 'test_node_1')
+        self.assertEqual(node.label['de'], 'root node 1')
+
+
+if __name__ == '__main__':
+    unittest.main()
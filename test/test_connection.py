@@ -7,6 +7,7 @@ sys.path.append("../knora")
 
 from dsplib.models.helpers import BaseError
 from dsplib.models.connection import Connection
+from stub_server import StubServer
 
 
 class TestConnection(unittest.TestCase):
@@ -80,6 +81,20 @@ class TestConnection(unittest.TestCase):
     def test_delete(self):
         pass
 
+    def test_keepalive(self):
+        with StubServer(routes={('GET', '/v2/gaga'): {'gaga': 'gugus'}}) as stub:
+            con = Connection(stub.url)
+            con.login('root@example.com', 'test')
+            for i in range(10):
+                res = con.get('/v2/gaga')
+                self.assertEqual(res['gaga'], 'gugus')
+            self.assertEqual(stub.requests[-1][2]['Authorization'], 'Bearer stub-token')
+            con.logout()
+            con.get('/v2/gaga')
+            self.assertNotIn('Authorization', stub.requests[-1][2])
+            self.assertEqual(stub.connections, 1)
+            con.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import pickle
+import sys
+import unittest
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError, Context, OntoInfo
+
+
+class TestContext(unittest.TestCase):
+
+    def test_resolve(self):
+        context = Context({'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'})
+        thing = 'http://0.0.0.0:3333/ontology/0001/anything/v2#Thing'
+        for _ in range(2):  # the second time from the caches
+            self.assertEqual(context.get_prefixed_iri(thing), 'anything:Thing')
+            self.assertEqual(context.get_prefixed_iri('anything:Thing'), 'anything:Thing')
+            self.assertEqual(context.get_qualified_iri('anything:Thing'), thing)
+            self.assertEqual(context.get_qualified_iri(thing), thing)
+            self.assertEqual(context.prefix_from_iri('http://0.0.0.0:3333/ontology/0001/anything/v2#'), 'anything')
+            self.assertEqual(context.reduce_iri(thing, 'anything'), ':Thing')
+            self.assertEqual(context.reduce_iri('http://api.knora.org/ontology/knora-api/v2#Resource'), 'Resource')
+        with self.assertRaises(BaseError):
+            context.get_prefixed_iri('http://0.0.0.0:3333/ontology/0001/unknown/v2#Thing')
+        with self.assertRaises(BaseError):
+            context.get_qualified_iri('unknown:Thing')
+
+    def test_common_ontologies(self):
+        context = Context()
+        self.assertEqual(context.get_prefixed_iri('http://purl.org/dc/terms/title'), 'dcterms:title')
+        self.assertEqual(context.rcontext['http://purl.org/dc/terms/'], 'dcterms')
+        self.assertEqual(context.get_qualified_iri('foaf:name'), 'http://xmlns.com/foaf/0.1/name')
+        self.assertEqual(context.prefix_from_iri('http://www.w3.org/2004/02/skos/core#'), 'skos')
+        self.assertEqual(context.prefix_from_iri('http://0.0.0.0:3333/ontology/0001/images/v2#'), 'images')
+        self.assertEqual(context['images'], OntoInfo('http://0.0.0.0:3333/ontology/0001/images/v2', True))
+        context.add_context('bibo')
+        self.assertIn('bibo', context)
+        self.assertEqual(Context.common_ontologies['foaf'].iri, 'http://xmlns.com/foaf/0.1/')
+
+    def test_invalidation(self):
+        context = Context({'onto': 'http://0.0.0.0:3333/ontology/0001/first/v2#'})
+        self.assertEqual(context.get_qualified_iri('onto:Thing'), 'http://0.0.0.0:3333/ontology/0001/first/v2#Thing')
+        context.add_context('onto', 'http://0.0.0.0:3333/ontology/0001/second/v2#')
+        self.assertEqual(context.get_qualified_iri('onto:Thing'), 'http://0.0.0.0:3333/ontology/0001/second/v2#Thing')
+        context['onto'] = OntoInfo('http://0.0.0.0:3333/ontology/0001/third/', False)
+        self.assertEqual(context.get_qualified_iri('onto:Thing'), 'http://0.0.0.0:3333/ontology/0001/third/Thing')
+        self.assertEqual(context.get_prefixed_iri('http://0.0.0.0:3333/ontology/0001/third/Thing'), 'onto:Thing')
+        del context['onto']
+        with self.assertRaises(BaseError):
+            context.get_qualified_iri('onto:Thing')
+        with self.assertRaises(BaseError):
+            context.get_prefixed_iri('http://0.0.0.0:3333/ontology/0001/third/Thing')
+
+    def test_cache_size(self):
+        context = Context({'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'})
+        context.cache_size = 2
+        for name in ('A', 'B', 'A', 'C'):
+            context.get_qualified_iri('anything:' + name)
+        self.assertEqual(list(context._qualified), ['anything:A', 'anything:C'])
+
+    def test_pickle(self):
+        context = Context({'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'})
+        context.get_qualified_iri('anything:Thing')
+        self.assertEqual(context.system_prefixes.knora_api, 'knora-api')
+        self.assertFalse({'_prefixes', '_prefixed', '_qualified', '_system_prefixes'} & set(context.__getstate__()))
+        restored = pickle.loads(pickle.dumps(context))
+        self.assertEqual(len(restored._qualified), 0)
+        self.assertEqual(restored.get_prefixed_iri('http://0.0.0.0:3333/ontology/0001/anything/v2#Thing'),
+                         'anything:Thing')
+        self.assertEqual(restored.system_prefixes, context.system_prefixes)
+        restored.add_context('other', 'http://0.0.0.0:3333/ontology/0001/other/v2#')
+        self.assertEqual(restored.get_qualified_iri('other:Thing'), 'http://0.0.0.0:3333/ontology/0001/other/v2#Thing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import re
+import sys
+import unittest
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.append("../knora")
+
+from dsplib.models.connection import Connection
+from dsplib.models.gravsearch import GravsearchQuery
+from dsplib.models.helpers import BaseError, OntoInfo
+from stub_server import StubServer
+
+
+class TestGravsearch(unittest.TestCase):
+    context = {'anything': OntoInfo('http://0.0.0.0:3333/ontology/0001/anything/v2', True)}
+
+    def test_build(self):
+        query = GravsearchQuery('anything:Thing', self.context) \
+            .values('anything:hasText') \
+            .where('anything:hasInteger', 42, '>=') \
+            .where('anything:hasDecimal', 1.5) \
+            .link('anything:hasOtherThing', 'http://rdfh.ch/0001/other')
+        self.assertEqual(query.build(3), '\n'.join([
+            'PREFIX knora-api: <http://api.knora.org/ontology/knora-api/v2#>',
+            'PREFIX anything: <http://0.0.0.0:3333/ontology/0001/anything/v2#>',
+            'PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>',
+            'CONSTRUCT {',
+            '  ?mainres knora-api:isMainResource true .',
+            '  ?mainres anything:hasText ?r0 .',
+            '} WHERE {',
+            '  ?mainres a knora-api:Resource .',
+            '  ?mainres a anything:Thing .',
+            '  ?mainres anything:hasInteger ?v1 .',
+            '  ?v1 knora-api:intValueAsInt ?v2 .',
+            '  FILTER(?v2 >= 42)',
+            '  ?mainres anything:hasDecimal ?v3 .',
+            '  ?v3 knora-api:decimalValueAsDecimal ?v4 .',
+            '  FILTER(?v4 = "1.5"^^xsd:decimal)',
+            '  ?mainres anything:hasOtherThing <http://rdfh.ch/0001/other> .',
+            '  OPTIONAL { ?mainres anything:hasText ?r0 . }',
+            '}',
+            'OFFSET 3',
+            '']))
+        self.assertNotIn('OFFSET', query.build(None))
+        self.assertIn('FILTER(?v2 = "say \\"hi\\"")',
+                      GravsearchQuery('anything:Thing', self.context).where('anything:hasText', 'say "hi"').build())
+        with self.assertRaises(BaseError):
+            GravsearchQuery('unknown:Thing', self.context)
+        with self.assertRaises(BaseError):
+            GravsearchQuery('anything:Thing', self.context).where('anything:hasText', 'x', 'LIKE')
+
+    @staticmethod
+    def search_handler(nresults: int, pagesize: int):
+        def handler(method: str, path: str, query: str, body: Optional[bytes]) -> Tuple[int, Any]:
+            gravsearch = body.decode('utf-8')
+            if path == '/v2/searchextended/count':
+                return 200, {'schema:numberOfItems': nresults}
+            page = int(re.search(r'OFFSET (\d+)', gravsearch).group(1))
+            iris = ['http://rdfh.ch/0001/thing{}'.format(i)
+                    for i in range(page * pagesize, min((page + 1) * pagesize, nresults))]
+            result: Dict[str, Any] = {'@graph': [{'@id': iri, '@type': 'anything:Thing'} for iri in iris]}
+            if (page + 1) * pagesize < nresults:
+                result['knora-api:mayHaveMoreResults'] = True
+            return 200, result
+        return handler
+
+    def test_pages(self):
+        query = GravsearchQuery('anything:Thing', self.context)
+        with StubServer(default=self.search_handler(53, 10)) as stub:
+            con = Connection(stub.url)
+            self.assertEqual(query.count(con), 53)
+            self.assertIn('sparql-query', stub.requests[-1][2]['Content-Type'])
+            for prefetch in (0, 2):
+                stub.requests.clear()
+                pages = list(query.pages(con, prefetch=prefetch))
+                self.assertEqual([len(page) for page in pages], [10, 10, 10, 10, 10, 3])
+                self.assertEqual(pages[5][2]['@id'], 'http://rdfh.ch/0001/thing52')
+                self.assertLessEqual(len(stub.requests), 6 + prefetch)
+
+            # stopping early does not read the remaining pages
+            stub.requests.clear()
+            pages = query.pages(con, prefetch=1)
+            next(pages)
+            pages.close()
+            self.assertLessEqual(len(stub.requests), 2)
+            con.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from typing import List
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError
+from dsplib.utils.image_pipeline import ImagePipeline
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
+
+
+class Res:
+    def __init__(self, id: str, resptrs: List[str]):
+        self.id = id
+        self.resptrs = resptrs
+
+    def get_resptrs(self) -> List[str]:
+        return self.resptrs
+
+
+class TestImagePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(12):
+            path = os.path.join(self.tmpdir.name, 'img{}.tif'.format(i))
+            with open(path, 'wb') as f:
+                f.write(b'x' * 1000)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_upload(self):
+        def upload(path: str) -> str:
+            time.sleep(0.01)
+            return os.path.basename(path) + '.jp2'
+
+        with ImagePipeline(upload, workers=4) as pipeline:
+            futures = pipeline.start([('res{}'.format(i), path) for i, path in enumerate(self.paths)])
+            self.assertEqual(futures['res3'].result(), 'img3.tif.jp2')
+            self.assertEqual(futures['res11'].result(), 'img11.tif.jp2')
+
+    def test_limits(self):
+        lock = threading.Lock()
+        state = {'uploaded': 0, 'inflight': 0, 'max_inflight': 0}
+
+        def upload(path: str) -> str:
+            with lock:
+                state['inflight'] += 1
+                state['max_inflight'] = max(state['max_inflight'], state['inflight'])
+            time.sleep(0.01)
+            with lock:
+                state['inflight'] -= 1
+                state['uploaded'] += 1
+            return path
+
+        with ImagePipeline(upload, workers=4, queue_size=3, max_bytes=2000) as pipeline:
+            futures = pipeline.start([('res{}'.format(i), path) for i, path in enumerate(self.paths)])
+            time.sleep(0.1)
+            self.assertEqual(state['uploaded'], 3)  # nothing has been consumed
+            self.assertLessEqual(state['max_inflight'], 2)  # byte budget of two files
+            for i in range(12):
+                futures['res{}'.format(i)].result()
+                pipeline.done('res{}'.format(i))
+        self.assertEqual(state['uploaded'], 12)
+        self.assertEqual(pipeline.bytes_in_flight, 0)
+
+    def test_scheduler(self):
+        def upload(path: str) -> str:
+            if path.endswith('img2.tif'):
+                time.sleep(0.1)
+            return os.path.basename(path)
+
+        resources = [Res('res{}'.format(i), ['res{}'.format(i - 1)] if i == 3 else []) for i in range(5)]
+        created = []
+
+        with ImagePipeline(upload, workers=2) as pipeline:
+            images = pipeline.start([(r.id, self.paths[i]) for i, r in enumerate(resources)])
+
+            def create(resource: Res) -> str:
+                self.assertTrue(images[resource.id].done())
+                created.append(resource.id)
+                pipeline.done(resource.id)
+                return 'http://rdfh.ch/0001/' + resource.id
+
+            UploadScheduler(jobs=2).run(resources, create, IriLookup(), images)
+        self.assertEqual(sorted(created), ['res0', 'res1', 'res2', 'res3', 'res4'])
+        self.assertGreater(created.index('res3'), created.index('res4'))  # res3 waits for res2
+
+    def test_error(self):
+        def upload(path: str) -> str:
+            raise BaseError('SIPI-ERROR')
+
+        resources = [Res('res0', []), Res('res1', ['res0'])]
+        lookup = IriLookup()
+        with ImagePipeline(upload) as pipeline:
+            images = pipeline.start([('res0', self.paths[0])])
+            with self.assertRaises(BaseError):
+                UploadScheduler(jobs=2).run(resources, lambda r: 'http://rdfh.ch/0001/' + r.id, lookup, images)
+        self.assertEqual(len(lookup), 0)
+
+    def test_prerequisites(self):
+        future = Future()
+        resources = [Res('a', []), Res('b', [])]
+        created = []
+
+        def create(resource: Res) -> str:
+            created.append(resource.id)
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        threading.Timer(0.05, future.set_result, ('done',)).start()
+        UploadScheduler(jobs=1).run(resources, create, IriLookup(), {'a': future})
+        self.assertEqual(created, ['b', 'a'])
+
+    def test_submit(self):
+        resources = [Res('res0', ['res1']), Res('res1', []), Res('res2', ['res0'])]
+        images = {}
+
+        with ImagePipeline(lambda path: os.path.basename(path), workers=2, queue_size=1) as pipeline:
+            pipeline.start()
+
+            def prepare(resource: Res) -> Future:
+                images[resource.id] = pipeline.submit(resource.id, self.paths[int(resource.id[3:])])
+                return images[resource.id]
+
+            def create(resource: Res) -> str:
+                self.assertEqual(images[resource.id].result(), 'img{}.tif'.format(resource.id[3:]))
+                pipeline.done(resource.id)
+                return 'http://rdfh.ch/0001/' + resource.id
+
+            lookup = IriLookup()
+            UploadScheduler(jobs=2).run_stream(resources, create, lookup, prepare=prepare)
+        self.assertEqual(len(lookup), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
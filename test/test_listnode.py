@@ -2,7 +2,9 @@ import unittest
 
 from dsplib.models.connection import Connection
 from dsplib.models.langstring import Languages, LangStringParam, LangString
-from dsplib.models.listnode import ListNode
+from dsplib.models.helpers import BaseError
+from dsplib.models.listnode import ListNode, ListIndex, CompactList
+from dsplib.models.value import ListValue
 
 
 class TestListNode(unittest.TestCase):
@@ -161,5 +163,73 @@ class TestListNode(unittest.TestCase):
         #self.assertTrue(False)
 
 
+    def test_ListIndex(self):
+        """
+        Resolve list nodes by name and by path without a server
+        :return: None
+        """
+        con = Connection('http://0.0.0.0:3333')
+
+        def node(name: str, children=None) -> ListNode:
+            return ListNode(con=con, id='http://rdfh.ch/lists/0001/' + name, name=name, children=children)
+
+        treelist = ListNode(con=con, id='http://rdfh.ch/lists/0001/treelist', name='treelist', children=[
+            node('a', [node('a1'), node('x')]),
+            node('b', [ListNode(con=con, id='http://rdfh.ch/lists/0001/bx', name='x')])
+        ])
+        index = ListIndex([treelist])
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.get('treelist', 'a1'), 'http://rdfh.ch/lists/0001/a1')
+        self.assertEqual(index.get('treelist', 'x'), 'http://rdfh.ch/lists/0001/x')
+        self.assertEqual(index.get('treelist', 'b/x'), 'http://rdfh.ch/lists/0001/bx')
+        self.assertIsNone(index.get('otherlist', 'a1'))
+
+        self.assertEqual(ListValue('treelist:a1', lists=index).value, 'http://rdfh.ch/lists/0001/a1')
+        self.assertEqual(ListValue('treelist:b/x', lists=[treelist]).value, 'http://rdfh.ch/lists/0001/bx')
+        self.assertEqual(ListValue('http://rdfh.ch/lists/0001/b').value, 'http://rdfh.ch/lists/0001/b')
+        with self.assertRaises(BaseError):
+            ListValue('treelist:gaga', lists=index)
+
+
+    def test_CompactList(self):
+        """
+        Build a CompactList from the JSON returned by "/admin/lists/<iri>" without a server
+        :return: None
+        """
+        def node(name: str, children=None):
+            return {'id': 'http://rdfh.ch/lists/0001/' + name, 'name': name,
+                    'labels': [{'value': 'Node ' + name, 'language': 'en'}], 'comments': [],
+                    'children': children or []}
+
+        result = {'list': {
+            'listinfo': {'id': 'http://rdfh.ch/lists/0001/treelist', 'name': 'treelist',
+                         'projectIri': self.project, 'labels': [{'value': 'Tree list', 'language': 'en'}],
+                         'comments': []},
+            'children': [node('a', [node('a1'), node('a2', [node('a21')])]), node('b')]
+        }}
+        compact = CompactList.fromJsonObj(result)
+        self.assertEqual(len(compact), 6)
+        self.assertEqual(compact.name, 'treelist')
+        self.assertEqual([compact.node_name(i) for i in compact.subtree()],
+                         ['treelist', 'a', 'a1', 'a2', 'a21', 'b'])
+        self.assertEqual([compact.node_name(i) for i in compact.children(1)], ['a1', 'a2'])
+        self.assertEqual(compact.find('a/a2/a21'), 4)
+        self.assertIsNone(compact.find('a/b'))
+        self.assertEqual(compact.path(4), 'a/a2/a21')
+        self.assertEqual(compact.label(3)['en'], 'Node a2')
+        self.assertEqual(compact.createDefinitionFileObj(1), {
+            'name': 'a', 'labels': {'en': 'Node a'},
+            'nodes': [{'name': 'a1', 'labels': {'en': 'Node a1'}},
+                      {'name': 'a2', 'labels': {'en': 'Node a2'}, 'nodes': [{'name': 'a21', 'labels': {'en': 'Node a21'}}]}]
+        })
+
+        root = compact.toListNode(Connection('http://0.0.0.0:3333'))
+        self.assertTrue(root.isRootNode)
+        self.assertEqual([n.name for n in root.children], ['a', 'b'])
+        self.assertEqual(root.children[0].children[1].parent, 'http://rdfh.ch/lists/0001/a')
+        self.assertEqual(root.createDefinitionFileObj(), compact.createDefinitionFileObj())
+        self.assertEqual(ListIndex([compact]).get('treelist', 'a/a2/a21'), 'http://rdfh.ch/lists/0001/a21')
+
+
 if __name__ == '__main__':
     unittest.main()
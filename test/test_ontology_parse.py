@@ -0,0 +1,69 @@
+import sys
+import unittest
+from typing import Any, Dict
+
+sys.path.append("../knora")
+
+from dsplib.models.connection import Connection
+from dsplib.models.helpers import Cardinality, Context, SystemPrefixes
+from dsplib.models.ontology import Ontology
+
+ONTO_IRI = 'http://0.0.0.0:3333/ontology/0001/onto/v2'
+
+
+class TestOntologyParse(unittest.TestCase):
+
+    @staticmethod
+    def ontology(nclasses: int) -> Dict[str, Any]:
+        graph = [{'@id': 'onto:Standoff', '@type': 'owl:Class', 'knora-api:isStandoffClass': True},
+                 {'@id': 'onto:hasText', '@type': 'owl:ObjectProperty', 'knora-api:isResourceProperty': True,
+                  'knora-api:objectType': {'@id': 'knora-api:TextValue'},
+                  'rdfs:subPropertyOf': {'@id': 'knora-api:hasValue'},
+                  'salsah-gui:guiAttribute': ['size=80', 'maxlength=255'],
+                  'rdfs:label': [{'@language': 'en', '@value': 'Text'}]}]
+        for i in range(nclasses):
+            graph.append({'@id': 'onto:Class{}'.format(i), '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+                          'rdfs:label': [{'@language': 'en', '@value': 'Class {}'.format(i)}],
+                          'rdfs:subClassOf': [{'@id': 'knora-api:Resource'},
+                                              {'@type': 'owl:Restriction', 'owl:minCardinality': 1,
+                                               'owl:onProperty': {'@id': 'onto:hasText'},
+                                               'salsah-gui:guiOrder': i}]})
+        return {'@id': ONTO_IRI, '@type': 'owl:Ontology', 'rdfs:label': 'Onto',
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                '@graph': graph,
+                '@context': {'knora-api': 'http://api.knora.org/ontology/knora-api/v2#',
+                             'salsah-gui': 'http://api.knora.org/ontology/salsah-gui/v2#',
+                             'onto': ONTO_IRI + '#'}}
+
+    def test_system_prefixes(self):
+        context = Context()
+        self.assertEqual(context.system_prefixes,
+                         SystemPrefixes('rdf', 'rdfs', 'owl', 'xsd', 'knora-api', 'salsah-gui'))
+        self.assertIs(context.system_prefixes, context.system_prefixes)
+        context.add_context('api', 'http://api.knora.org/ontology/knora-api/v2#')
+        self.assertEqual(context.system_prefixes.knora_api, 'api')
+
+    def test_classify_graph(self):
+        graph = self.ontology(3)['@graph']
+        resclasses, standoffclasses, properties = Ontology.classify_graph(graph, 'knora-api')
+        self.assertEqual([e['@id'] for e in resclasses], ['onto:Class0', 'onto:Class1', 'onto:Class2'])
+        self.assertEqual([e['@id'] for e in standoffclasses], ['onto:Standoff'])
+        self.assertEqual([e['@id'] for e in properties], ['onto:hasText'])
+
+    def test_parse(self):
+        con = Connection('http://0.0.0.0:3333')
+        serial = Ontology.fromJsonObj(con, self.ontology(20))
+        parallel = Ontology.fromJsonObj(con, self.ontology(20), jobs=2)
+        for onto in (serial, parallel):
+            self.assertEqual(onto.name, 'onto')
+            self.assertEqual([r.name for r in onto.resource_classes], ['Class{}'.format(i) for i in range(20)])
+            self.assertEqual(onto.property_classes[0].gui_attributes, {'size': '80', 'maxlength': '255'})
+            has_property = onto.resource_classes[5].has_properties['onto:hasText']
+            self.assertEqual((has_property.cardinality, has_property.gui_order), (Cardinality.C_1_n, 5))
+        self.assertTrue(all(r._con is con and r._context is parallel.context for r in parallel.resource_classes))
+        self.assertTrue(all(p._con is con and p._context is parallel.context for p in parallel.property_classes))
+        self.assertIs(parallel.resource_classes[0].has_properties['onto:hasText']._context, parallel.context)
+
+
+if __name__ == '__main__':
+    unittest.main()
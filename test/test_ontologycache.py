@@ -0,0 +1,139 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../knora")
+
+from dsplib.models.connection import Connection
+from dsplib.models.ontology import Ontology
+from dsplib.models.ontologycache import OntologyCache
+from stub_server import StubServer
+
+
+class TestOntologyCache(unittest.TestCase):
+    onto_iri = 'http://0.0.0.0:3333/ontology/0001/anything/v2'
+    context = {'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+               'owl': 'http://www.w3.org/2002/07/owl#',
+               'knora-api': 'http://api.knora.org/ontology/knora-api/v2#',
+               'salsah-gui': 'http://api.knora.org/ontology/salsah-gui/v2#',
+               'anything': onto_iri + '#'}
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = OntologyCache(os.path.join(self.tmpdir.name, 'cache'))
+        OntologyCache.set_default(self.cache)
+
+    def tearDown(self):
+        OntologyCache.set_default(None)
+        self.tmpdir.cleanup()
+
+    def routes(self, lmd: str, label: str):
+        header = {'@id': self.onto_iri, '@type': 'owl:Ontology', 'rdfs:label': label,
+                  'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                  'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': lmd}}
+        thing = {'@id': 'anything:Thing', '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+                 'rdfs:label': [{'@language': 'en', '@value': 'Thing'}],
+                 'rdfs:subClassOf': [{'@id': 'knora-api:Resource'},
+                                     {'@type': 'owl:Restriction', 'owl:minCardinality': 0,
+                                      'owl:onProperty': {'@id': 'anything:hasText'}}]}
+        has_text = {'@id': 'anything:hasText', '@type': 'owl:ObjectProperty', 'knora-api:isResourceProperty': True,
+                    'knora-api:objectType': {'@id': 'knora-api:TextValue'},
+                    'rdfs:subPropertyOf': {'@id': 'knora-api:hasValue'},
+                    'rdfs:label': [{'@language': 'en', '@value': 'Text'}]}
+        return {
+            ('GET', '/ontology/0001/anything/v2'): dict(header, **{'@graph': [thing, has_text],
+                                                                   '@context': self.context}),
+            ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0001'): dict(header, **{'@context': self.context}),
+        }
+
+    @staticmethod
+    def count(stub: StubServer, prefix: str) -> int:
+        return len([r for r in stub.requests if r[1].startswith(prefix)])
+
+    def test_get(self):
+        with StubServer(routes=self.routes('2021-01-01T00:00:00Z', 'Anything')) as stub:
+            con = Connection(stub.url)
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything')
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual(self.count(stub, '/ontology/'), 1)
+
+            # revalidated with the metadata of the project
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything')
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual([x.name for x in onto.resource_classes], ['Thing'])
+            self.assertEqual([x.name for x in onto.property_classes], ['hasText'])
+            self.assertIs(onto.resource_classes[0]._con, con)
+            self.assertEqual(self.count(stub, '/ontology/'), 1)
+            self.assertEqual(self.count(stub, '/v2/ontologies/metadata/'), 1)
+
+            # the last modification date is known, no request at all
+            stub.requests.clear()
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything', lastModificationDate='2021-01-01T00:00:00Z')
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual(stub.requests, [])
+
+            # the ontology has been modified
+            for (method, path), response in self.routes('2021-02-02T00:00:00Z', 'Anything else').items():
+                stub.add_route(method, path, response)
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything')
+            self.assertEqual(onto.label, 'Anything else')
+            self.assertEqual(self.count(stub, '/ontology/'), 1)
+            con.close()
+
+    def test_get_jsonld(self):
+        with StubServer(routes=self.routes('2021-01-01T00:00:00Z', 'Anything')) as stub:
+            con = Connection(stub.url)
+            jsonld = self.cache.get_jsonld(con, '/ontology/0001/anything/v2', '2021-01-01T00:00:00Z')
+            self.assertEqual(jsonld['rdfs:label'], 'Anything')
+            jsonld = self.cache.get_jsonld(con, '/ontology/0001/anything/v2', '2021-01-01T00:00:00Z')
+            self.assertEqual(jsonld['rdfs:label'], 'Anything')
+            self.assertEqual(self.count(stub, '/ontology/'), 1)
+
+            # the parsed form is created from the cached JSON-LD
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything', lastModificationDate='2021-01-01T00:00:00Z')
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual(self.count(stub, '/ontology/'), 1)
+            con.close()
+
+    def test_corrupt(self):
+        with StubServer(routes=self.routes('2021-01-01T00:00:00Z', 'Anything')) as stub:
+            con = Connection(stub.url)
+            Ontology.getOntologyFromServer(con, '0001', 'anything')
+            for filename in os.listdir(self.cache.directory):
+                with open(os.path.join(self.cache.directory, filename), 'wb') as f:
+                    f.write(b'garbage')
+            onto = Ontology.getOntologyFromServer(con, '0001', 'anything')
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual(self.count(stub, '/ontology/'), 2)
+            con.close()
+
+    def test_version_changed(self):
+        with StubServer(routes=self.routes('2021-01-01T00:00:00Z', 'Anything')) as stub:
+            con = Connection(stub.url)
+            parsed = []
+
+            def parse(jsonld):
+                parsed.append(jsonld)
+                return Ontology.fromJsonObj(con, jsonld)
+
+            path = '/ontology/0001/anything/v2'
+            self.cache.get(con, path, parse, '2021-01-01T00:00:00Z')
+            self.cache.get(con, path, parse, '2021-01-01T00:00:00Z')
+            self.assertEqual(len(parsed), 1)
+
+            # entries of another format version are a cache miss
+            version = OntologyCache.FORMAT_VERSION
+            OntologyCache.FORMAT_VERSION = version + 1
+            try:
+                onto = self.cache.get(con, path, parse, '2021-01-01T00:00:00Z')
+            finally:
+                OntologyCache.FORMAT_VERSION = version
+            self.assertEqual(onto.label, 'Anything')
+            self.assertEqual(len(parsed), 2)
+            self.assertEqual(self.count(stub, '/ontology/'), 2)
+            con.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import unittest
+from typing import Any, Dict, List
+
+sys.path.append("../knora")
+
+from dsplib.models.connection import Connection
+from dsplib.models.helpers import BaseError
+from dsplib.models.ontology import Ontology
+from dsplib.models.ontologyindex import OntologyIndex
+
+
+class TestOntologyIndex(unittest.TestCase):
+
+    @staticmethod
+    def ontology(name: str, classes: Dict[str, List[str]], properties: Dict[str, List[str]]) -> Ontology:
+        iri = 'http://0.0.0.0:3333/ontology/0001/{}/v2'.format(name)
+        graph: List[Any] = [{'@id': prop, '@type': 'owl:ObjectProperty', 'knora-api:isResourceProperty': True,
+                             'rdfs:subPropertyOf': [{'@id': sp} for sp in superprops],
+                             'rdfs:label': [{'@language': 'en', '@value': prop}]}
+                            for prop, superprops in properties.items()]
+        graph += [{'@id': resclass, '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+                   'rdfs:subClassOf': [{'@id': sc} for sc in superclasses],
+                   'rdfs:label': [{'@language': 'en', '@value': resclass}]}
+                  for resclass, superclasses in classes.items()]
+        return Ontology.fromJsonObj(Connection('http://0.0.0.0:3333'), {
+            '@id': iri, 'rdfs:label': name, 'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+            '@graph': graph,
+            '@context': {'foaf': 'http://xmlns.com/foaf/0.1/', 'other': 'http://0.0.0.0:3333/ontology/0001/other/v2#',
+                         'onto': 'http://0.0.0.0:3333/ontology/0001/onto/v2#'}})
+
+    def test_index(self):
+        index = OntologyIndex({
+            'onto': self.ontology('onto', {
+                'onto:Thing': ['knora-api:Resource'],
+                'onto:Image': ['knora-api:StillImageRepresentation'],
+                'onto:Photo': ['foaf:Image', 'onto:Image'],
+                'onto:Portrait': ['other:Picture', 'onto:Thing'],
+            }, {'onto:hasText': ['knora-api:hasValue'], 'onto:hasTitle': ['onto:hasText', 'dcterms:title']}),
+            'other': self.ontology('other', {'other:Picture': ['onto:Photo']}, {}),
+        })
+        self.assertEqual(sorted(index.classes), ['onto:Image', 'onto:Photo', 'onto:Portrait', 'onto:Thing',
+                                                 'other:Picture'])
+        self.assertEqual(index.get_class('onto:Photo').name, 'Photo')
+        self.assertEqual(index.get_property('onto:hasTitle').name, 'hasTitle')
+        self.assertEqual(index.superclasses('onto:Portrait'),
+                         ('other:Picture', 'onto:Photo', 'foaf:Image', 'onto:Image',
+                          'knora-api:StillImageRepresentation', 'onto:Thing', 'knora-api:Resource'))
+        self.assertEqual(index.superproperties('onto:hasTitle'),
+                         ('onto:hasText', 'knora-api:hasValue', 'dcterms:title'))
+        self.assertTrue(index.is_subclass_of('onto:Portrait', 'onto:Image'))
+        self.assertFalse(index.is_subclass_of('onto:Thing', 'onto:Image'))
+        self.assertEqual({name: index.baseclass(name) for name in index.classes}, {
+            'onto:Thing': 'Resource', 'onto:Image': 'StillImageRepresentation',
+            'onto:Photo': 'StillImageRepresentation', 'onto:Portrait': 'StillImageRepresentation',
+            'other:Picture': 'StillImageRepresentation'})
+        with self.assertRaises(BaseError):
+            index.get_class('onto:Unknown')
+        with self.assertRaises(BaseError):
+            index.superproperties('onto:hasUnknown')
+
+    def test_cycle(self):
+        with self.assertRaises(BaseError):
+            OntologyIndex({'onto': self.ontology('onto', {'onto:A': ['onto:B'], 'onto:B': ['onto:A']}, {})})
+
+
+if __name__ == '__main__':
+    unittest.main()
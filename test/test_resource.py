@@ -0,0 +1,383 @@
+import json
+import os
+import re
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append("../knora")
+
+from dsplib.models.connection import Connection
+from dsplib.models.gravsearch import GravsearchQuery
+from dsplib.models.helpers import Actions, BaseError, Cardinality, Context
+from dsplib.models.listnode import ListNode
+from dsplib.models.ontologycache import OntologyCache
+from dsplib.models.resource import LazyValues, ResourceInstance, ResourceInstanceFactory, ResourceEncoder, Propinfo
+from dsplib.models.value import DecimalValue, LinkValue, TextValue, KnoraStandoffXml
+from stub_server import StubServer
+
+
+class TestResource(unittest.TestCase):
+    Thing = type('Thing', (ResourceInstance,), {
+        'project': 'http://rdfh.ch/projects/0001',
+        'classname': 'anything:Thing',
+        'baseclass': 'Resource',
+        'context': {'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'},
+        'properties': {
+            'anything:hasText': Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_n, gui_order=1),
+            'anything:hasOtherThing': Propinfo(valtype=LinkValue, cardinality=Cardinality.C_0_n, gui_order=2,
+                                               attributes='anything:Thing'),
+        },
+        'lists': []
+    })
+
+    def test_createValue(self):
+        posted = []
+
+        def handler(method, path, query, body):
+            posted.append(json.loads(body))
+            return 200, {'@id': 'http://rdfh.ch/0001/thing/values/{}'.format(len(posted))}
+
+        with StubServer(routes={('POST', '/v2/values'): handler}) as stub:
+            con = Connection(stub.url)
+            thing = self.Thing(con=con, iri='http://rdfh.ch/0001/thing', label='thing')
+            iri1 = thing.createValue('anything:hasOtherThing', 'http://rdfh.ch/0001/other')
+            iri2 = thing.createValue('anything:hasText', {'value': KnoraStandoffXml('A <strong>text</strong>'),
+                                                          'comment': 'with markup'})
+            con.close()
+        self.assertEqual(iri1, 'http://rdfh.ch/0001/thing/values/1')
+        self.assertEqual(iri2, 'http://rdfh.ch/0001/thing/values/2')
+        self.assertEqual(posted[0]['@id'], 'http://rdfh.ch/0001/thing')
+        self.assertEqual(posted[0]['@type'], 'anything:Thing')
+        self.assertEqual(posted[0]['anything:hasOtherThingValue']['knora-api:linkValueHasTargetIri'],
+                         {'@id': 'http://rdfh.ch/0001/other'})
+        self.assertEqual(posted[1]['anything:hasText']['knora-api:valueHasComment'], 'with markup')
+        self.assertIn('<strong>text</strong>', posted[1]['anything:hasText']['knora-api:textValueAsXml'])
+
+    def test_encoder(self):
+        thing = self.Thing(con=Connection('http://0.0.0.0:3333'), label='Thing für Ü',
+                           values={'anything:hasText': ['plain', {'value': KnoraStandoffXml('A <em>text</em>')}],
+                                   'anything:hasOtherThing': 'http://rdfh.ch/0001/other'})
+        expected = thing.toJsonLdObj(Actions.Create)
+        expected['anything:hasText'][1]['knora-api:textValueAsXml'] = \
+            '<?xml version="1.0" encoding="UTF-8"?>\n<text>A <em>text</em></text>'
+        del expected['@context']
+        jsondata = thing._create_jsondata()
+        self.assertIsInstance(jsondata, bytes)
+        result = json.loads(jsondata.decode('utf-8'))
+        self.assertEqual(result.pop('@context'), {'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'})
+        self.assertEqual(result, expected)
+        self.assertIn('"rdfs:label":"Thing für Ü"', jsondata.decode('utf-8'))
+
+        # a pluggable JSON backend
+        plain = self.Thing(con=Connection('http://0.0.0.0:3333'), label='plain', values={'anything:hasText': 'plain'})
+        encoder = ResourceEncoder('anything:Thing', self.Thing.project, self.Thing.context, self.Thing.properties,
+                                  dumps=lambda obj: json.dumps(obj).encode('ascii'))
+        self.assertEqual(json.loads(encoder.encode(plain)), json.loads(plain._create_jsondata()))
+
+    def test_clone(self):
+        value = {'@id': 'http://rdfh.ch/0001/thing/values/1', '@type': 'knora-api:TextValue',
+                 'knora-api:valueAsString': 'read text',
+                 'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/1'},
+                 'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/1.1'},
+                 'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR'}
+        resource = {'@id': 'http://rdfh.ch/0001/thing', '@type': 'anything:Thing', 'rdfs:label': 'read thing',
+                    'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/thing'},
+                    'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/thing.1'},
+                    'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR',
+                    'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+                    'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+                    'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                    'anything:hasText': [value]}
+        created = {'@id': 'http://rdfh.ch/0001/new',
+                   'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/new'},
+                   'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/new.1'}}
+        routes = {('GET', '/v2/resources/http://rdfh.ch/0001/thing'): resource, ('POST', '/v2/resources'): created}
+        with StubServer(routes=routes) as stub:
+            con = Connection(stub.url)
+            thing = self.Thing(con=con, label='thing', values={'anything:hasText': ['a', 'b']})
+            clone = thing.clone()
+            clone._values['anything:hasText'].append(TextValue('c'))
+            self.assertEqual(len(thing._values['anything:hasText']), 2)
+            self.assertIs(clone._values['anything:hasText'][0], thing._values['anything:hasText'][0])
+
+            new_thing = thing.create()
+            self.assertIs(type(new_thing), self.Thing)
+            self.assertIs(new_thing._con, con)
+            self.assertEqual((new_thing.iri, new_thing.ark), ('http://rdfh.ch/0001/new', 'http://ark.example/new'))
+            self.assertIsNone(thing.iri)
+            self.assertEqual([str(v) for v in new_thing._values['anything:hasText']], ['a', 'b'])
+
+            read_thing = self.Thing(con=con, iri='http://rdfh.ch/0001/thing').read()
+            self.assertIs(read_thing._con, con)
+            self.assertEqual(read_thing._label, 'read thing')
+            self.assertEqual(read_thing.vark, 'http://ark.example/thing.1')
+            self.assertEqual([str(v) for v in read_thing._values['anything:hasText']], ['read text'])
+            con.close()
+
+    def test_stillimage(self):
+        Image = type('Image', (ResourceInstance,), {'project': 'http://rdfh.ch/projects/0001',
+                                                    'classname': 'anything:Image',
+                                                    'baseclass': 'StillImageRepresentation',
+                                                    'context': self.Thing.context, 'properties': {}, 'lists': []})
+        con = Connection('http://0.0.0.0:3333')
+        image = Image(con=con, label='image', stillimage='template.tif')
+        clone = image.clone()
+        self.assertEqual(clone._stillimage, 'template.tif')
+        self.assertIsNot(clone._changed, image._changed)
+
+        jsonld_obj = {'@id': 'http://rdfh.ch/0001/image', '@type': 'anything:Image', 'rdfs:label': 'read image',
+                      'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/image'},
+                      'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': 'http://ark.example/image.1'},
+                      'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR',
+                      'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+                      'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+                      'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                      'knora-api:hasStillImageFileValue': {'@id': 'http://rdfh.ch/0001/image/values/1',
+                                                           '@type': 'knora-api:StillImageFileValue',
+                                                           'knora-api:fileValueHasFilename': 'read.jp2'}}
+        read_image = image.fromJsonLdObj(con, jsonld_obj)
+        self.assertEqual(read_image._stillimage, 'read.jp2')
+        self.assertNotIn('knora-api:hasStillImageFileValue', read_image._values)
+        self.assertEqual(image._stillimage, 'template.tif')
+
+    def test_minimal_context(self):
+        context = dict(Context({'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#',
+                                'other': 'http://0.0.0.0:3333/ontology/0001/other/v2#',
+                                'dcterms': 'http://purl.org/dc/terms/'}))
+        properties = {'anything:hasText': Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_n, gui_order=1),
+                      'dcterms:title': Propinfo(valtype=TextValue, cardinality=Cardinality.C_0_1, gui_order=2),
+                      'anything:hasDecimal': Propinfo(valtype=DecimalValue, cardinality=Cardinality.C_0_1,
+                                                      gui_order=3)}
+        Thing = type('Thing', (ResourceInstance,), {'project': 'http://rdfh.ch/projects/0001',
+                                                    'classname': 'anything:Thing', 'baseclass': 'Resource',
+                                                    'context': context, 'properties': properties, 'lists': []})
+        con = Connection('http://0.0.0.0:3333')
+        things = [Thing(con=con, label='empty'),
+                  Thing(con=con, label='text', values={'anything:hasText': 'text', 'dcterms:title': 'title'}),
+                  Thing(con=con, label='decimal', values={'anything:hasDecimal': 3.14})]
+        contexts = [json.loads(thing._create_jsondata())['@context'] for thing in things]
+        self.assertEqual(set(contexts[0]), {'anything', 'rdfs', 'knora-api'})
+        self.assertEqual(set(contexts[1]), {'anything', 'rdfs', 'knora-api', 'dcterms'})
+        self.assertEqual(contexts[1]['dcterms'], 'http://purl.org/dc/terms/')
+        self.assertEqual(contexts[1]['knora-api'], 'http://api.knora.org/ontology/knora-api/v2#')
+        self.assertEqual(set(contexts[2]), {'anything', 'rdfs', 'knora-api', 'xsd'})
+        value = json.loads(things[0]._value_jsondata('dcterms:title', 'title'))
+        self.assertEqual(set(value['@context']), {'anything', 'rdfs', 'knora-api', 'dcterms'})
+        self.assertNotIn('knora-api:attachedToProject', value)
+
+    @staticmethod
+    def factory_routes(lmd: str, graph: Optional[List[Any]] = None):
+        context = {'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+                   'owl': 'http://www.w3.org/2002/07/owl#',
+                   'knora-api': 'http://api.knora.org/ontology/knora-api/v2#',
+                   'anything': 'http://0.0.0.0:3333/ontology/0001/anything/v2#'}
+
+        def project(iri: str, shortcode: str, shortname: str):
+            return {'project': {'id': iri, 'shortcode': shortcode, 'shortname': shortname, 'longname': shortname,
+                                'description': [], 'keywords': [], 'ontologies': [], 'selfjoin': False,
+                                'status': True}}
+
+        onto_iri = 'http://0.0.0.0:3333/ontology/0001/anything/v2'
+        return {
+            ('GET', '/admin/projects/shortcode/0001'): project('http://rdfh.ch/projects/0001', '0001', 'anything'),
+            ('GET', '/admin/projects/shortcode/0000'): project('http://rdfh.ch/projects/0000', '0000', 'shared'),
+            ('GET', '/admin/lists'): {'lists': [{'id': 'http://rdfh.ch/lists/0001/treelist', 'name': 'treelist',
+                                                 'projectIri': 'http://rdfh.ch/projects/0001'}]},
+            ('GET', '/admin/lists/http://rdfh.ch/lists/0001/treelist'): {'list': {
+                'listinfo': {'id': 'http://rdfh.ch/lists/0001/treelist', 'name': 'treelist',
+                             'projectIri': 'http://rdfh.ch/projects/0001', 'labels': []},
+                'children': [{'id': 'http://rdfh.ch/lists/0001/node1', 'name': 'node1', 'labels': []}]}},
+            ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0001'): {
+                '@id': onto_iri, '@type': 'owl:Ontology', 'rdfs:label': 'Anything',
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': lmd},
+                '@context': context},
+            ('GET', '/v2/ontologies/metadata/http://rdfh.ch/projects/0000'): {'@graph': [], '@context': context},
+            ('GET', '/ontology/0001/anything/v2'): {
+                '@id': onto_iri, 'rdfs:label': 'Anything',
+                'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+                'knora-api:lastModificationDate': {'@type': 'xsd:dateTimeStamp', '@value': lmd},
+                '@graph': graph or [], '@context': context},
+        }
+
+    def test_factory_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            snapshot = os.path.join(tmpdir, 'schema.json')
+            downloads = []
+            with StubServer() as stub:
+                for lmd in ('2021-01-01T00:00:00Z', '2021-01-01T00:00:00Z', '2021-02-02T00:00:00Z'):
+                    for (method, path), response in self.factory_routes(lmd).items():
+                        stub.add_route(method, path, response)
+                    stub.requests.clear()
+                    con = Connection(stub.url)
+                    factory = ResourceInstanceFactory(con, '0001', snapshot=snapshot)
+                    con.close()
+                    downloads.append(len([r for r in stub.requests if r[1].startswith('/ontology/')]))
+                    self.assertEqual(factory.listindex.get('treelist', 'node1'), 'http://rdfh.ch/lists/0001/node1')
+                    self.assertEqual(factory.get_resclass_names(), [])
+            self.assertTrue(os.path.exists(snapshot))
+        self.assertEqual(downloads, [1, 0, 1])  # the snapshot is reused until the ontology is modified
+
+    def test_factory_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            OntologyCache.set_default(OntologyCache(tmpdir))
+            try:
+                with StubServer(routes=self.factory_routes('2021-01-01T00:00:00Z', self.thing_graph)) as stub:
+                    con = Connection(stub.url)
+                    ResourceInstanceFactory(con, '0001')
+                    # warm start: the pre-parsed ontology is loaded, the cached JSON-LD is not read at all
+                    with mock.patch.object(OntologyCache, 'get_jsonld') as get_jsonld:
+                        factory = ResourceInstanceFactory(con, '0001')
+                    con.close()
+            finally:
+                OntologyCache.set_default(None)
+        get_jsonld.assert_not_called()
+        self.assertEqual(factory.get_resclass('anything:Thing').baseclass, 'Resource')
+
+    thing_graph = [{'@id': 'anything:hasText', '@type': 'owl:ObjectProperty',
+                    'knora-api:isResourceProperty': True, 'knora-api:isEditable': True,
+                    'knora-api:objectType': {'@id': 'knora-api:TextValue'},
+                    'knora-api:subjectType': {'@id': 'anything:Thing'},
+                    'rdfs:subPropertyOf': {'@id': 'knora-api:hasValue'},
+                    'rdfs:label': [{'@language': 'en', '@value': 'Text'}]},
+                   {'@id': 'anything:Thing', '@type': 'owl:Class', 'knora-api:isResourceClass': True,
+                    'rdfs:label': [{'@language': 'en', '@value': 'Thing'}],
+                    'rdfs:subClassOf': [{'@id': 'knora-api:Resource'},
+                                        {'@type': 'owl:Restriction', 'owl:minCardinality': 0,
+                                         'owl:onProperty': {'@id': 'anything:hasText'}, 'salsah-gui:guiOrder': 1}]}]
+
+    @staticmethod
+    def thing_jsonld(iri: str) -> Dict[str, Any]:
+        def common(iri: str) -> Dict[str, Any]:
+            return {'@id': iri, 'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark'},
+                    'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark.1'},
+                    'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR'}
+
+        return dict(common(iri), **{
+            '@type': 'anything:Thing', 'rdfs:label': iri.split('/')[-1],
+            'knora-api:creationDate': {'@type': 'xsd:dateTimeStamp', '@value': '2021-01-01T00:00:00Z'},
+            'knora-api:attachedToUser': {'@id': 'http://rdfh.ch/users/root'},
+            'knora-api:attachedToProject': {'@id': 'http://rdfh.ch/projects/0001'},
+            'anything:hasText': dict(common(iri + '/values/1'), **{'@type': 'knora-api:TextValue',
+                                                                   'knora-api:valueAsString': 'text of ' + iri})})
+
+    def test_lazy_values(self):
+        jsonld_obj = self.thing_jsonld('http://rdfh.ch/0001/thing')
+        jsonld_obj['anything:hasOtherThing'] = {'@id': 'http://rdfh.ch/0001/thing/values/2',
+                                                '@type': 'knora-api:UnknownValue'}
+        thing = self.Thing.fromJsonLdObj(Connection('http://0.0.0.0:3333'), jsonld_obj)
+        self.assertIsInstance(thing._values, LazyValues)
+        self.assertEqual(list(thing._values), ['anything:hasText', 'anything:hasOtherThing'])
+        self.assertEqual(thing._values.decoded, set())
+        clone = thing.clone()
+        self.assertEqual(str(thing._values['anything:hasText']), 'text of http://rdfh.ch/0001/thing')
+        self.assertIs(thing._values['anything:hasText'], thing._values.get('anything:hasText'))
+        self.assertEqual(thing._values.decoded, {'anything:hasText'})
+        self.assertEqual(clone._values.decoded, set())
+        with self.assertRaises(BaseError):
+            thing._values['anything:hasOtherThing']
+        del thing._values['anything:hasOtherThing']
+        self.assertEqual(dict(thing._values), {'anything:hasText': thing._values['anything:hasText']})
+        self.assertIn('anything:hasOtherThing', clone._values)
+
+    def test_read_many(self):
+        def resources(method: str, path: str, query: Dict[str, Any], body: Any) -> Tuple[int, Any]:
+            iris = re.findall(r'http://rdfh\.ch/0001/[^/]+', path)
+            if not path.startswith('/v2/resources/') or 'http://rdfh.ch/0001/missing' in iris:
+                return 404, {'error': 'not found'}
+            if len(iris) == 1:
+                return 200, self.thing_jsonld(iris[0])
+            return 200, {'@graph': [self.thing_jsonld(iri) for iri in reversed(iris)]}
+
+        iris = ['http://rdfh.ch/0001/thing{}'.format(i) for i in range(23)]
+        with StubServer(routes=self.factory_routes('2021-01-01T00:00:00Z', self.thing_graph),
+                        default=resources) as stub:
+            con = Connection(stub.url)
+            factory = ResourceInstanceFactory(con, '0001')
+            self.assertIs(factory.get_resclass('anything:Thing'), factory.get_resclass('anything:Thing'))
+            self.assertEqual(factory.get_resclass('anything:Thing').baseclass, 'Resource')
+            self.assertEqual(factory.index.superproperties('anything:hasText'), ('knora-api:hasValue',))
+            with self.assertRaises(BaseError):
+                factory.get_resclass('anything:Unknown')
+            Thing = factory.get_resclass('anything:Thing')
+            self.assertIsInstance(Thing.lists[0], ListNode)
+            self.assertEqual(Thing.lists[0].name, 'treelist')
+            self.assertIs(Thing.lists, factory.lists)
+            self.assertIs(Thing.compact_lists, factory.compact_lists)
+            stub.requests.clear()
+            things = list(factory.read_many(iris, batch_size=5, jobs=2))
+            self.assertEqual([thing.iri for thing in things], iris)
+            self.assertTrue(all(type(thing) is factory.get_resclass('anything:Thing') for thing in things))
+            self.assertEqual(str(things[7]._values['anything:hasText']), 'text of http://rdfh.ch/0001/thing7')
+            self.assertEqual(len(stub.requests), 5)
+            with self.assertRaises(BaseError):
+                list(factory.read_many(iris[:3] + ['http://rdfh.ch/0001/missing']))
+            con.close()
+
+    def test_unresolved_property(self):
+        graph = self.thing_graph + [{'@id': 'anything:Broken', '@type': 'owl:Class',
+                                     'knora-api:isResourceClass': True,
+                                     'rdfs:label': [{'@language': 'en', '@value': 'Broken'}],
+                                     'rdfs:subClassOf': [{'@id': 'knora-api:Resource'},
+                                                         {'@type': 'owl:Restriction', 'owl:minCardinality': 0,
+                                                          'owl:onProperty': {'@id': 'anything:hasMissing'}}]}]
+        with StubServer(routes=self.factory_routes('2021-01-01T00:00:00Z', graph)) as stub:
+            con = Connection(stub.url)
+            factory = ResourceInstanceFactory(con, '0001')
+            con.close()
+        self.assertEqual(factory.get_resclass('anything:Thing').baseclass, 'Resource')
+        with self.assertRaisesRegex(BaseError, 'anything:hasMissing'):
+            factory.get_resclass('anything:Broken')
+
+    def test_read_stillimage(self):
+        image_graph = self.thing_graph + [{'@id': 'anything:Image', '@type': 'owl:Class',
+                                           'knora-api:isResourceClass': True,
+                                           'rdfs:label': [{'@language': 'en', '@value': 'Image'}],
+                                           'rdfs:subClassOf': [{'@id': 'knora-api:StillImageRepresentation'}]}]
+        image = dict(self.thing_jsonld('http://rdfh.ch/0001/image'), **{
+            '@type': 'anything:Image',
+            'knora-api:hasStillImageFileValue': {'@id': 'http://rdfh.ch/0001/image/values/2',
+                                                 '@type': 'knora-api:StillImageFileValue',
+                                                 'knora-api:fileValueHasFilename': 'image.jp2'}})
+        routes = self.factory_routes('2021-01-01T00:00:00Z', image_graph)
+        routes[('GET', '/v2/resources/http://rdfh.ch/0001/image')] = image
+        with StubServer(routes=routes) as stub:
+            con = Connection(stub.url)
+            factory = ResourceInstanceFactory(con, '0001')
+            Image = factory.get_resclass('anything:Image')
+            self.assertEqual(Image.baseclass, 'StillImageRepresentation')
+            images = list(factory.read_many(['http://rdfh.ch/0001/image']))
+            con.close()
+        self.assertIs(type(images[0]), Image)
+        self.assertEqual(images[0]._stillimage, 'image.jp2')
+        self.assertEqual(str(images[0]._values['anything:hasText']), 'text of http://rdfh.ch/0001/image')
+
+    def test_search(self):
+        def search(method: str, path: str, query: Dict[str, Any], body: Any) -> Tuple[int, Any]:
+            page = int(re.search(r'OFFSET (\d+)', body.decode('utf-8')).group(1))
+            if page == 0:
+                return 200, {'@graph': [self.thing_jsonld('http://rdfh.ch/0001/thing{}'.format(i)) for i in range(2)],
+                             'knora-api:mayHaveMoreResults': True}
+            if page == 1:
+                return 200, self.thing_jsonld('http://rdfh.ch/0001/thing2')
+            return 200, {}
+
+        routes = self.factory_routes('2021-01-01T00:00:00Z', self.thing_graph)
+        routes[('POST', '/v2/searchextended')] = search
+        with StubServer(routes=routes) as stub:
+            con = Connection(stub.url)
+            factory = ResourceInstanceFactory(con, '0001')
+            query = GravsearchQuery('anything:Thing', factory.context).values('anything:hasText')
+            self.assertIn('PREFIX anything: <http://0.0.0.0:3333/ontology/0001/anything/v2#>', query.build())
+            things = list(factory.search(query))
+            self.assertEqual([thing.iri for thing in things],
+                             ['http://rdfh.ch/0001/thing{}'.format(i) for i in range(3)])
+            self.assertIs(type(things[2]), factory.get_resclass('anything:Thing'))
+            con.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import unittest
+from typing import List
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError
+from dsplib.utils.resource_graph import ResourceGraph, ResourceGraphError
+
+
+class Res:
+    def __init__(self, id: str, resptrs: List[str]):
+        self.id = id
+        self.resptrs = resptrs
+        self.calls = 0
+
+    def get_resptrs(self) -> List[str]:
+        self.calls += 1
+        return self.resptrs
+
+
+class TestResourceGraph(unittest.TestCase):
+
+    def test_sort(self):
+        resources = [
+            Res('d', ['c']),
+            Res('c', ['a', 'b', 'a']),
+            Res('a', []),
+            Res('b', ['a', 'http://rdfh.ch/0001/existing']),
+            Res('e', []),
+        ]
+        graph = ResourceGraph(resources)
+        self.assertEqual(len(graph), 5)
+        self.assertEqual([graph.id(j) for j in graph.refs(graph.index('c'))], ['a', 'b'])
+        self.assertEqual([graph.id(j) for j in graph.dependents(graph.index('a'))], ['c', 'b'])
+        ordered = [r.id for r in graph.sort()]
+        self.assertEqual(ordered, ['a', 'e', 'b', 'c', 'd'])
+        self.assertTrue(all(r.calls == 1 for r in resources))
+
+    def test_key(self):
+        class Legacy:
+            def __init__(self, unique_id: str, resptrs: List[str]):
+                self.unique_id = unique_id
+                self.resptrs = resptrs
+
+            def get_resptrs(self) -> List[str]:
+                return self.resptrs
+
+        resources = [Legacy('b', ['a']), Legacy('a', [])]
+        ordered = ResourceGraph(resources, key=lambda r: r.unique_id).sort()
+        self.assertEqual([r.unique_id for r in ordered], ['a', 'b'])
+
+    def test_cycles_and_dangling(self):
+        resources = [
+            Res('a', ['b']),
+            Res('b', ['c']),
+            Res('c', ['a']),
+            Res('d', ['d']),
+            Res('e', ['a']),
+            Res('f', ['nonexisting']),
+            Res('g', []),
+        ]
+        with self.assertRaises(ResourceGraphError) as cm:
+            ResourceGraph(resources).sort()
+        err = cm.exception
+        self.assertIsInstance(err, BaseError)
+        self.assertEqual(sorted(sorted(cycle) for cycle in err.cycles), [['a', 'b', 'c'], ['d']])
+        self.assertEqual(err.dangling, {'f': ['nonexisting']})
+        self.assertIn('Reference cycle: a -> b -> c -> a', str(err))
+        self.assertIn('Resource f has dangling references to: nonexisting', str(err))
+
+    def test_large_chain(self):
+        n = 100000
+        resources = [Res('r{}'.format(i), ['r{}'.format(i + 1)] if i + 1 < n else []) for i in range(n)]
+        ordered = ResourceGraph(resources).sort()
+        self.assertEqual(ordered[0].id, 'r{}'.format(n - 1))
+        self.assertEqual(ordered[-1].id, 'r0')
+        resources[-1].resptrs = ['r0']
+        with self.assertRaises(ResourceGraphError) as cm:
+            ResourceGraph(resources).sort()
+        self.assertEqual(len(cm.exception.cycles), 1)
+        self.assertEqual(len(cm.exception.cycles[0]), n)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError
+from dsplib.utils.upload_journal import UploadJournal
+
+
+class TestUploadJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'data.xml.journal')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume(self):
+        with UploadJournal(self.path, 'http://0.0.0.0:3333') as journal:
+            journal.add_image('images/a.tif', 'Xyz123.jp2')
+            journal.add_resource('res_a', 'http://rdfh.ch/0001/a')
+            journal.add_link('res_a', 0, 'http://rdfh.ch/0001/a/values/1')
+
+        with UploadJournal(self.path, 'http://0.0.0.0:3333', resume=True) as journal:
+            self.assertEqual(journal.resources, {'res_a': 'http://rdfh.ch/0001/a'})
+            self.assertEqual(journal.get_image('images/a.tif'), 'Xyz123.jp2')
+            self.assertIsNone(journal.get_image('images/b.tif'))
+            self.assertTrue(journal.has_link('res_a', 0))
+            self.assertFalse(journal.has_link('res_a', 1))
+
+        with self.assertRaises(BaseError):
+            UploadJournal(self.path, 'http://0.0.0.0:3333')
+        with self.assertRaises(BaseError):
+            UploadJournal(self.path, 'http://0.0.0.0:3333', resume=True, restart=True)
+
+        with UploadJournal(self.path, 'http://0.0.0.0:3333', restart=True) as journal:
+            self.assertEqual(journal.resources, {})
+            self.assertIsNone(journal.get_image('images/a.tif'))
+
+        # an empty journal is no previous upload
+        UploadJournal(self.path, 'http://0.0.0.0:3333').close()
+
+    def test_deferred_links(self):
+        with UploadJournal(self.path, 'http://0.0.0.0:3333') as journal:
+            for i in range(5):
+                journal.add_deferred_links('res_{}'.format(i), '{{"links": {}}}'.format(i))
+            self.assertEqual([resid for resid, record in journal.deferred_links(batch_size=2)],
+                             ['res_0', 'res_1', 'res_2', 'res_3', 'res_4'])
+        with UploadJournal(self.path, 'http://0.0.0.0:3333', resume=True) as journal:
+            self.assertEqual(dict(journal.deferred_links())['res_3'], '{"links": 3}')
+        with UploadJournal(self.path, 'http://0.0.0.0:3333', restart=True) as journal:
+            self.assertEqual(list(journal.deferred_links()), [])
+
+    def test_crash(self):
+        journal = UploadJournal(self.path, 'http://0.0.0.0:3333')
+        journal.add_resource('res_a', 'http://rdfh.ch/0001/a')
+        # no close(): the records must have been written when add_resource() returns
+        with UploadJournal(self.path, 'http://0.0.0.0:3333', resume=True) as journal2:
+            self.assertEqual(journal2.resources, {'res_a': 'http://rdfh.ch/0001/a'})
+        journal.close()
+
+    def test_server(self):
+        UploadJournal(self.path, 'http://0.0.0.0:3333').close()
+        with self.assertRaises(BaseError):
+            UploadJournal(self.path, 'https://api.dasch.swiss', resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
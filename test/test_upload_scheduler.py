@@ -0,0 +1,154 @@
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from typing import List
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import BaseError
+from dsplib.utils.resource_graph import ResourceGraphError
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
+
+
+class Res:
+    def __init__(self, id: str, resptrs: List[str]):
+        self.id = id
+        self.resptrs = resptrs
+
+    def get_resptrs(self) -> List[str]:
+        return self.resptrs
+
+
+class TestUploadScheduler(unittest.TestCase):
+
+    def test_dependencies(self):
+        resources = [
+            Res('c', ['a', 'b']),
+            Res('a', []),
+            Res('b', ['a', 'http://rdfh.ch/0001/existing']),
+            Res('d', ['c']),
+            Res('e', []),
+        ]
+        lookup = IriLookup()
+
+        def create(resource: Res) -> str:
+            for ref in resource.get_resptrs():
+                if not ref.startswith('http'):
+                    self.assertIn(ref, lookup)
+            time.sleep(0.01)
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        UploadScheduler(jobs=4).run(resources, create, lookup)
+        self.assertEqual(len(lookup), 5)
+        self.assertEqual(lookup['d'], 'http://rdfh.ch/0001/d')
+
+    def test_concurrency(self):
+        lock = threading.Lock()
+        inflight = {'current': 0, 'max': 0}
+        resources = [Res('r{}'.format(i), []) for i in range(20)]
+
+        def create(resource: Res) -> str:
+            with lock:
+                inflight['current'] += 1
+                inflight['max'] = max(inflight['max'], inflight['current'])
+            time.sleep(0.02)
+            with lock:
+                inflight['current'] -= 1
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        UploadScheduler(jobs=5).run(resources, create, IriLookup())
+        self.assertEqual(inflight['max'], 5)
+
+    def test_cycle(self):
+        resources = [Res('a', ['b']), Res('b', ['a']), Res('c', [])]
+        lookup = IriLookup()
+        with self.assertRaises(BaseError):
+            UploadScheduler(jobs=2).run(resources, lambda r: 'http://rdfh.ch/0001/' + r.id, lookup)
+        self.assertIn('c', lookup)
+        self.assertNotIn('a', lookup)
+
+    def test_resume(self):
+        resources = [Res('a', []), Res('b', ['a']), Res('c', ['b'])]
+        lookup = IriLookup({'a': 'http://rdfh.ch/0001/a'})
+        created = []
+
+        def create(resource: Res) -> str:
+            created.append(resource.id)
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        UploadScheduler(jobs=2).run(resources, create, lookup)
+        self.assertEqual(created, ['b', 'c'])
+        self.assertEqual(len(lookup), 3)
+
+    def test_error(self):
+        def create(resource: Res) -> str:
+            if resource.id == 'b':
+                raise BaseError('Creation failed')
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        resources = [Res('a', []), Res('b', []), Res('c', ['b'])]
+        lookup = IriLookup()
+        with self.assertRaises(BaseError):
+            UploadScheduler(jobs=1).run(resources, create, lookup)
+        self.assertNotIn('c', lookup)
+
+    def test_stream(self):
+        resources = [Res('c', ['a', 'b']), Res('a', []), Res('b', ['http://rdfh.ch/0001/existing']),
+                     Res('d', ['c'])] + [Res('r{}'.format(i), []) for i in range(20)]
+        state = {'read': 0, 'created': 0, 'max_ahead': 0}
+        lookup = IriLookup()
+
+        def source():
+            for resource in resources:
+                state['read'] += 1
+                state['max_ahead'] = max(state['max_ahead'], state['read'] - len(lookup))
+                yield resource
+
+        def create(resource: Res) -> str:
+            for ref in resource.get_resptrs():
+                if not ref.startswith('http'):
+                    self.assertIn(ref, lookup)
+            return 'http://rdfh.ch/0001/' + resource.id
+
+        UploadScheduler(jobs=2).run_stream(source(), create, lookup, window=4)
+        self.assertEqual(len(lookup), 24)
+        self.assertLessEqual(state['max_ahead'], 5)
+
+    def test_stream_prepare(self):
+        prepared = []
+
+        def prepare(resource: Res) -> Future:
+            prepared.append(resource.id)
+            future = Future()
+            future.set_result(None)
+            return future
+
+        resources = [Res('b', ['a']), Res('a', [])]
+        lookup = IriLookup({'x': 'http://rdfh.ch/0001/x'})
+        UploadScheduler(jobs=2).run_stream(resources + [Res('x', [])], lambda r: 'http://rdfh.ch/0001/' + r.id,
+                                           lookup, prepare=prepare)
+        self.assertEqual(prepared, ['a', 'b'])
+
+    def test_stream_unresolved(self):
+        resources = [Res('a', ['b']), Res('b', ['a']), Res('c', ['gaga']), Res('d', ['d']), Res('e', [])]
+        lookup = IriLookup()
+        with self.assertRaises(ResourceGraphError) as cm:
+            UploadScheduler(jobs=2).run_stream(resources, lambda r: 'http://rdfh.ch/0001/' + r.id, lookup)
+        self.assertEqual(sorted(sorted(cycle) for cycle in cm.exception.cycles), [['a', 'b'], ['d']])
+        self.assertEqual(cm.exception.dangling, {'c': ['gaga']})
+        self.assertIn('e', lookup)
+
+    def test_stream_window(self):
+        resources = [Res('a', ['c']), Res('b', ['c']), Res('c', [])]
+        with self.assertRaises(BaseError):
+            UploadScheduler(jobs=1).run_stream(resources, lambda r: 'http://rdfh.ch/0001/' + r.id, IriLookup(),
+                                               window=2)
+        lookup = IriLookup()
+        UploadScheduler(jobs=1).run_stream(resources, lambda r: 'http://rdfh.ch/0001/' + r.id, lookup, window=3)
+        self.assertEqual(len(lookup), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import unittest
+from typing import Any
+
+sys.path.append("../knora")
+
+from dsplib.models.helpers import Actions, BaseError
+from dsplib.models.permission import Permissions
+from dsplib.models.value import Value, ColorValue, ColumnError, DateValue, DateComponents, DecimalValue, \
+    IntervalValue, IntValue, TextValue, fromJsonLdObj, get_value_type, register_value_type
+
+
+class TestValue(unittest.TestCase):
+    @staticmethod
+    def jsonld(valtype: str, **content: Any):
+        iri = 'http://rdfh.ch/0001/thing/values/1'
+        return dict({'@id': iri, '@type': valtype,
+                     'knora-api:arkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark'},
+                     'knora-api:versionArkUrl': {'@type': 'xsd:anyURI', '@value': iri + '/ark.1'},
+                     'knora-api:hasPermissions': 'V knora-admin:UnknownUser', 'knora-api:userHasPermission': 'CR'},
+                    **content)
+
+    def test_date(self):
+        value = fromJsonLdObj(self.jsonld('knora-api:DateValue', **{
+            'knora-api:dateValueHasCalendar': 'JULIAN',
+            'knora-api:dateValueHasStartEra': 'CE', 'knora-api:dateValueHasStartYear': 812,
+            'knora-api:dateValueHasStartMonth': 3,
+            'knora-api:dateValueHasEndEra': 'CE', 'knora-api:dateValueHasEndYear': 811}))
+        self.assertIsInstance(value, DateValue)
+        tmp = value.toJsonLdObj(Actions.Create)
+        self.assertEqual((tmp['knora-api:dateValueHasCalendar'], tmp['knora-api:dateValueHasStartYear'],
+                          tmp['knora-api:dateValueHasEndYear'], tmp['knora-api:dateValueHasEndMonth']),
+                         ('JULIAN', 811, 812, 3))
+        self.assertEqual(DateValue.parse('GREGORIAN:CE:2014-01-31:CE:2014-02-01'),
+                         DateComponents('GREGORIAN', 'CE', 2014, 1, 31, 'CE', 2014, 2, 1))
+        self.assertEqual(DateValue('GREGORIAN:CE:2014-01-31').toJsonLdObj(Actions.Create),
+                         DateValue(components=DateComponents('GREGORIAN', 'CE', 2014, 1, 31, 'CE', None, None, None))
+                         .toJsonLdObj(Actions.Create))
+        with self.assertRaises(BaseError):
+            DateValue()
+
+    def test_interval(self):
+        value = fromJsonLdObj(self.jsonld('knora-api:IntervalValue', **{
+            'knora-api:intervalValueHasStart': {'@type': 'xsd:decimal', '@value': '1.5'},
+            'knora-api:intervalValueHasEnd': {'@type': 'xsd:decimal', '@value': '2.25'}}))
+        self.assertEqual((value.iv_start, value.iv_end), (1.5, 2.25))
+
+    def test_register_value_type(self):
+        class AudioValue(TextValue):
+            pass
+
+        self.assertIsNone(get_value_type('knora-api:AudioValue'))
+        register_value_type('knora-api:AudioValue', AudioValue)
+        self.assertIs(get_value_type('knora-api:AudioValue'), AudioValue)
+        value = fromJsonLdObj(self.jsonld('knora-api:AudioValue', **{'knora-api:valueAsString': 'audio'}))
+        self.assertIsInstance(value, AudioValue)
+        self.assertEqual(str(value), 'audio')
+        self.assertIs(get_value_type('knora-api:TextValue'), TextValue)
+
+    def test_typed_value(self):
+        obj = {'a': {'@type': 'xsd:integer', '@value': '3'}, 'b': {'@id': 'http://rdfh.ch/0001/b'},
+               'c': {'@type': 'xsd:unknown', '@value': 'x'}}
+        self.assertEqual(Value.get_typed_value('a', obj), 3)
+        self.assertEqual(Value.get_typed_value('b', obj), 'http://rdfh.ch/0001/b')
+        with self.assertRaises(BaseError):
+            Value.get_typed_value('c', obj)
+        with self.assertRaises(BaseError):
+            Value.get_typed_value('d', obj)
+
+    def test_from_column(self):
+        permissions = Permissions.fromString('V knora-admin:UnknownUser|M knora-admin:ProjectMember')
+        dates = ['GREGORIAN:CE:2014-01-31', 'JULIAN:CE:1700:CE:1650', 'GREGORIAN:CE:2014-01-31']
+        for cls, column in ((DateValue, dates), (IntValue, [1, '-2', 3]), (DecimalValue, [1.5, '2', 3]),
+                            (ColorValue, ['#ff0000', '#abc'])):
+            values = cls.from_column(column, permissions=permissions)
+            self.assertEqual([v.toJsonLdObj(Actions.Create) for v in values],
+                             [cls(cell, permissions=permissions).toJsonLdObj(Actions.Create) for cell in column])
+            self.assertTrue(all(type(v) is cls for v in values))
+        self.assertEqual(DateValue.from_column(dates)[1].toJsonLdObj(Actions.Create)['knora-api:dateValueHasEndYear'],
+                         1700)
+        for cell in (5, 1.5, '2'):
+            value = DecimalValue.from_column([cell])[0].value
+            self.assertEqual((type(value), value), (type(DecimalValue(cell).value), DecimalValue(cell).value))
+
+        for cls, column, rows in ((DateValue, ['GREGORIAN:CE:2014', 'yesterday', 'CE:2014', 'tomorrow'], [1, 3]),
+                                  (IntValue, ['1', '1.5', 'x', 2, '3\n', True, False], [1, 2, 4, 5, 6]),
+                                  (DecimalValue, ['1.5', 'x', None], [1, 2]),
+                                  (ColorValue, ['#ff0000', 'red'], [1])):
+            with self.assertRaises(ColumnError) as cm:
+                cls.from_column(column)
+            self.assertEqual([row for row, message in cm.exception.errors], rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import gc
+import io
+import sys
+import unittest
+from typing import List
+
+from lxml import etree
+
+sys.path.append("../knora")
+
+from dsplib.utils.resource_graph import ResourceGraph, ResourceGraphError
+from dsplib.utils.upload_scheduler import IriLookup, UploadScheduler
+from dsplib.utils.xml_upload import KnoraProperty, KnoraResource, XmlDataReader, XmlError, parse_xml, load_xmlschema
+
+
+class ProjectContextStub:
+    shortcode = '0001'
+    project_name = 'anything'
+    groupmap = {'anything:Thing searcher': 'http://rdfh.ch/groups/0001/thing-searcher'}
+
+
+class TestXmlUpload(unittest.TestCase):
+    xmldata = b'''<?xml version='1.0' encoding='utf-8'?>
+<knora shortcode="0001" default-ontology="anything">
+    <resource label="a" restype=":Thing" id="res_a" permissions="res-default">
+        <text-prop name=":hasText">
+            <text encoding="utf8">No link</text>
+            <text encoding="xml">A <a class="salsah-link" href="IRI:res_b:IRI">link</a> to b</text>
+        </text-prop>
+        <resptr-prop name=":hasOtherThing">
+            <resptr permissions="prop-default">res_b</resptr>
+        </resptr-prop>
+    </resource>
+    <resource label="b" restype=":Thing" id="res_b" permissions="res-default">
+        <resptr-prop name=":hasOtherThing">
+            <resptr>res_a</resptr>
+        </resptr-prop>
+        <resptr-prop name=":hasRequiredThing">
+            <resptr>res_c</resptr>
+        </resptr-prop>
+    </resource>
+    <resource label="c" restype=":Thing" id="res_c" permissions="res-default">
+        <integer-prop name=":hasInteger">
+            <integer>4711</integer>
+        </integer-prop>
+    </resource>
+</knora>
+'''
+
+    def parse(self) -> List[KnoraResource]:
+        context = etree.iterparse(io.BytesIO(self.xmldata), events=("start", "end"))
+        resources: List[KnoraResource] = []
+        default_ontology = None
+        for event, node in context:
+            if event == 'start' and node.tag == 'knora':
+                default_ontology = node.attrib['default-ontology']
+            elif event == 'start' and node.tag == 'resource':
+                resources.append(KnoraResource(context, node, default_ontology))
+        return resources
+
+    def test_cycle(self):
+        with self.assertRaises(ResourceGraphError) as cm:
+            ResourceGraph(self.parse()).sort()
+        self.assertEqual(sorted(cm.exception.cycles[0]), ['res_a', 'res_b'])
+
+    def test_defer_links(self):
+        res_a, res_b, res_c = self.parse()
+        self.assertEqual(res_a.defer_links(set()), 2)
+        self.assertEqual(res_b.defer_links({'anything:hasRequiredThing'}), 1)
+        self.assertEqual(res_c.defer_links(set()), 0)
+        self.assertTrue(res_a.has_links)
+        self.assertFalse(res_c.has_links)
+        self.assertEqual(res_a.get_resptrs(), [])
+        self.assertEqual(res_b.get_resptrs(), ['res_c'])
+        self.assertEqual([r.id for r in ResourceGraph([res_a, res_b, res_c]).sort()], ['res_a', 'res_c', 'res_b'])
+
+        lookup = {'res_a': 'http://rdfh.ch/0001/a', 'res_b': 'http://rdfh.ch/0001/b', 'res_c': 'http://rdfh.ch/0001/c'}
+        self.assertEqual(res_a.get_propvals(lookup, {}), {'anything:hasText': 'No link'})
+        self.assertEqual(res_b.get_propvals(lookup, {}), {'anything:hasRequiredThing': 'http://rdfh.ch/0001/c'})
+        links = res_a.get_links(lookup, {'prop-default': 'PERMISSIONS'})
+        self.assertEqual(links[0][0], 'anything:hasText')
+        self.assertIn('href="http://rdfh.ch/0001/b"', str(links[0][1]))
+        self.assertEqual(links[1], ('anything:hasOtherThing', {'value': 'http://rdfh.ch/0001/b',
+                                                               'permissions': 'PERMISSIONS'}))
+        self.assertEqual(res_b.get_links(lookup, {}), [('anything:hasOtherThing', 'http://rdfh.ch/0001/a')])
+
+    def test_link_record(self):
+        res_a, res_b, res_c = self.parse()
+        res_a.defer_links(set())
+        restored = KnoraResource.from_link_record(res_a.id, res_a.to_link_record())
+        self.assertEqual((restored.id, restored.restype, restored.image), (res_a.id, res_a.restype, res_a.image))
+        self.assertEqual(restored.get_propvals({}, {}), {})
+        self.assertEqual(restored.get_link_refs(), res_a.get_link_refs())
+        lookup = {'res_b': 'http://rdfh.ch/0001/b'}
+        permissions = {'prop-default': 'PERMISSIONS'}
+        self.assertEqual([(name, str(value)) for name, value in restored.get_links(lookup, permissions)],
+                         [(name, str(value)) for name, value in res_a.get_links(lookup, permissions)])
+
+    def test_stream_error(self):
+        def source():
+            yield from self.parse()[2:]
+            raise XmlError('Invalid resource further down')
+
+        with self.assertRaises(XmlError):
+            UploadScheduler(jobs=2).run_stream(source(), lambda r: 'http://rdfh.ch/0001/' + r.id, IriLookup())
+
+    def test_shared_property(self):
+        prop = KnoraProperty.shared('anything:hasUnshared', 'text')
+        self.assertIs(KnoraProperty.shared('anything:hasUnshared', 'text'), prop)
+        self.assertIsNot(KnoraProperty.shared('anything:hasUnshared', 'integer'), prop)
+        # the registry does not keep the instances of a finished parse alive
+        registry = KnoraProperty._KnoraProperty__instances
+        del prop
+        gc.collect()
+        self.assertNotIn(('anything:hasUnshared', 'text'), registry)
+
+    def test_compact(self):
+        res_a, res_b, res_c = self.parse()
+        self.assertFalse(hasattr(res_a, '__dict__'))
+        self.assertIs(res_a.restype, res_c.restype)
+        self.assertIs(res_a.permissions, res_b.permissions)
+        for ref in res_a.get_resptrs():  # resptr and standoff link
+            self.assertIs(ref, res_b.id)
+        self.assertEqual(res_b.get_propvals({}, {}), {'anything:hasOtherThing': 'res_a',
+                                                       'anything:hasRequiredThing': 'res_c'})
+
+    def test_parse_xml(self):
+        shortcode, default_ontology, resources, permissions = parse_xml('../knora/anything-test-data.xml',
+                                                                        ProjectContextStub())
+        self.assertEqual(shortcode, '0001')
+        self.assertEqual(default_ontology, 'anything')
+        self.assertEqual([r.id for r in resources], ['obj_0001', 'obj_0002', 'obj_0003', 'obj_0004'])
+        self.assertEqual(sorted(permissions), ['prop-default', 'prop-restricted', 'res-default', 'res-restricted'])
+        self.assertIs(load_xmlschema(), load_xmlschema())
+
+    def test_reader(self):
+        reader = XmlDataReader('../knora/anything-test-data.xml', ProjectContextStub())
+        self.assertEqual(reader.shortcode, '0001')
+        self.assertEqual(len(reader.permissions), 4)
+        resources = reader.resources()
+        first = next(resources)
+        self.assertEqual(first.id, 'obj_0001')
+        self.assertIsNone(first.image)
+        self.assertEqual([r.id for r in resources], ['obj_0002', 'obj_0003', 'obj_0004'])
+
+    def test_parse_xml_invalid(self):
+        with open('../knora/anything-test-data.xml', 'rb') as f:
+            data = f.read()
+        for invalid in (data.replace(b'permissions="res-default"', b'permissions="nonexisting"'),
+                        data.replace(b'<resource label="obj_inst1"', b'<resource gaga="1" label="obj_inst1"')):
+            with self.assertRaises(etree.XMLSyntaxError):
+                parse_xml(io.BytesIO(invalid), ProjectContextStub())
+
+
+if __name__ == '__main__':
+    unittest.main()